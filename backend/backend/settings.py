@@ -51,6 +51,7 @@ INSTALLED_APPS = [
 ] + [
     "accounts",
     "search",
+    "vehicles",
 ]
 
 MIDDLEWARE = [
@@ -114,6 +115,53 @@ if os.getenv("USE_SQLITE", "false").lower() == "true":
             "NAME": BASE_DIR / "db.sqlite3",
         }
     }
+    # SQLite builds covering indexes without their INCLUDE columns
+    SILENCED_SYSTEM_CHECKS = ["models.W040"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory by default. Production must point the default backend at a
+# store shared by every process: it holds the webhook circuit breaker state
+# (search.circuit) and the plate lookup locks (vehicles.services), which only
+# work across gunicorn workers and the dispatcher when they share it.
+# docker-compose.prod.yml runs a redis service for it (RedisCache), which also
+# makes the DRF throttles count across workers.
+
+search_cache_backend = os.getenv(
+    "SEARCH_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+)
+search_cache_options = {}
+if search_cache_backend.startswith(
+    (
+        "django.core.cache.backends.locmem.",
+        "django.core.cache.backends.filebased.",
+        "django.core.cache.backends.db.",
+    )
+):
+    # Entry cap for the built-in culling backends; locmem evicts the least
+    # recently used entries first. Redis/Memcached use their server-side policy.
+    search_cache_options["MAX_ENTRIES"] = int(
+        os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1000")
+    )
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "bullnice-default"),
+    },
+    # Search result payloads, see search/cache.py
+    "search": {
+        "BACKEND": search_cache_backend,
+        "LOCATION": os.getenv("SEARCH_CACHE_LOCATION", "bullnice-search"),
+        "TIMEOUT": int(os.getenv("SEARCH_CACHE_TIMEOUT", "300")),
+        "OPTIONS": search_cache_options,
+    },
+}
+
+SEARCH_CACHE_ALIAS = "search"
 
 
 # Password validation
@@ -256,5 +304,55 @@ EMAIL_HOST_USER = ""
 EMAIL_HOST_PASSWORD = ""
 DEFAULT_FROM_EMAIL = "noreply@bullnice.com"
 
+# Shared secret the n8n workflow sends as X-Ingest-Token when posting results
+SEARCH_INGEST_TOKEN = os.getenv("SEARCH_INGEST_TOKEN", "")
+
+# n8n webhook that starts a parts search (see search.http for the retry policy)
+N8N_WEBHOOK_URL = (
+    os.getenv("N8N_WEBHOOK_URL")
+    or "https://n8n.bullnice.tech/webhook/afa656ab-e7f1-45fc-9a27-9d7376e50b30"
+)
+N8N_WEBHOOK_CONNECT_TIMEOUT = float(os.getenv("N8N_WEBHOOK_CONNECT_TIMEOUT", "3.05"))
+N8N_WEBHOOK_READ_TIMEOUT = float(os.getenv("N8N_WEBHOOK_READ_TIMEOUT", "10"))
+N8N_WEBHOOK_RETRIES = int(os.getenv("N8N_WEBHOOK_RETRIES", "2"))
+N8N_WEBHOOK_BACKOFF = 0.5
+N8N_WEBHOOK_BACKOFF_JITTER = 0.5
+OUTBOUND_HTTP_POOL_SIZE = int(os.getenv("OUTBOUND_HTTP_POOL_SIZE", "10"))
+# Circuit breaker around the webhook, state in the default cache (search.circuit),
+# which must be shared by the backend and dispatcher processes (see CACHES)
+N8N_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("N8N_CIRCUIT_FAILURE_THRESHOLD", "5"))
+N8N_CIRCUIT_FAILURE_WINDOW = 60
+N8N_CIRCUIT_RECOVERY_TIMEOUT = int(os.getenv("N8N_CIRCUIT_RECOVERY_TIMEOUT", "30"))
+
+# Outbox worker (manage.py run_search_dispatcher) sending queued searches to n8n
+SEARCH_DISPATCH_LEASE = 120
+SEARCH_DISPATCH_MAX_ATTEMPTS = int(os.getenv("SEARCH_DISPATCH_MAX_ATTEMPTS", "5"))
+SEARCH_DISPATCH_BACKOFF = 5
+SEARCH_DISPATCH_BACKOFF_MAX = 300
+# Identical searches dispatched this many seconds ago reuse that search's results
+SEARCH_COALESCE_WINDOW = int(os.getenv("SEARCH_COALESCE_WINDOW", "600"))
+# Results for the same part and vehicle are served as-is while younger than
+# FRESH_TTL, and served while a refresh scrape runs up to MAX_STALE (seconds)
+SEARCH_RESULT_FRESH_TTL = int(os.getenv("SEARCH_RESULT_FRESH_TTL", str(6 * 3600)))
+SEARCH_RESULT_MAX_STALE = int(os.getenv("SEARCH_RESULT_MAX_STALE", str(7 * 86400)))
+
+# Server-Sent Events stream of incoming search results (seconds)
+SEARCH_STREAM_POLL_INTERVAL = float(os.getenv("SEARCH_STREAM_POLL_INTERVAL", "1"))
+SEARCH_STREAM_KEEPALIVE = 15
+SEARCH_STREAM_IDLE_TIMEOUT = int(os.getenv("SEARCH_STREAM_IDLE_TIMEOUT", "180"))
+SEARCH_STREAM_MAX_DURATION = int(os.getenv("SEARCH_STREAM_MAX_DURATION", "900"))
+
+# Currency scraped prices are converted into for sorting and comparison
+BASE_CURRENCY = os.getenv("BASE_CURRENCY", "EUR")
+
+# RDW open-data plate lookups, cached in vehicles.VehicleLookup (seconds)
+RDW_API_URL = (
+    os.getenv("RDW_API_URL") or "https://opendata.rdw.nl/resource/m9d7-ebf2.json"
+)
+RDW_APP_TOKEN = os.getenv("RDW_APP_TOKEN", "")
+RDW_API_TIMEOUT = float(os.getenv("RDW_API_TIMEOUT", "5"))
+VEHICLE_LOOKUP_TTL = 30 * 86400
+VEHICLE_LOOKUP_NEGATIVE_TTL = 86400
+
 # Frontend URL for password reset links
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
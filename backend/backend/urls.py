@@ -39,4 +39,5 @@ urlpatterns = [
         name="redoc",
     ),
     path("api/search/", include("search.urls")),
+    path("api/vehicles/", include("vehicles.urls")),
 ]
@@ -6,8 +6,12 @@ while ! nc -z $DB_HOST $DB_PORT; do
 done
 echo "MSSQL is up."
 
-echo "Running migrations..."
-python manage.py migrate --noinput
+# In production a one-off migrate service runs these, so the backend and
+# dispatcher containers never migrate the same database concurrently
+if [ "${RUN_MIGRATIONS:-1}" = "1" ]; then
+  echo "Running migrations..."
+  python manage.py migrate --noinput
+fi
 
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
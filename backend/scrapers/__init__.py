@@ -0,0 +1,34 @@
+"""
+Site scrapers for car parts, run concurrently by ``scrape_all``.
+
+Importing the package registers every site module below; add a new site by
+subclassing Scraper in its own module and importing it here.
+
+Running the scrapers needs scrapers/requirements.txt on top of the backend's
+requirements; Playwright is only imported once a BrowserPool starts, so the
+package itself imports without it.
+"""
+
+from . import autoparts_24, pl_2407  # noqa: F401  (register the sites)
+from .base import Scraper, ScraperError, SiteResult, VehicleQuery
+from .orchestrator import scrape_all
+from .pool import BrowserPool, close_shared_pool, shared_pool
+from .registry import get_scraper, register, site_names
+from .resources import ResourcePolicy
+from .waits import WaitTimer
+
+__all__ = [
+    "BrowserPool",
+    "ResourcePolicy",
+    "Scraper",
+    "ScraperError",
+    "SiteResult",
+    "VehicleQuery",
+    "WaitTimer",
+    "close_shared_pool",
+    "get_scraper",
+    "register",
+    "scrape_all",
+    "shared_pool",
+    "site_names",
+]
@@ -0,0 +1,50 @@
+"""
+Run a search from the command line and print the results as JSON:
+
+    python -m scrapers brake "brake disc" --brand BMW --model "5 G30" --year 2018
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+
+from . import BrowserPool, VehicleQuery, scrape_all, site_names
+
+
+async def search(args):
+    async with BrowserPool(size=1, headless=not args.headed) as pool:
+        results = await scrape_all(
+            args.part_names,
+            VehicleQuery(args.brand, args.model, args.year),
+            sites=args.site,
+            timeout=args.timeout,
+            pool=pool,
+        )
+        logging.getLogger("scrapers.pool").info("Pool: %s", pool.stats())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m scrapers")
+    parser.add_argument("part_names", nargs="+")
+    parser.add_argument("--brand")
+    parser.add_argument("--model")
+    parser.add_argument("--year", type=int)
+    parser.add_argument(
+        "--site",
+        action="append",
+        choices=site_names(),
+        help="Only scrape this site (repeatable; default all sites).",
+    )
+    parser.add_argument("--timeout", type=float, help="Per-site timeout in seconds.")
+    parser.add_argument("--headed", action="store_true", help="Show the browser.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    results = asyncio.run(search(args))
+    print(json.dumps([r.as_dict() for r in results], indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
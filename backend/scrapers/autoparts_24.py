@@ -0,0 +1,633 @@
+import base64
+import logging
+import re
+from datetime import datetime
+from difflib import get_close_matches
+
+from .base import Scraper, ScraperError
+from .registry import register
+from .resources import ResourcePolicy
+from .waits import PlaywrightTimeoutError, WaitTimer, wait_for_url_change
+
+logger = logging.getLogger(__name__)
+
+
+def slugify(name: str):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def soft_match(user_input: str, brand_list: list[str], threshold=0.6):
+    matches = get_close_matches(user_input, brand_list, n=1, cutoff=threshold)
+    return matches[0] if matches else None
+
+
+def decode_encoded_url(encoded_data: str) -> str:
+    """Decode base64 encoded URL from data-field attribute."""
+    try:
+        decoded_bytes = base64.b64decode(encoded_data)
+        decoded_url = decoded_bytes.decode("utf-8")
+        return decoded_url
+    except Exception as e:
+        logger.warning(f"Error decoding URL: {e}")
+        return None
+
+
+def extract_year_range(year_text: str) -> tuple[int, int]:
+    """Extract start and end year from text like '2016 - Now' or '2009 - 2017'."""
+    try:
+        # Handle different formats: "2016 - Now", "2009 - 2017", "1967 - 1977"
+        year_text = year_text.strip()
+        parts = year_text.split("-")
+        if len(parts) == 2:
+            start_year = int(parts[0].strip())
+            end_part = parts[1].strip()
+            if end_part.lower() == "now":
+                end_year = datetime.now().year
+            else:
+                end_year = int(end_part)
+            return (start_year, end_year)
+    except Exception as e:
+        logger.warning(f"Error parsing year range '{year_text}': {e}")
+    return (None, None)
+
+
+def check_year_in_range(year: int, start_year: int, end_year: int) -> bool:
+    """Check if a given year falls within a range."""
+    if year is None or start_year is None or end_year is None:
+        return False
+    return start_year <= year <= end_year
+
+
+def normalize_model_name(model: str, brand: str = None) -> str:
+    """Normalize model name for better matching.
+
+    Args:
+        model: The model name to normalize
+        brand: Optional brand name to remove from the beginning of model name
+    """
+    model = model.lower()
+
+    # Remove brand prefix if provided (e.g., "BMW 5" -> "5" when brand is "BMW")
+    if brand:
+        brand_pattern = rf"^{re.escape(brand.lower())}\s+"
+        model = re.sub(brand_pattern, "", model)
+
+    # Remove special characters and extra spaces
+    model = re.sub(r"[^a-z0-9\s]", " ", model)
+    model = " ".join(model.split())  # normalize spaces
+    return model.strip()
+
+
+SUGGESTIONS = "div.awesomplete > ul:not([hidden]) li"
+
+
+def suggestion_prefixes(part_name: str) -> list:
+    """What to type, most specific first: the name, its leading words, 3 chars."""
+    words = part_name.split()
+    prefixes = [" ".join(words[:n]) for n in range(len(words), 0, -1)]
+    prefixes.append(part_name[:3])
+    return list(dict.fromkeys(p for p in prefixes if p))
+
+
+async def search_part_autocomplete(page, part_name: str, waits: WaitTimer) -> bool:
+    """Search for a part using the autocomplete input field.
+
+    Args:
+        page: Playwright page object
+        part_name: The name of the part to search for
+        waits: Records the time spent waiting on the site
+
+    Returns:
+        True if search was successful, False otherwise
+    """
+    try:
+        logger.info(f"Searching for part: {part_name}")
+
+        # Find the search input
+        async with waits.measure("search_input"):
+            search_input = await page.wait_for_selector(
+                "input#awesomplete.input__field", timeout=5000
+            )
+
+        # Type the whole name at once and wait for suggestions; only fall back
+        # to shorter prefixes when the full name has none
+        suggestion_texts = []
+        for text in suggestion_prefixes(part_name):
+            await search_input.fill(text)
+            try:
+                async with waits.measure("suggestions"):
+                    await page.wait_for_selector(SUGGESTIONS, timeout=1500)
+            except PlaywrightTimeoutError:
+                continue
+            suggestion_texts = await page.eval_on_selector_all(
+                SUGGESTIONS,
+                "items => items.map((li) => li.textContent.trim()).filter(Boolean)",
+            )
+            if suggestion_texts:
+                logger.info(f"Found suggestions after typing: '{text}'")
+                break
+
+        if not suggestion_texts:
+            logger.info(
+                f"No suggestions found for '{part_name}' - product may not be available"
+            )
+            return False
+
+        logger.info(f"Available suggestions: {suggestion_texts}")
+
+        # Try to find the best match
+        lowered = [s.lower() for s in suggestion_texts]
+        best_match = soft_match(part_name.lower(), lowered, threshold=0.4)
+        match_index = lowered.index(best_match) if best_match else 0
+        logger.info(f"Selecting suggestion: {suggestion_texts[match_index]}")
+
+        # Navigate to the right suggestion with arrow keys
+        for _ in range(match_index + 1):
+            await search_input.press("ArrowDown")
+        try:
+            async with waits.measure("suggestion_highlight"):
+                await page.wait_for_selector(
+                    "div.awesomplete li[aria-selected='true']", timeout=2000
+                )
+        except PlaywrightTimeoutError:
+            pass
+
+        # Press Enter to select, then wait for the results page and its products
+        url = page.url
+        await search_input.press("Enter")
+        try:
+            async with waits.measure("results_page"):
+                await wait_for_url_change(page, url)
+                await page.wait_for_selector("li.productList__item", timeout=10000)
+            logger.info("Products loaded successfully")
+        except PlaywrightTimeoutError:
+            logger.info("Results page loaded (may have no products)")
+
+        return True
+
+    except Exception as e:
+        logger.warning(f"Error during part search: {e}")
+        return False
+
+
+async def extract_available_models(page):
+    """Extract all available models from the simple list (both links and encoded spans)."""
+    models = []
+
+    # Find all model headlines
+    model_headlines = await page.query_selector_all(
+        "div.findingParts__modelGroups__model_headline"
+    )
+
+    for headline in model_headlines:
+        # Check for regular links first
+        link = await headline.query_selector("a.link")
+        if link:
+            model_name = await link.inner_text()
+            href = await link.get_attribute("href")
+            models.append(
+                {
+                    "name": model_name.strip(),
+                    "element": link,
+                    "type": "link",
+                    "href": href,
+                }
+            )
+        else:
+            # Check for encoded spans
+            encoded_span = await headline.query_selector("span.L_encoded")
+            if encoded_span:
+                model_name = await encoded_span.inner_text()
+                encoded_data = await encoded_span.get_attribute("data-field")
+                models.append(
+                    {
+                        "name": model_name.strip(),
+                        "element": encoded_span,
+                        "type": "encoded",
+                        "data_field": encoded_data,
+                    }
+                )
+
+    return models
+
+
+async def click_model_element(page, model_info: dict) -> bool:
+    """Click on a model element (handles both regular links and encoded spans)."""
+    try:
+        if model_info["type"] == "link":
+            # Regular link - just click it
+            await model_info["element"].click()
+            return True
+        elif model_info["type"] == "encoded":
+            # Try clicking the span first
+            try:
+                await model_info["element"].click()
+                return True
+            except Exception as e:
+                logger.warning(
+                    f"Clicking span failed, trying to decode and navigate: {e}"
+                )
+                # If clicking fails, decode and navigate
+                decoded_url = decode_encoded_url(model_info["data_field"])
+                if decoded_url:
+                    await page.goto(decoded_url)
+                    return True
+        return False
+    except Exception as e:
+        logger.warning(f"Error clicking model element: {e}")
+        return False
+
+
+async def extract_detailed_models(page):
+    """Extract models with year ranges from the expanded 'show all' list."""
+    models = []
+
+    # Find all detailed model entries
+    model_entries = await page.query_selector_all(
+        "div.findingParts__modelGroups__model"
+    )
+
+    for entry in model_entries:
+        # Extract year range
+        year_box = await entry.query_selector(
+            "div.box--m-w50p-t-w25p-m-pr-xxsmall-t-pr-none"
+        )
+        year_text = await year_box.inner_text() if year_box else ""
+        year_text = year_text.strip()
+
+        # Extract model name and link/encoded element
+        model_box = await entry.query_selector("div.box--m-w50p-t-w75p")
+        if model_box:
+            # Check for regular link
+            link = await model_box.query_selector("a")
+            if link:
+                model_name = await link.inner_text()
+                href = await link.get_attribute("href")
+                models.append(
+                    {
+                        "name": model_name.strip(),
+                        "year_text": year_text,
+                        "element": link,
+                        "type": "link",
+                        "href": href,
+                    }
+                )
+            else:
+                # Check for encoded span
+                encoded_span = await model_box.query_selector(
+                    "span.L_encoded, span.modelEncoded"
+                )
+                if encoded_span:
+                    model_name = await encoded_span.inner_text()
+                    encoded_data = await encoded_span.get_attribute("data-field")
+                    models.append(
+                        {
+                            "name": model_name.strip(),
+                            "year_text": year_text,
+                            "element": encoded_span,
+                            "type": "encoded",
+                            "data_field": encoded_data,
+                        }
+                    )
+
+    return models
+
+
+# Reads every product on the page in one evaluation: a dozen element
+# lookups per product, plus the spec lists, would otherwise each be a
+# separate Playwright round trip
+EXTRACT_PRODUCTS_JS = """
+(items) => items.map((item) => {
+    const text = (selector) => {
+        const el = item.querySelector(selector);
+        return el ? el.innerText.trim() : null;
+    };
+    const attr = (selector, name) => {
+        const el = item.querySelector(selector);
+        return el ? el.getAttribute(name) : null;
+    };
+    const priceSpan = item.querySelector("span[id^='price-']");
+    return {
+        title: text("div.productList__title a"),
+        href: attr("div.productList__title a", "href"),
+        encoded: attr("span.itemEncoded", "data-field"),
+        image: attr("img.visual", "src"),
+        hasPrice: priceSpan !== null,
+        price: priceSpan && priceSpan.getAttribute("data-price"),
+        currency: text("span.productList__price span[itemprop='priceCurrency']"),
+        deliveryDays: text("span[id^='time-']"),
+        delivery: text("span.productList__delivery"),
+        specs: Array.from(
+            item.querySelectorAll("ul.productInfo li.productInfo__item"),
+            (li) => li.innerText,
+        ),
+    };
+})
+"""
+
+
+def decode_encoded_urls(encoded: list) -> dict:
+    """Decode each distinct base64 data-field once."""
+    return {data: decode_encoded_url(data) for data in set(encoded) if data}
+
+
+def parse_price_amount(value):
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def build_product(raw: dict, decoded_urls: dict) -> dict:
+    """A product dict from one EXTRACT_PRODUCTS_JS entry."""
+    url = f"https://www.autoparts-24.com{raw['href']}" if raw["href"] else None
+    if not url and raw["encoded"]:
+        # The title link is missing on some items; the URL is then encoded
+        url = decoded_urls.get(raw["encoded"])
+
+    if raw["hasPrice"]:
+        price = {
+            "amount": parse_price_amount(raw["price"]),
+            "currency": raw["currency"] or "EUR",
+        }
+    else:
+        price = {"amount": None, "currency": "EUR"}
+
+    if raw["deliveryDays"] is None:
+        delivery_time = None
+    else:
+        delivery_time = raw["delivery"] or f"{raw['deliveryDays']} workdays"
+
+    # Parse the format "Key: Value"
+    specs = {}
+    for item_text in raw["specs"]:
+        if ":" in item_text:
+            key, value = item_text.split(":", 1)
+            specs[key.strip()] = value.strip()
+
+    return {
+        "title": raw["title"],
+        "url": url,
+        "image": raw["image"],
+        "price": price,
+        "delivery_time": delivery_time,
+        "specs": specs,
+    }
+
+
+async def extract_all_products(page) -> list:
+    """Extract all products from the current page.
+
+    Args:
+        page: Playwright page object
+
+    Returns:
+        List of product dictionaries
+    """
+    try:
+        # Wait for product list to load
+        await page.wait_for_selector("li.productList__item", timeout=10000)
+        raw_products = await page.eval_on_selector_all(
+            "li.productList__item", EXTRACT_PRODUCTS_JS
+        )
+    except Exception as e:
+        logger.warning(f"Error extracting products: {e}")
+        return []
+
+    logger.info(f"Found {len(raw_products)} products on current page")
+    decoded_urls = decode_encoded_urls(
+        [raw["encoded"] for raw in raw_products if not raw["href"]]
+    )
+    return [build_product(raw, decoded_urls) for raw in raw_products]
+
+
+async def handle_pagination(page, waits: WaitTimer, max_pages: int = 1) -> list:
+    """Handle pagination and extract products from multiple pages.
+
+    Args:
+        page: Playwright page object
+        waits: Records the time spent waiting on the site
+        max_pages: Maximum number of pages to scrape (default: 1)
+
+    Returns:
+        List of all products from all pages
+    """
+    all_products = []
+    current_page = 1
+
+    while current_page <= max_pages:
+        logger.info(f"Extracting products from page {current_page}")
+
+        # Extract products from current page
+        products = await extract_all_products(page)
+        all_products.extend(products)
+
+        if current_page >= max_pages:
+            break
+
+        # Try to find and click "next page" button
+        try:
+            # Look for pagination links - common patterns
+            next_button = await page.query_selector(
+                "a.pagination__next, a[rel='next'], a:has-text('Next')"
+            )
+
+            if next_button:
+                logger.info(f"Navigating to page {current_page + 1}")
+                url = page.url
+                await next_button.click()
+                # extract_all_products() then waits for the new page's items
+                async with waits.measure("next_page"):
+                    await wait_for_url_change(page, url)
+                current_page += 1
+            else:
+                logger.info("No more pages found")
+                break
+
+        except Exception as e:
+            logger.warning(f"Error navigating to next page: {e}")
+            break
+
+    return all_products
+
+
+async def open_model(page, model_info: dict, waits: WaitTimer) -> bool:
+    """Click a model from either list and wait for its page."""
+    url = page.url
+    if not await click_model_element(page, model_info):
+        return False
+    async with waits.measure("model_page"):
+        await wait_for_url_change(page, url)
+    logger.info(f"Successfully clicked model: {model_info['name']}")
+    return True
+
+
+async def select_model(
+    page, waits: WaitTimer, brand: str, model: str, year: int = None
+) -> bool:
+    """Open the model page for ``model`` on a brand page; False if none matched."""
+    # Step 1: Try to find model in simple list first
+    available_models = await extract_available_models(page)
+    logger.info(f"Found {len(available_models)} models in simple list")
+
+    # Normalize the user input model name
+    normalized_input = normalize_model_name(model, brand)
+
+    # Create a list of model names for fuzzy matching
+    model_names = [m["name"] for m in available_models]
+    normalized_model_names = [
+        normalize_model_name(name, brand) for name in model_names
+    ]
+
+    # Try fuzzy matching
+    matched_name = soft_match(normalized_input, normalized_model_names, threshold=0.6)
+
+    if matched_name:
+        # Find the original model info
+        matched_index = normalized_model_names.index(matched_name)
+        matched_model = available_models[matched_index]
+        logger.info(f"Found match in simple list: {matched_model['name']}")
+
+        # Try to click it
+        if await open_model(page, matched_model, waits):
+            return True
+
+    # Step 2: If not found in simple list, try the detailed list with the year
+    if not year:
+        return False
+    logger.info(f"Model not selected yet, trying detailed list with year {year}")
+
+    # Click "show all" button
+    try:
+        show_all_button = page.get_by_text("show all", exact=False)
+        await show_all_button.click()
+        async with waits.measure("model_list"):
+            await page.wait_for_selector(
+                "div.findingParts__modelGroups__model", timeout=10000
+            )
+
+        # Extract detailed models with year ranges
+        detailed_models = await extract_detailed_models(page)
+        logger.info(f"Found {len(detailed_models)} models in detailed list")
+
+        # Filter by year and try to match
+        matching_models = []
+        for detailed_model in detailed_models:
+            # Parse year range
+            start_year, end_year = extract_year_range(detailed_model["year_text"])
+
+            # Check if year matches
+            if check_year_in_range(year, start_year, end_year):
+                # Check if model name matches
+                normalized_detailed = normalize_model_name(
+                    detailed_model["name"], brand
+                )
+                if (
+                    normalized_input in normalized_detailed
+                    or normalized_detailed in normalized_input
+                ):
+                    matching_models.append(detailed_model)
+
+        if not matching_models:
+            logger.info(f"No model found matching '{model}' with year {year}")
+            return False
+
+        # Use the first matching model
+        best_match = matching_models[0]
+        logger.info(
+            f"Found match with year: {best_match['name']} ({best_match['year_text']})"
+        )
+        if await open_model(page, best_match, waits):
+            return True
+
+    except Exception as e:
+        logger.warning(f"Error with show all button or detailed selection: {e}")
+
+    return False
+
+
+VISIBLE_MANUFACTURERS_JS = """
+() => Array.from(document.querySelectorAll("div.manufacturer-grid-item"))
+    .filter((el) => el.getClientRects().length > 0).length
+"""
+
+
+@register
+class AutoParts24Scraper(Scraper):
+    """
+    autoparts-24.com: open_vehicle() picks the brand and, when given, the
+    model (by name, then by name and year). Every part search starts from
+    that vehicle page.
+    """
+
+    name = "autoparts-24.com"
+    timeout = 120
+    resource_policy = ResourcePolicy(first_party=["autoparts-24.com"])
+    max_pages = 1
+
+    def __init__(self):
+        super().__init__()
+        self.vehicle_url = None
+
+    async def open_vehicle(self, page, vehicle):
+        if not vehicle.brand:
+            raise ScraperError("autoparts-24.com needs a brand")
+
+        async with self.waits.measure("home_page"):
+            await page.goto("https://autoparts-24.com/", wait_until="domcontentloaded")
+            await page.wait_for_selector("a.SUBCATEGORY_ITEM")
+
+        # Click on show more manufacturers button and wait for more to show
+        shown = await page.evaluate(VISIBLE_MANUFACTURERS_JS)
+        show_more_button = page.get_by_text("Show more manufacturers")
+        await show_more_button.click()
+        try:
+            async with self.waits.measure("manufacturers"):
+                await page.wait_for_function(
+                    f"(shown) => ({VISIBLE_MANUFACTURERS_JS})() > shown",
+                    arg=shown,
+                    timeout=10000,
+                )
+        except PlaywrightTimeoutError:
+            logger.warning("No more manufacturers appeared; using those shown")
+
+        manufacturers = await page.query_selector_all("div.manufacturer-grid-item")
+        found_brands = []
+        for m in manufacturers:
+            brand_info = await m.query_selector("div.categorySearch__brandInfo")
+            name_el = await brand_info.query_selector("b")
+            name = await name_el.inner_text() if name_el else None
+            found_brands.append(name.strip() if name else None)
+
+        logger.info(f"Found {len(found_brands)} brands")
+        matched_brand = soft_match(vehicle.brand, found_brands)
+        if not matched_brand:
+            raise ScraperError(f"Brand not found: {vehicle.brand}")
+
+        logger.info(f"Matched brand: {matched_brand}")
+        url = page.url
+        await page.click(f"a[href*='/{slugify(matched_brand)}/']")
+        async with self.waits.measure("brand_page"):
+            await wait_for_url_change(page, url)
+
+        if vehicle.model:
+            logger.info(f"Looking for model: {vehicle.model}")
+            if not await select_model(
+                page, self.waits, matched_brand, vehicle.model, vehicle.year
+            ):
+                logger.warning(f"Could not select model '{vehicle.model}'")
+
+        self.vehicle_url = page.url
+
+    async def search_part(self, page, part_name):
+        if page.url != self.vehicle_url:
+            # Back from the previous part's results
+            async with self.waits.measure("vehicle_page"):
+                await page.goto(self.vehicle_url, wait_until="domcontentloaded")
+
+        if not await search_part_autocomplete(page, part_name, self.waits):
+            raise ScraperError(f"Search failed for {part_name!r}")
+
+        products = await handle_pagination(page, self.waits, self.max_pages)
+        logger.info(f"Extracted {len(products)} products for {part_name!r}")
+        return products
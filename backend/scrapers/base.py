@@ -0,0 +1,101 @@
+"""
+Common interface for the site scrapers.
+
+A scraper works in two steps on a page the orchestrator hands it:
+``open_vehicle`` navigates to the vehicle once (brand, model, year), then
+``search_part`` runs once per part name from there. Several parts for one
+vehicle therefore share the navigation, which is the slow part on most sites.
+
+Products are plain dicts with the keys the search ingest endpoint reads:
+``title``, ``url``, ``image`` and ``price`` (a price string such as
+"1 234,56 zł" or ``{"amount": 12.5, "currency": "EUR"}``). Sites may add
+more keys, such as ``delivery_time`` or ``specs``. A value the page did not
+have is ``None``; the orchestrator drops products without a title, url or
+price amount (see ``missing_fields``), which the ingest endpoint would reject.
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .resources import ResourcePolicy
+from .waits import WaitTimer
+
+Product = Dict[str, Any]
+
+DIGIT_RE = re.compile(r"\d")
+
+
+def missing_fields(product: Product) -> List[str]:
+    """The required keys of ``product`` that have no usable value."""
+    missing = [key for key in ("title", "url") if not product.get(key)]
+    price = product.get("price")
+    amount = price.get("amount") if isinstance(price, dict) else price
+    if amount is None or (isinstance(amount, str) and not DIGIT_RE.search(amount)):
+        missing.append("price")
+    return missing
+
+
+class VehicleQuery(NamedTuple):
+    brand: Optional[str] = None
+    model: Optional[str] = None
+    year: Optional[int] = None
+
+
+class SiteResult(NamedTuple):
+    site: str
+    part_name: str
+    products: List[Product]
+    error: Optional[str] = None
+    # ResourceStats.as_dict() and WaitTimer.as_dict() of the site's job,
+    # shared by its parts
+    resources: Optional[Dict[str, Any]] = None
+    waits: Optional[Dict[str, Any]] = None
+    # Products left out for missing a required field
+    dropped: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "site": self.site,
+            "part_name": self.part_name,
+            "total_products": len(self.products),
+            "products": self.products,
+            "error": self.error,
+            "resources": self.resources,
+            "waits": self.waits,
+            "dropped_products": self.dropped,
+        }
+
+
+class ScraperError(Exception):
+    """The site could not be scraped for this query (brand not found, ...)."""
+
+
+class Scraper:
+    """
+    Base class for one site. Subclasses set ``name`` and implement
+    ``open_vehicle`` and ``search_part``; register them with
+    ``scrapers.registry.register``.
+    """
+
+    name: str = ""
+    # Seconds the orchestrator allows for the vehicle plus all its parts
+    timeout: float = 90
+    max_products: int = 10
+    # Requests to abort; None loads pages in full
+    resource_policy: Optional[ResourcePolicy] = None
+
+    def __init__(self):
+        # Scrapers are created per job, so this covers one site's job
+        self.waits = WaitTimer()
+
+    def context_options(self) -> Dict[str, Any]:
+        """Keyword arguments for ``browser.new_context()``."""
+        return {}
+
+    async def open_vehicle(self, page, vehicle: VehicleQuery) -> None:
+        """Navigate to the vehicle; raise ScraperError when that fails."""
+        raise NotImplementedError
+
+    async def search_part(self, page, part_name: str) -> List[Product]:
+        """Search one part on the page left by open_vehicle()."""
+        raise NotImplementedError
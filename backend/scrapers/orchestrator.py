@@ -0,0 +1,122 @@
+"""
+Concurrent fan-out of one vehicle + parts query to every registered site.
+
+Each site gets its own browser context from a BrowserPool and runs under its
+own timeout, so a search takes as long as the slowest site rather than the
+sum of all sites, and a site that hangs only loses its own remaining parts.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Iterable, List, Optional
+
+from .base import SiteResult, VehicleQuery, missing_fields
+from .pool import BrowserPool, shared_pool
+from .registry import get_scraper, site_names
+
+logger = logging.getLogger(__name__)
+
+
+async def scrape_site(
+    pool: BrowserPool,
+    scraper,
+    vehicle: VehicleQuery,
+    part_names: List[str],
+    timeout: float,
+) -> List[SiteResult]:
+    """All parts on one site; parts not reached in time report a timeout."""
+    results = []
+    stats = None
+
+    async def run():
+        nonlocal stats
+        async with pool.context(**scraper.context_options()) as context:
+            if scraper.resource_policy is not None:
+                stats = await scraper.resource_policy.apply(context)
+            page = await context.new_page()
+            await scraper.open_vehicle(page, vehicle)
+            for part_name in part_names:
+                try:
+                    products = await scraper.search_part(page, part_name)
+                except Exception as e:
+                    logger.warning("%s: %r failed: %s", scraper.name, part_name, e)
+                    results.append(SiteResult(scraper.name, part_name, [], str(e)))
+                else:
+                    # Incomplete products would only be rejected on ingest
+                    complete = [p for p in products if not missing_fields(p)]
+                    dropped = len(products) - len(complete)
+                    if dropped:
+                        logger.info(
+                            "%s: %r dropped %d incomplete products",
+                            scraper.name,
+                            part_name,
+                            dropped,
+                        )
+                    results.append(
+                        SiteResult(scraper.name, part_name, complete, dropped=dropped)
+                    )
+
+    start = time.monotonic()
+    error = None
+    try:
+        await asyncio.wait_for(run(), timeout)
+    except asyncio.TimeoutError:
+        error = f"Timed out after {timeout:g}s"
+    except Exception as e:
+        error = str(e)
+    if error:
+        logger.warning("%s: %s", scraper.name, error)
+    logger.info("%s: done in %.1fs", scraper.name, time.monotonic() - start)
+
+    resources = stats.as_dict() if stats is not None else None
+    if resources is not None:
+        logger.info("%s: %s", scraper.name, resources)
+    waits = scraper.waits.as_dict()
+    logger.info("%s: waited %sms", scraper.name, waits["total_ms"])
+    results = [
+        result._replace(resources=resources, waits=waits) for result in results
+    ]
+
+    done = {result.part_name for result in results}
+    results.extend(
+        SiteResult(scraper.name, part_name, [], error, resources, waits)
+        for part_name in part_names
+        if part_name not in done
+    )
+    return results
+
+
+async def scrape_all(
+    part_names: Iterable[str],
+    vehicle: VehicleQuery,
+    sites: Optional[Iterable[str]] = None,
+    timeout: Optional[float] = None,
+    pool: Optional[BrowserPool] = None,
+) -> List[SiteResult]:
+    """
+    Scrape ``part_names`` for ``vehicle`` on ``sites`` (default: all
+    registered) concurrently. ``timeout`` overrides each scraper's own.
+    Returns one SiteResult per site and part, in site order.
+
+    Without a ``pool`` the search runs on shared_pool(), which stays up
+    between searches.
+    """
+    if pool is None:
+        pool = await shared_pool()
+
+    part_names = list(part_names)
+    scrapers = [get_scraper(name) for name in (sites or site_names())]
+    per_site = await asyncio.gather(
+        *(
+            scrape_site(
+                pool,
+                scraper,
+                vehicle,
+                part_names,
+                timeout if timeout is not None else scraper.timeout,
+            )
+            for scraper in scrapers
+        )
+    )
+    return [result for results in per_site for result in results]
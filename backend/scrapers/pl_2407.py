@@ -0,0 +1,127 @@
+import logging
+import os
+
+from .base import Scraper, ScraperError
+from .registry import register
+from .resources import ResourcePolicy
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DROPDOWN = "div.MultiSearchResultsstyle__MultiSearchResultsWrapper-sc-obi7cd-0"
+PRODUCT_ITEM = "div.ListItemstyle__CatalogueListItem-sc-1gf1g4g-6"
+PRODUCT_TITLE = "a.ListItemTitlestyle__CatalogueListItemTitleLink-sc-904etm-1"
+PRODUCT_PRICE = "div.ListItemPricestyle__CatalogueListItemPriceValue-sc-qbj488-3"
+
+# Reads every product in one evaluation instead of a handful of Playwright
+# calls per field per product; the title attribute has the full product name
+EXTRACT_PRODUCTS_JS = """
+(items, [titleSelector, priceSelector, limit]) => items.slice(0, limit).map((item) => {
+    const link = item.querySelector(titleSelector);
+    const image = item.querySelector("img");
+    const price = item.querySelector(priceSelector);
+    return {
+        title: link && (link.getAttribute("title") || link.innerText),
+        href: link && link.getAttribute("href"),
+        image: image && image.getAttribute("src"),
+        price: price && price.innerText,
+    };
+})
+"""
+
+
+def normalize_product(raw):
+    """A product dict from one EXTRACT_PRODUCTS_JS entry."""
+    url, image = raw["href"], raw["image"]
+    # Make relative URLs absolute
+    if url and url.startswith("/"):
+        url = f"https://2407.pl{url}"
+    if image and not image.startswith("http"):
+        image = f"https://2407.pl{image}"
+    return {
+        "title": " ".join(raw["title"].split()) if raw["title"] else None,
+        "image": image or None,
+        "price": " ".join(raw["price"].split()) if raw["price"] else None,
+        "url": url or None,
+    }
+
+
+@register
+class PL2407Scraper(Scraper):
+    """
+    2407.pl: the site search is not scoped to a vehicle, so open_vehicle()
+    only loads the home page and each part is one multi-search query.
+
+    The site is reached through the proxy in SCRAPER_PROXY_SERVER /
+    SCRAPER_PROXY_USERNAME / SCRAPER_PROXY_PASSWORD when it is set.
+    """
+
+    name = "2407.pl"
+    timeout = 60
+    resource_policy = ResourcePolicy(first_party=["2407.pl"])
+
+    def context_options(self):
+        options = {
+            "permissions": [
+                "clipboard-read",
+                "clipboard-write",
+                "geolocation",
+                "notifications",
+                "camera",
+                "microphone",
+            ],
+            "ignore_https_errors": True,
+        }
+        server = os.getenv("SCRAPER_PROXY_SERVER")
+        if server:
+            options["proxy"] = {
+                "server": server,
+                "username": os.getenv("SCRAPER_PROXY_USERNAME", ""),
+                "password": os.getenv("SCRAPER_PROXY_PASSWORD", ""),
+            }
+        return options
+
+    async def open_vehicle(self, page, vehicle):
+        await page.goto("https://2407.pl/", wait_until="commit", timeout=60000)
+
+        # Handle cookie consent popup if it appears
+        try:
+            async with self.waits.measure("cookie_consent"):
+                cookie_button = page.locator("button:has-text('Ok, zgadzam się')")
+                await cookie_button.wait_for(state="visible", timeout=5000)
+                await cookie_button.click()
+                await cookie_button.wait_for(state="hidden", timeout=5000)
+        except Exception:
+            pass
+
+    async def search_part(self, page, part_name):
+        await page.click("button[aria-label='search']:visible")
+        await page.fill("input[aria-label='multiSearch']", part_name)
+
+        # Wait for the dropdown and its first result to appear
+        first_result = page.locator(f"{RESULTS_DROPDOWN} a").first
+        try:
+            async with self.waits.measure("search_dropdown"):
+                await first_result.wait_for(state="visible", timeout=5000)
+        except Exception:
+            raise ScraperError(f"No search results for {part_name!r}")
+
+        async with self.waits.measure("results_navigation"):
+            async with page.expect_navigation(wait_until="commit", timeout=10000):
+                await first_result.click()
+
+        # The list renders client-side; wait for its first product rather
+        # than for the page's load event
+        async with self.waits.measure("product_list"):
+            await page.locator(PRODUCT_ITEM).first.wait_for(
+                state="visible", timeout=10000
+            )
+
+        raw_products = await page.eval_on_selector_all(
+            PRODUCT_ITEM,
+            EXTRACT_PRODUCTS_JS,
+            [PRODUCT_TITLE, PRODUCT_PRICE, self.max_products],
+        )
+        products = [normalize_product(raw) for raw in raw_products]
+
+        logger.info("2407.pl: found %d products for %r", len(products), part_name)
+        return products
@@ -0,0 +1,302 @@
+"""
+Long-lived pool of headless Chromium processes.
+
+Launching Chromium costs more than most page loads, so browsers stay up and
+each job gets a fresh, isolated context (cookies, storage and cache are per
+context). Every browser serves at most ``max_contexts`` jobs at once; when
+all are busy, ``context()`` waits for a slot.
+
+Chromium's memory grows over its lifetime, so a browser is retired after
+``max_jobs`` jobs or once its process tree uses more than ``max_rss_mb``:
+it takes no new jobs, and is closed and replaced once its running ones
+finish. A replacement that fails to launch is retried by the next
+``context()`` call, so the pool returns to ``size`` browsers. The RSS check
+needs psutil and is skipped without it.
+
+``shared_pool()`` holds one pool per process for callers that search
+repeatedly; ``scrape_all`` uses it when it is not given a pool.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Set
+
+try:
+    import psutil
+except ImportError:  # optional, only for the RSS limit
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+CHROMIUM_NAMES = ("chrome", "chromium", "headless_shell")
+
+
+def _chromium_roots() -> Set[int]:
+    """PIDs of the top Chromium process of each browser this process runs."""
+    if psutil is None:
+        return set()
+    roots = set()
+    try:
+        for child in psutil.Process().children(recursive=True):
+            name = child.name().lower()
+            parent = child.parent()
+            if any(n in name for n in CHROMIUM_NAMES) and not (
+                parent and any(n in parent.name().lower() for n in CHROMIUM_NAMES)
+            ):
+                roots.add(child.pid)
+    except psutil.Error:
+        pass
+    return roots
+
+
+def _tree_rss_mb(pid: Optional[int]) -> Optional[float]:
+    if psutil is None or pid is None:
+        return None
+    try:
+        root = psutil.Process(pid)
+        processes = [root, *root.children(recursive=True)]
+        rss = 0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+            except psutil.Error:
+                pass
+    except psutil.Error:
+        return None
+    return rss / (1024 * 1024)
+
+
+class PooledBrowser:
+    def __init__(self, number: int, browser, pid: Optional[int]):
+        self.number = number
+        self.browser = browser
+        self.pid = pid
+        self.active = 0
+        self.jobs = 0
+        self.retiring = False
+
+    def rss_mb(self) -> Optional[float]:
+        return _tree_rss_mb(self.pid)
+
+    def stats(self) -> Dict[str, Any]:
+        rss = self.rss_mb()
+        return {
+            "browser": self.number,
+            "active_contexts": self.active,
+            "jobs": self.jobs,
+            "rss_mb": None if rss is None else round(rss, 1),
+            "retiring": self.retiring,
+        }
+
+
+class BrowserPool:
+    """
+    Use as ``async with BrowserPool(size=2) as pool`` and take contexts with
+    ``async with pool.context(**context_options) as context``.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_contexts: Optional[int] = None,
+        max_jobs: Optional[int] = None,
+        max_rss_mb: Optional[float] = None,
+        headless: bool = True,
+        launch_args=(),
+    ):
+        self.size = size or int(os.getenv("SCRAPER_POOL_SIZE", "2"))
+        self.max_contexts = max_contexts or int(
+            os.getenv("SCRAPER_POOL_MAX_CONTEXTS", "4")
+        )
+        self.max_jobs = max_jobs or int(os.getenv("SCRAPER_POOL_MAX_JOBS", "100"))
+        self.max_rss_mb = max_rss_mb or float(
+            os.getenv("SCRAPER_POOL_MAX_RSS_MB", "1500")
+        )
+        self.launch_options = {
+            "headless": headless,
+            "args": ["--disable-dev-shm-usage", *launch_args],
+        }
+        self._playwright = None
+        self._browsers = []
+        self._numbers = itertools.count(1)
+        self._available = asyncio.Condition()
+        self._launch_lock = asyncio.Lock()
+        # Browsers retired but not yet replaced because the launch failed
+        self._missing = 0
+        self.waiting = 0
+        self.jobs = 0
+        self.recycled = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def start(self) -> None:
+        # Imported here so the package loads without the browser stack
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        for _ in range(self.size):
+            self._browsers.append(await self._launch())
+
+    async def stop(self) -> None:
+        self._missing = 0
+        browsers, self._browsers = self._browsers, []
+        for pooled in browsers:
+            await pooled.browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _launch(self) -> PooledBrowser:
+        # Serialized so the new Chromium process can be told apart by PID
+        async with self._launch_lock:
+            before = _chromium_roots()
+            browser = await self._playwright.chromium.launch(**self.launch_options)
+            new_roots = _chromium_roots() - before
+        pid = new_roots.pop() if len(new_roots) == 1 else None
+        pooled = PooledBrowser(next(self._numbers), browser, pid)
+        logger.info("Launched browser %d (pid %s)", pooled.number, pid)
+        return pooled
+
+    def _free_browser(self) -> Optional[PooledBrowser]:
+        candidates = [
+            b
+            for b in self._browsers
+            if not b.retiring and b.active < self.max_contexts
+        ]
+        return min(candidates, key=lambda b: b.active, default=None)
+
+    async def _replenish(self) -> None:
+        """Launch the replacements of retired browsers; failures are retried later."""
+        while self._missing and self._playwright is not None:
+            # Claimed before the launch so concurrent callers don't double up
+            self._missing -= 1
+            try:
+                pooled = await self._launch()
+            except Exception:
+                self._missing += 1
+                logger.exception(
+                    "Could not launch a replacement browser (%d of %d running)",
+                    len(self._browsers),
+                    self.size,
+                )
+                return
+            self._browsers.append(pooled)
+            async with self._available:
+                self._available.notify_all()
+
+    @asynccontextmanager
+    async def context(self, **options):
+        """A fresh browser context on the least busy browser; closed on exit."""
+        await self._replenish()
+        if not self._browsers:
+            raise RuntimeError("No browser is running; see the launch errors above")
+        async with self._available:
+            self.waiting += 1
+            try:
+                await self._available.wait_for(self._free_browser)
+            finally:
+                self.waiting -= 1
+            pooled = self._free_browser()
+            pooled.active += 1
+
+        try:
+            context = await pooled.browser.new_context(**options)
+            try:
+                yield context
+            finally:
+                await context.close()
+        finally:
+            pooled.active -= 1
+            pooled.jobs += 1
+            self.jobs += 1
+            await self._release(pooled)
+
+    async def _release(self, pooled: PooledBrowser) -> None:
+        if not pooled.retiring and self._should_retire(pooled):
+            pooled.retiring = True
+            logger.info("Retiring browser %d: %s", pooled.number, pooled.stats())
+        if pooled.retiring and pooled.active == 0 and pooled in self._browsers:
+            self._browsers.remove(pooled)
+            self._missing += 1
+            self.recycled += 1
+            # Runs in the job's finally block, so nothing here may raise and
+            # replace the job's own exception
+            try:
+                await pooled.browser.close()
+            except Exception:
+                logger.exception("Could not close browser %d", pooled.number)
+            await self._replenish()
+        async with self._available:
+            self._available.notify_all()
+
+    def _should_retire(self, pooled: PooledBrowser) -> bool:
+        if pooled.jobs >= self.max_jobs:
+            return True
+        rss = pooled.rss_mb()
+        return rss is not None and rss > self.max_rss_mb
+
+    def stats(self) -> Dict[str, Any]:
+        """Utilization snapshot: busy context slots over total slots."""
+        capacity = sum(self.max_contexts for b in self._browsers if not b.retiring)
+        in_use = sum(b.active for b in self._browsers)
+        return {
+            "browsers": [b.stats() for b in self._browsers],
+            "capacity": capacity,
+            "in_use": in_use,
+            "utilization": round(in_use / capacity, 3) if capacity else None,
+            "waiting": self.waiting,
+            "jobs": self.jobs,
+            "recycled": self.recycled,
+            "missing": self._missing,
+        }
+
+
+# (event loop, pool, start task) of shared_pool()
+_shared = None
+
+
+async def shared_pool() -> BrowserPool:
+    """
+    The process-wide pool, started on first use with the SCRAPER_POOL_*
+    settings, so repeated searches run on warm browsers instead of launching
+    Chromium each time. Call close_shared_pool() on shutdown.
+
+    A pool is bound to the event loop that started it; a caller on a new
+    loop (e.g. one asyncio.run() per search) gets a new pool.
+    """
+    global _shared
+    loop = asyncio.get_running_loop()
+    if _shared is None or _shared[0] is not loop:
+        pool = BrowserPool()
+        _shared = (loop, pool, loop.create_task(pool.start()))
+    _, pool, started = _shared
+    try:
+        # Shielded: a cancelled search must not cancel the start for others
+        await asyncio.shield(started)
+    except Exception:
+        if _shared is not None and _shared[1] is pool:
+            _shared = None
+            await pool.stop()
+        raise
+    return pool
+
+
+async def close_shared_pool() -> None:
+    global _shared
+    shared, _shared = _shared, None
+    if shared is None:
+        return
+    _, pool, started = shared
+    try:
+        await started
+    except Exception:
+        pass
+    await pool.stop()
@@ -0,0 +1,31 @@
+"""
+Site registry: scrapers register under their ``name`` when their module is
+imported, and the orchestrator fans out to whatever is registered.
+"""
+
+from typing import Dict, List, Type
+
+from .base import Scraper
+
+_registry: Dict[str, Type[Scraper]] = {}
+
+
+def register(scraper_class: Type[Scraper]) -> Type[Scraper]:
+    """Class decorator adding a Scraper subclass to the registry."""
+    if not scraper_class.name:
+        raise ValueError(f"{scraper_class.__name__} has no name")
+    if _registry.get(scraper_class.name, scraper_class) is not scraper_class:
+        raise ValueError(f"A scraper named {scraper_class.name!r} already exists")
+    _registry[scraper_class.name] = scraper_class
+    return scraper_class
+
+
+def get_scraper(name: str) -> Scraper:
+    try:
+        return _registry[name]()
+    except KeyError:
+        raise KeyError(f"No scraper named {name!r}; known: {site_names()}")
+
+
+def site_names() -> List[str]:
+    return sorted(_registry)
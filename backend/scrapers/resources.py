@@ -0,0 +1,112 @@
+"""
+Per-site request blocking through Playwright route interception.
+
+The scrapers read text, prices and hrefs; images, fonts, video and the
+sites' analytics and ad scripts only cost proxy bandwidth and delay the
+page. A ResourcePolicy aborts those requests before they leave the browser:
+any request of a blocked resource type, and any request to a host outside
+the site's own domains (plus an explicit allow list for CDNs the page
+needs). Top-level navigations always go through.
+
+Set SCRAPER_BLOCK_RESOURCES=0 to load pages in full when debugging a site.
+"""
+
+import logging
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+HEAVY_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+# Rough transfer sizes, only used to estimate what blocking saved: an aborted
+# request never reports its size
+TYPICAL_BYTES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 60_000,
+    "stylesheet": 30_000,
+}
+TYPICAL_BYTES_OTHER = 5_000
+
+
+def blocking_enabled() -> bool:
+    return os.getenv("SCRAPER_BLOCK_RESOURCES", "1").lower() not in ("0", "false")
+
+
+def host_matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+class ResourceStats:
+    """What one job loaded and blocked."""
+
+    def __init__(self):
+        self.allowed = 0
+        self.bytes_loaded = 0
+        self.blocked = Counter()
+        self.blocked_hosts = Counter()
+
+    def record_response(self, response) -> None:
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.bytes_loaded += int(length)
+
+    def as_dict(self) -> Dict[str, Any]:
+        saved = sum(
+            TYPICAL_BYTES.get(kind, TYPICAL_BYTES_OTHER) * count
+            for kind, count in self.blocked.items()
+        )
+        return {
+            "requests_allowed": self.allowed,
+            "requests_blocked": sum(self.blocked.values()),
+            "blocked_by_type": dict(self.blocked),
+            "top_blocked_hosts": dict(self.blocked_hosts.most_common(5)),
+            "bytes_loaded": self.bytes_loaded,
+            "bytes_saved_estimate": saved,
+        }
+
+
+class ResourcePolicy:
+    def __init__(
+        self,
+        first_party: Iterable[str],
+        allow_domains: Iterable[str] = (),
+        block_types: Iterable[str] = HEAVY_RESOURCE_TYPES,
+    ):
+        self.first_party = tuple(first_party)
+        self.allow_domains = tuple(allow_domains)
+        self.block_types = frozenset(block_types)
+
+    def should_block(self, request) -> bool:
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            return False
+        if request.resource_type in self.block_types:
+            return True
+        host = urlsplit(request.url).hostname or ""
+        if not host:  # data: and blob: URLs
+            return False
+        return not host_matches(host, self.first_party + self.allow_domains)
+
+    async def apply(self, context) -> Optional[ResourceStats]:
+        """Start intercepting requests of ``context``; returns its live stats."""
+        if not blocking_enabled():
+            return None
+        stats = ResourceStats()
+
+        async def handle(route):
+            request = route.request
+            if self.should_block(request):
+                stats.blocked[request.resource_type] += 1
+                stats.blocked_hosts[urlsplit(request.url).hostname or ""] += 1
+                await route.abort("blockedbyclient")
+            else:
+                stats.allowed += 1
+                await route.continue_()
+
+        await context.route("**/*", handle)
+        context.on("response", stats.record_response)
+        return stats
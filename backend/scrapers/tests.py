@@ -0,0 +1,316 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from . import registry
+from .autoparts_24 import build_product, suggestion_prefixes
+from .base import Scraper, ScraperError, VehicleQuery
+from .orchestrator import scrape_site
+from .pl_2407 import normalize_product
+from .pool import BrowserPool
+from .resources import ResourcePolicy
+from .waits import PlaywrightTimeoutError, WaitTimer
+
+
+class FakeContext:
+    async def new_page(self):
+        return SimpleNamespace(url="about:blank")
+
+
+class FakePool:
+    def __init__(self):
+        self.options = []
+
+    @asynccontextmanager
+    async def context(self, **options):
+        self.options.append(options)
+        yield FakeContext()
+
+
+class FakeScraper(Scraper):
+    name = "fake.example"
+
+    def __init__(self, products, slow_parts=()):
+        super().__init__()
+        self.products = products
+        self.slow_parts = slow_parts
+
+    def context_options(self):
+        return {"locale": "nl-NL"}
+
+    async def open_vehicle(self, page, vehicle):
+        pass
+
+    async def search_part(self, page, part_name):
+        if part_name in self.slow_parts:
+            await asyncio.sleep(10)
+        if part_name not in self.products:
+            raise ScraperError(f"No search results for {part_name!r}")
+        return self.products[part_name]
+
+
+PRODUCT = {"title": "Brake disc", "url": "https://fake.example/1", "price": "10 zł"}
+
+
+class RegistryTests(SimpleTestCase):
+    def tearDown(self):
+        registry._registry.pop("registry-test.example", None)
+
+    def test_duplicate_names_are_rejected(self):
+        first = type("First", (Scraper,), {"name": "registry-test.example"})
+        second = type("Second", (Scraper,), {"name": "registry-test.example"})
+
+        registry.register(first)
+        # Importing the same module twice must not fail
+        self.assertIs(registry.register(first), first)
+        with self.assertRaisesMessage(ValueError, "already exists"):
+            registry.register(second)
+        self.assertIsInstance(registry.get_scraper("registry-test.example"), first)
+
+    def test_scrapers_need_a_name(self):
+        with self.assertRaisesMessage(ValueError, "has no name"):
+            registry.register(type("Nameless", (Scraper,), {}))
+
+
+class ScrapeSiteTests(SimpleTestCase):
+    async def test_results_per_part_with_errors_and_incomplete_products(self):
+        pool = FakePool()
+        scraper = FakeScraper(
+            {"brake disc": [PRODUCT, dict(PRODUCT, url=None)], "oil filter": []}
+        )
+
+        with self.assertLogs("scrapers.orchestrator", "WARNING"):
+            results = await scrape_site(
+                pool,
+                scraper,
+                VehicleQuery("BMW"),
+                ["brake disc", "oil filter", "wiper"],
+                timeout=5,
+            )
+
+        self.assertEqual(pool.options, [{"locale": "nl-NL"}])
+        self.assertEqual(
+            [(r.part_name, len(r.products), r.dropped, r.error) for r in results],
+            [
+                ("brake disc", 1, 1, None),
+                ("oil filter", 0, 0, None),
+                ("wiper", 0, 0, "No search results for 'wiper'"),
+            ],
+        )
+
+    async def test_timeout_keeps_the_parts_already_scraped(self):
+        scraper = FakeScraper(
+            {"brake disc": [PRODUCT], "oil filter": [PRODUCT]},
+            slow_parts={"oil filter"},
+        )
+
+        with self.assertLogs("scrapers.orchestrator", "WARNING"):
+            results = await scrape_site(
+                FakePool(),
+                scraper,
+                VehicleQuery(),
+                ["brake disc", "oil filter", "wiper"],
+                timeout=0.05,
+            )
+
+        self.assertEqual(
+            [(r.part_name, len(r.products), r.error) for r in results],
+            [
+                ("brake disc", 1, None),
+                ("oil filter", 0, "Timed out after 0.05s"),
+                ("wiper", 0, "Timed out after 0.05s"),
+            ],
+        )
+        self.assertTrue(all(r.waits == {"total_ms": 0, "waits": {}} for r in results))
+
+
+class FakeBrowser:
+    async def new_context(self, **options):
+        return SimpleNamespace(close=self.close)
+
+    async def close(self):
+        pass
+
+
+class FakeChromium:
+    def __init__(self):
+        self.failures = 0
+
+    async def launch(self, **options):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("Chromium crashed on launch")
+        return FakeBrowser()
+
+
+class BrowserPoolTests(SimpleTestCase):
+    async def test_failed_relaunch_is_retried_by_the_next_job(self):
+        chromium = FakeChromium()
+        pool = BrowserPool(size=2, max_jobs=1)
+        pool._playwright = SimpleNamespace(chromium=chromium)
+        pool._browsers = [await pool._launch(), await pool._launch()]
+
+        chromium.failures = 1
+        with self.assertLogs("scrapers.pool", "ERROR"):
+            # The job's own error survives the failed relaunch behind it
+            with self.assertRaisesMessage(ValueError, "job failed"):
+                async with pool.context():
+                    raise ValueError("job failed")
+        self.assertEqual((len(pool._browsers), pool.stats()["missing"]), (1, 1))
+
+        async with pool.context():
+            self.assertEqual(len(pool._browsers), 2)
+        self.assertEqual(pool.stats()["missing"], 0)
+        self.assertEqual(pool.recycled, 2)
+
+
+def fake_request(url, resource_type="script", navigation=False, subframe=False):
+    return SimpleNamespace(
+        url=url,
+        resource_type=resource_type,
+        is_navigation_request=lambda: navigation,
+        frame=SimpleNamespace(parent_frame=object() if subframe else None),
+    )
+
+
+class ResourcePolicyTests(SimpleTestCase):
+    policy = ResourcePolicy(first_party=["2407.pl"], allow_domains=["cdn.example"])
+
+    def test_first_party_requests_load_unless_heavy(self):
+        self.assertFalse(self.policy.should_block(fake_request("https://2407.pl/a.js")))
+        self.assertFalse(
+            self.policy.should_block(fake_request("https://static.2407.pl/a.css"))
+        )
+        self.assertFalse(
+            self.policy.should_block(fake_request("https://cdn.example/lib.js"))
+        )
+        self.assertTrue(
+            self.policy.should_block(fake_request("https://2407.pl/a.png", "image"))
+        )
+
+    def test_third_party_requests_are_blocked(self):
+        self.assertTrue(
+            self.policy.should_block(fake_request("https://tracker.example/t.js"))
+        )
+        # Not fooled by a first-party suffix without the dot
+        self.assertTrue(self.policy.should_block(fake_request("https://not2407.pl/")))
+        self.assertTrue(
+            self.policy.should_block(
+                fake_request("https://ads.example/", "document", True, subframe=True)
+            )
+        )
+
+    def test_top_level_navigations_and_data_urls_load(self):
+        self.assertFalse(
+            self.policy.should_block(
+                fake_request("https://other.example/", "document", navigation=True)
+            )
+        )
+        self.assertFalse(
+            self.policy.should_block(fake_request("data:text/css,body{}", "stylesheet"))
+        )
+        self.assertTrue(
+            self.policy.should_block(fake_request("data:image/png;base64,AA", "image"))
+        )
+
+
+class AutopartsTests(SimpleTestCase):
+    def raw(self, **overrides):
+        raw = {
+            "title": "Brake disc",
+            "href": "/brake-disc-123.html",
+            "encoded": None,
+            "image": "https://img.example/1.jpg",
+            "hasPrice": True,
+            "price": "42.50",
+            "currency": None,
+            "deliveryDays": "3",
+            "delivery": None,
+            "specs": ["Diameter: 300 mm", "no separator"],
+        }
+        raw.update(overrides)
+        return raw
+
+    def test_suggestion_prefixes(self):
+        self.assertEqual(
+            suggestion_prefixes("brake disc front"),
+            ["brake disc front", "brake disc", "brake", "bra"],
+        )
+        self.assertEqual(suggestion_prefixes("oil"), ["oil"])
+        self.assertEqual(suggestion_prefixes(""), [])
+
+    def test_build_product(self):
+        self.assertEqual(
+            build_product(self.raw(), {}),
+            {
+                "title": "Brake disc",
+                "url": "https://www.autoparts-24.com/brake-disc-123.html",
+                "image": "https://img.example/1.jpg",
+                "price": {"amount": 42.5, "currency": "EUR"},
+                "delivery_time": "3 workdays",
+                "specs": {"Diameter": "300 mm"},
+            },
+        )
+
+    def test_build_product_without_link_or_price(self):
+        product = build_product(
+            self.raw(href=None, encoded="abc", hasPrice=False, deliveryDays=None),
+            {"abc": "https://www.autoparts-24.com/decoded.html"},
+        )
+        self.assertEqual(product["url"], "https://www.autoparts-24.com/decoded.html")
+        self.assertEqual(product["price"], {"amount": None, "currency": "EUR"})
+        self.assertIsNone(product["delivery_time"])
+
+
+class PL2407Tests(SimpleTestCase):
+    def test_normalize_product(self):
+        self.assertEqual(
+            normalize_product(
+                {
+                    "title": "  Tarcza \n hamulcowa ",
+                    "href": "/tarcza-123",
+                    "image": "/img/1.jpg",
+                    "price": "1 234,56\nzł",
+                }
+            ),
+            {
+                "title": "Tarcza hamulcowa",
+                "image": "https://2407.pl/img/1.jpg",
+                "price": "1 234,56 zł",
+                "url": "https://2407.pl/tarcza-123",
+            },
+        )
+
+    def test_missing_values_are_none(self):
+        self.assertEqual(
+            normalize_product(
+                {"title": None, "href": None, "image": None, "price": ""}
+            ),
+            {"title": None, "image": None, "price": None, "url": None},
+        )
+
+
+class WaitTimerTests(SimpleTestCase):
+    async def test_as_dict(self):
+        timer = WaitTimer()
+        async with timer.measure("product_list"):
+            pass
+        with self.assertRaises(PlaywrightTimeoutError):
+            async with timer.measure("cookie_consent"):
+                raise PlaywrightTimeoutError("Timeout 5000ms exceeded")
+        async with timer.measure("cookie_consent"):
+            pass
+        timer.seconds["product_list"] = 0.25
+
+        waits = timer.as_dict()
+
+        self.assertEqual(list(waits["waits"]), ["cookie_consent", "product_list"])
+        self.assertEqual(
+            waits["waits"]["product_list"],
+            {"count": 1, "total_ms": 250.0, "timeouts": 0},
+        )
+        self.assertEqual(waits["waits"]["cookie_consent"]["count"], 2)
+        self.assertEqual(waits["waits"]["cookie_consent"]["timeouts"], 1)
+        self.assertGreaterEqual(waits["total_ms"], 250.0)
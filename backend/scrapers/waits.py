@@ -0,0 +1,59 @@
+"""
+Accounting for the time scrapers spend waiting on the site.
+
+Scrapers wait on conditions (a selector appearing, the URL changing) rather
+than fixed sleeps, and wrap each wait in ``WaitTimer.measure(name)`` so a
+search reports where its time went: how long each wait took and how often
+it timed out.
+"""
+
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+try:
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+except ImportError:  # scrapers/requirements.txt not installed; nothing can time out
+
+    class PlaywrightTimeoutError(Exception):
+        pass
+
+
+class WaitTimer:
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.counts = Counter()
+        self.timeouts = Counter()
+
+    @asynccontextmanager
+    async def measure(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        except PlaywrightTimeoutError:
+            self.timeouts[name] += 1
+            raise
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+            self.counts[name] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round(sum(self.seconds.values()) * 1000, 1),
+            "waits": {
+                name: {
+                    "count": self.counts[name],
+                    "total_ms": round(seconds * 1000, 1),
+                    "timeouts": self.timeouts[name],
+                }
+                for name, seconds in sorted(self.seconds.items())
+            },
+        }
+
+
+async def wait_for_url_change(page, old_url: str, timeout: float = 10000) -> None:
+    """Wait until the page left ``old_url`` and the new document is parsed."""
+    await page.wait_for_url(
+        lambda url: url != old_url, wait_until="domcontentloaded", timeout=timeout
+    )
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import SearchResult
+from .models import ExchangeRate, SearchJob, SearchJobSite, SearchResult
 
 
 @admin.register(SearchResult)
@@ -12,8 +12,57 @@ class SearchResultAdmin(admin.ModelAdmin):
         "url",
         "title",
         "price",
+        "price_currency",
+        "price_base",
         "created_at",
     )
-    list_filter = ("created_at",)
-    search_fields = ("url", "title", "search_keyword")
+    list_filter = ("created_at", "price_currency")
+    # Matched through the full-text index, see get_search_results()
+    search_fields = ("title", "search_keyword")
+    search_help_text = "Full-text search on title and search keyword."
+    ordering = ("-created_at",)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return queryset.search(search_term), False
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ("currency", "rate", "updated_at")
+    ordering = ("currency",)
+
+
+class SearchJobSiteInline(admin.TabularInline):
+    model = SearchJobSite
+    extra = 0
+    readonly_fields = (
+        "website_search_id",
+        "started_at",
+        "finished_at",
+        "persisted_at",
+        "result_count",
+        "error",
+    )
+
+
+@admin.register(SearchJob)
+class SearchJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "license_plate",
+        "part_name",
+        "status",
+        "batch",
+        "attempts",
+        "next_attempt_at",
+        "created_at",
+        "dispatched_at",
+        "completed_at",
+    )
+    list_filter = ("status", "created_at")
+    search_fields = ("license_plate", "part_name")
+    readonly_fields = ("created_at", "dispatched_at", "completed_at", "last_error")
+    inlines = [SearchJobSiteInline]
     ordering = ("-created_at",)
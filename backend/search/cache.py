@@ -0,0 +1,40 @@
+"""
+Response cache for the search result endpoints.
+
+Detail payloads are keyed by search_result_id and sort and stored with the
+group ETag they were built from; the view only serves one whose ETag still
+matches SearchGroup. List pages are keyed by cursor and page size together
+with a version summed up from all of SearchGroup: the number of groups and
+results and the newest created_at and updated_at. The triggers behind
+SearchGroup fire for every writer (ORM, bulk_create, n8n), so new rows,
+deletes and rows changed in place (through SearchResult.updated_at) all
+change the version and the stale entry is never read again. It is left to
+the backend's TTL and eviction to drop stale list pages; a stale detail is
+overwritten.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_search_cache():
+    return caches[settings.SEARCH_CACHE_ALIAS]
+
+
+def detail_key(search_result_id, sort="website") -> str:
+    return f"search:detail:{search_result_id}:{sort}"
+
+
+def list_key(version, cursor, page_size, query=None) -> str:
+    """``version`` is the SearchGroup aggregate, see SearchGroupListView."""
+    version = "-".join(
+        str(value.timestamp() if hasattr(value, "timestamp") else value)
+        for value in version.values()
+    )
+    key = f"search:list:{version}:{cursor or 'first'}:{page_size}"
+    if query:
+        digest = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()
+        key = f"{key}:q={digest}"
+    return key
@@ -0,0 +1,103 @@
+"""
+Circuit breaker around the n8n webhook.
+
+State lives in the default cache. Every gunicorn worker and the dispatcher
+only see the same circuit when that cache is shared between processes
+(Redis in production, see CACHES in settings); with the local-memory
+default each process has its own breaker, and the metrics endpoint of a web
+worker that never calls the webhook always reports it closed.
+
+    closed     calls go through; failures within N8N_CIRCUIT_FAILURE_WINDOW
+               seconds are counted, and reaching the threshold opens it
+    open       calls fail fast with CircuitOpenError for
+               N8N_CIRCUIT_RECOVERY_TIMEOUT seconds
+    half_open  after that, one process at a time may send a probe; success
+               closes the circuit, failure opens it again
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .http import webhook_timeout
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str):
+        self.name = name
+        self.failures_key = f"circuit:{name}:failures"
+        self.opened_key = f"circuit:{name}:opened_at"
+        self.probe_key = f"circuit:{name}:probe"
+
+    @property
+    def recovery_timeout(self) -> float:
+        return settings.N8N_CIRCUIT_RECOVERY_TIMEOUT
+
+    @property
+    def probe_timeout(self) -> float:
+        connect, read = webhook_timeout()
+        return (connect + read) * (settings.N8N_WEBHOOK_RETRIES + 1)
+
+    def state(self) -> str:
+        opened_at = cache.get(self.opened_key)
+        if opened_at is None:
+            return CLOSED
+        if time.time() - opened_at < self.recovery_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; claims the probe when half-open."""
+        state = self.state()
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+        # Only the first caller gets the probe. It expires once the probe call
+        # must have timed out, in case that caller dies before reporting back
+        return cache.add(self.probe_key, True, timeout=self.probe_timeout)
+
+    def record_success(self) -> None:
+        if self.state() != CLOSED:
+            cache.delete_many([self.opened_key, self.probe_key])
+        cache.delete(self.failures_key)
+
+    def record_failure(self) -> None:
+        if self.state() != CLOSED:
+            # The probe failed: stay open for another recovery period
+            self._open()
+            return
+        window = settings.N8N_CIRCUIT_FAILURE_WINDOW
+        cache.add(self.failures_key, 0, timeout=window)
+        try:
+            failures = cache.incr(self.failures_key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(self.failures_key, 1, timeout=window)
+            failures = 1
+        if failures >= settings.N8N_CIRCUIT_FAILURE_THRESHOLD:
+            self._open()
+
+    def _open(self) -> None:
+        cache.set(self.opened_key, time.time(), timeout=None)
+        cache.delete_many([self.failures_key, self.probe_key])
+
+    def snapshot(self):
+        opened_at = cache.get(self.opened_key)
+        return {
+            "state": self.state(),
+            "failures": cache.get(self.failures_key, 0),
+            "opened_at": opened_at,
+        }
+
+
+webhook_breaker = CircuitBreaker("n8n.webhook")
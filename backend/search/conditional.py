@@ -0,0 +1,84 @@
+"""
+Validators for conditional GETs on the search result endpoints.
+
+The frontend polls the result endpoints while a search is running. Each
+response carries an ETag and Last-Modified derived from the group's row count
+and newest created_at and updated_at, so a poll that finds nothing new is
+answered with a 304 before anything is serialized.
+
+HTTP dates have whole-second resolution, so Last-Modified is only sent once
+its second is over: a second write within the same second would otherwise
+leave the date unchanged and earn a wrong 304 on If-Modified-Since. Until
+then the response carries the ETag alone.
+"""
+
+import hashlib
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+CONDITIONAL_HEADERS = ("HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+
+
+def is_conditional(request) -> bool:
+    return any(header in request.META for header in CONDITIONAL_HEADERS)
+
+
+def group_etag(
+    search_result_id, count, latest_created_at, latest_updated_at=None
+) -> str:
+    """ETag of one search_result_id group, computable from SearchGroup or its rows."""
+    version = f"{search_result_id}-{count}-{microseconds(latest_created_at)}"
+    if latest_updated_at is not None:
+        version = f"{version}-{microseconds(latest_updated_at)}"
+    return quote_etag(version)
+
+
+def group_last_modified(latest_created_at, latest_updated_at=None):
+    if latest_updated_at is None:
+        return latest_created_at
+    return max(latest_created_at, latest_updated_at)
+
+
+def http_seconds(last_modified):
+    """``last_modified`` in whole seconds, or None while that second is running."""
+    if last_modified is None:
+        return None
+    seconds = int(last_modified.timestamp())
+    if seconds >= int(timezone.now().timestamp()):
+        return None
+    return seconds
+
+
+def microseconds(value) -> int:
+    return int(value.timestamp() * 1_000_000)
+
+
+def page_etag(rows, next_cursor) -> str:
+    """ETag of one page of the group listing."""
+    digest = hashlib.md5(usedforsecurity=False)
+    for row in rows:
+        digest.update(
+            f"{row['search_result_id']}:{row['count']}:"
+            f"{row['latest_created_at'].isoformat()}:{row['search_keyword']};".encode()
+        )
+    digest.update(f"next={next_cursor}".encode())
+    return quote_etag(digest.hexdigest())
+
+
+def not_modified(request, etag, last_modified):
+    """Return a 304 response if the client's copy is current, else None."""
+    return get_conditional_response(
+        request, etag=etag, last_modified=http_seconds(last_modified)
+    )
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    seconds = http_seconds(last_modified)
+    if seconds is not None:
+        response["Last-Modified"] = http_date(seconds)
+    # Let clients keep the body but make them revalidate on every poll
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
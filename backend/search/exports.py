@@ -0,0 +1,105 @@
+"""
+Streaming export of SearchResult rows as NDJSON or CSV.
+
+Rows are read in chunks and written one line at a time, so memory use stays
+flat however many rows match. Each handler needs its own kind of iterator,
+or it buffers the whole export: the endpoint streams through the async one
+under ASGI and through the sync one under WSGI (runserver, the test client),
+as does the ``export_search_results`` management command.
+"""
+
+import csv
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import SearchResult
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_FIELDS = (
+    "id",
+    "search_result_id",
+    "website_search_id",
+    "search_keyword",
+    "title",
+    "price",
+    "price_currency",
+    "price_base",
+    "url",
+    "created_at",
+)
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+CHUNK_SIZE = 2000
+
+
+def parse_bound(value, end_of_day=False):
+    """Parse an ISO date or datetime filter; a bare date covers the whole day."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date: {value!r}")
+        parsed = datetime.datetime.combine(
+            day, datetime.time.max if end_of_day else datetime.time.min
+        )
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def export_queryset(since=None, until=None, keyword=None, website=None):
+    queryset = SearchResult.objects.order_by("id")
+    if since:
+        queryset = queryset.filter(created_at__gte=parse_bound(since))
+    if until:
+        queryset = queryset.filter(created_at__lte=parse_bound(until, end_of_day=True))
+    if keyword:
+        queryset = queryset.filter(search_keyword__iexact=keyword)
+    if website:
+        queryset = queryset.filter(website_search_id=int(website))
+    return queryset.values(*EXPORT_FIELDS)
+
+
+class Echo:
+    """File-like object whose write() hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def get_formatter(export_format):
+    """Return ``(header line or None, row -> line function)``."""
+    if export_format == "csv":
+        writer = csv.writer(Echo())
+
+        def to_csv_line(row):
+            return writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+        return writer.writerow(EXPORT_FIELDS), to_csv_line
+
+    def to_json_line(row):
+        return json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+    return None, to_json_line
+
+
+def iter_export(export_format, rows):
+    header, format_row = get_formatter(export_format)
+    if header:
+        yield header
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield format_row(row)
+
+
+async def aiter_export(export_format, rows):
+    header, format_row = get_formatter(export_format)
+    if header:
+        yield header
+    async for row in rows.aiterator(chunk_size=CHUNK_SIZE):
+        yield format_row(row)
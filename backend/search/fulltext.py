@@ -0,0 +1,88 @@
+"""
+Full-text search over SearchResult.title and SearchResult.search_keyword.
+
+Backed by the database's own full-text index, created in migration 0007:
+an FTS5 external-content table on SQLite and a FULLTEXT INDEX with automatic
+change tracking on MSSQL. Both are updated incrementally as rows are written.
+Where no index exists (e.g. MSSQL without the Full-Text Search feature) the
+lookup degrades to ``icontains``.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "search_searchresult_fts"
+MAX_TERMS = 8
+
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+MATCHING_IDS_SQL = {
+    "sqlite": f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+    "microsoft": (
+        "SELECT [KEY] FROM CONTAINSTABLE(search_searchresult, "
+        "(title, search_keyword), %s)"
+    ),
+}
+
+# Prefix match on every term, in each backend's query syntax
+TERM_FORMATS = {
+    "sqlite": '"{}"*',
+    "microsoft": '"{}*"',
+}
+
+INDEX_EXISTS_SQL = {
+    "sqlite": f"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '{FTS_TABLE}'",
+    "microsoft": (
+        "SELECT 1 FROM sys.fulltext_indexes "
+        "WHERE object_id = OBJECT_ID('search_searchresult')"
+    ),
+}
+
+_index_available = {}
+
+
+def search_terms(query: str):
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def match_expression(terms, vendor):
+    return " AND ".join(TERM_FORMATS[vendor].format(term) for term in terms)
+
+
+def has_fulltext_index(connection) -> bool:
+    if connection.alias not in _index_available:
+        sql = INDEX_EXISTS_SQL.get(connection.vendor)
+        available = False
+        if sql is not None:
+            with connection.cursor() as cursor:
+                cursor.execute(sql)
+                available = cursor.fetchone() is not None
+        _index_available[connection.alias] = available
+    return _index_available[connection.alias]
+
+
+def search_filter(query: str, using: str = "default"):
+    """
+    Return a Q matching SearchResult rows for ``query``, or None when the
+    query has no searchable terms.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return None
+
+    connection = connections[using]
+    if has_fulltext_index(connection):
+        return Q(
+            id__in=RawSQL(
+                MATCHING_IDS_SQL[connection.vendor],
+                [match_expression(terms, connection.vendor)],
+            )
+        )
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(search_keyword__icontains=term)
+    return condition
@@ -0,0 +1,102 @@
+"""
+Process-wide pooled HTTP session for outgoing webhook calls.
+
+One ``requests.Session`` per process keeps TCP+TLS connections to the n8n
+host alive between searches. Its adapter retries failures that are safe to
+repeat for a POST: connection errors (the request never reached the server)
+and 502/503 from the gateway (n8n was unreachable or refused the request).
+A 504 is not retried: the gateway did forward the POST and only gave up
+waiting, so n8n may already be running the workflow. Read timeouts are not
+retried for the same reason.
+Backoff between attempts is jittered so workers do not retry in lockstep.
+
+Everything is read from settings, so tests can point N8N_WEBHOOK_URL at a
+local stub server; the session is rebuilt whenever those settings change.
+"""
+
+import random
+import threading
+
+import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (502, 503)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class JitteredRetry(Retry):
+    """Retry whose exponential backoff gets up to ``jitter`` seconds added."""
+
+    def __init__(self, *args, jitter: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jitter = jitter
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.jitter = self.jitter
+        return retry
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0 or not self.jitter:
+            return backoff
+        return min(self.backoff_max, backoff + random.uniform(0, self.jitter))
+
+
+def build_session() -> requests.Session:
+    retries = settings.N8N_WEBHOOK_RETRIES
+    retry = JitteredRetry(
+        total=retries,
+        connect=retries,
+        read=0,
+        status=retries,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=None,  # POST included; only pre-processing failures retry
+        backoff_factor=settings.N8N_WEBHOOK_BACKOFF,
+        jitter=settings.N8N_WEBHOOK_BACKOFF_JITTER,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=settings.OUTBOUND_HTTP_POOL_SIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def reset_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def webhook_timeout():
+    """(connect, read) timeout for webhook calls."""
+    return (settings.N8N_WEBHOOK_CONNECT_TIMEOUT, settings.N8N_WEBHOOK_READ_TIMEOUT)
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting.startswith("N8N_WEBHOOK_") or setting == "OUTBOUND_HTTP_POOL_SIZE":
+        reset_session()
@@ -0,0 +1,39 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.exports import EXPORT_FORMATS, export_queryset, iter_export
+
+
+class Command(BaseCommand):
+    help = "Stream SearchResult rows to a file or stdout as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", dest="export_format", choices=EXPORT_FORMATS, default="ndjson"
+        )
+        parser.add_argument(
+            "--output", help="File to write to (defaults to stdout)."
+        )
+        parser.add_argument("--since", help="ISO date/datetime, created_at >= since.")
+        parser.add_argument("--until", help="ISO date/datetime, created_at <= until.")
+        parser.add_argument("--keyword", help="search_keyword, case insensitive.")
+        parser.add_argument("--website", type=int, help="website_search_id.")
+
+    def handle(self, *args, **options):
+        try:
+            rows = export_queryset(
+                since=options["since"],
+                until=options["until"],
+                keyword=options["keyword"],
+                website=options["website"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        lines = iter_export(options["export_format"], rows)
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as f:
+                f.writelines(lines)
+        else:
+            sys.stdout.writelines(lines)
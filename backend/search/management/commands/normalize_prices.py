@@ -0,0 +1,94 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F, Max, Min, Q, Value
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from search.models import ExchangeRate, SearchResult
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute SearchResult.price_base from the local ExchangeRate table. "
+        "Only rows whose value changes are written, in primary-key ranges of "
+        "--batch-size rows per UPDATE, so a routine rate refresh leaves "
+        "unchanged groups (their ETags and cached payloads) alone. Rows stored "
+        "before prices carried a currency can be assigned one with --currency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--currency",
+            help=(
+                "ISO code to record for rows without a price_currency, e.g. PLN "
+                "for results scraped from 2407.pl."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Primary-key range per UPDATE (default {DEFAULT_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        currency = options["currency"]
+        if currency:
+            currency = currency.strip().upper()
+            if len(currency) != 3:
+                raise CommandError("--currency must be a 3-letter ISO code.")
+
+        rates = ExchangeRate.objects.as_dict()
+        bounds = SearchResult.objects.aggregate(first=Min("pk"), last=Max("pk"))
+        if bounds["first"] is None:
+            self.stdout.write("No results to normalize.")
+            return
+        # Changed rows get a new updated_at, which moves their group's ETag
+        # and retires cached result payloads
+        now = timezone.now()
+
+        def update(queryset, **values):
+            """UPDATE ``queryset`` one pk range at a time, each its own transaction."""
+            updated = 0
+            for start in range(bounds["first"], bounds["last"] + 1, batch_size):
+                updated += queryset.filter(
+                    pk__gte=start, pk__lt=start + batch_size
+                ).update(updated_at=now, **values)
+            return updated
+
+        if currency:
+            assigned = update(
+                SearchResult.objects.filter(price_currency__isnull=True),
+                price_currency=currency,
+            )
+            self.stdout.write(f"Assigned {currency} to {assigned} results.")
+
+        converted = 0
+        for code, rate in rates.items():
+            # Rounded like search.pricing.to_base, so unchanged rows compare equal
+            base = Round(F("price") * Value(rate), 3)
+            converted += update(
+                SearchResult.objects.filter(price_currency=code).filter(
+                    ~Q(price_base=base) | Q(price_base__isnull=True)
+                ),
+                price_base=base,
+            )
+        # Currencies without a rate cannot be compared, rather than
+        # keeping a base price from a rate that no longer exists
+        cleared = update(
+            SearchResult.objects.exclude(price_currency__in=rates).exclude(
+                price_base__isnull=True
+            ),
+            price_base=None,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated {converted} base prices, cleared {cleared}; "
+                f"unchanged rows were left alone."
+            )
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from search.models import SearchGroup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the SearchGroup summary table from all SearchResult rows."
+
+    def handle(self, *args, **options):
+        groups = SearchGroup.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {groups} search groups."))
@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from search.circuit import HALF_OPEN, OPEN, webhook_breaker
+from search.services import SearchDispatchService
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker that sends queued parts searches (SearchJob) to the n8n "
+        "webhook. Several workers can run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=20)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Webhook calls in flight at once.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when no job is due.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the jobs currently due and exit.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            # Shed load while n8n is down: leave the queue alone when the
+            # circuit is open and send a single probe job when half-open
+            circuit_state = webhook_breaker.state()
+            if circuit_state == OPEN:
+                if options["once"]:
+                    return
+                time.sleep(options["poll_interval"])
+                continue
+            batch_size = 1 if circuit_state == HALF_OPEN else options["batch_size"]
+            jobs = SearchDispatchService.claim(batch_size)
+            if jobs:
+                dispatched, failed = SearchDispatchService.dispatch_batch(
+                    jobs, options["concurrency"]
+                )
+                self.stdout.write(
+                    f"Dispatched {dispatched} searches, {failed} not dispatched."
+                )
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["poll_interval"])
@@ -0,0 +1,90 @@
+import xml.etree.ElementTree as ET
+from decimal import Decimal, InvalidOperation
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from search.models import ExchangeRate
+
+ECB_DAILY_URL = "https://www.ecb.europa.eu/stats/eurofxref/eurofxref-daily.xml"
+ECB_NAMESPACE = "{http://www.ecb.int/vocabulary/2002-08-01/eurofxref}"
+
+
+def fetch_ecb_rates(timeout=15):
+    """Return ECB reference rates as units of each currency per 1 EUR."""
+    response = requests.get(ECB_DAILY_URL, timeout=timeout)
+    response.raise_for_status()
+    root = ET.fromstring(response.content)
+    rates = {"EUR": Decimal(1)}
+    for cube in root.iter(f"{ECB_NAMESPACE}Cube"):
+        if "currency" in cube.attrib:
+            rates[cube.attrib["currency"]] = Decimal(cube.attrib["rate"])
+    return rates
+
+
+def to_base_rates(per_eur, base_currency):
+    """Turn per-EUR quotes into the value of one unit in ``base_currency``."""
+    if base_currency not in per_eur:
+        raise CommandError(f"ECB publishes no rate for {base_currency}.")
+    base_per_eur = per_eur[base_currency]
+    return {
+        currency: (base_per_eur / quote).quantize(Decimal("0.00000001"))
+        for currency, quote in per_eur.items()
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the local ExchangeRate table used by price normalization from "
+        "the ECB daily reference rates. Run normalize_prices afterwards to "
+        "recompute stored base prices."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rate",
+            action="append",
+            default=[],
+            metavar="CUR=VALUE",
+            help=(
+                "Set a rate by hand as the value of one unit in BASE_CURRENCY, "
+                "e.g. --rate PLN=0.2341. May be repeated."
+            ),
+        )
+        parser.add_argument(
+            "--no-fetch",
+            action="store_true",
+            help="Only apply the --rate values, do not contact the ECB.",
+        )
+
+    def handle(self, *args, **options):
+        rates = {}
+        if not options["no_fetch"]:
+            try:
+                per_eur = fetch_ecb_rates()
+            except (requests.RequestException, ET.ParseError) as exc:
+                raise CommandError(f"Could not fetch ECB rates: {exc}")
+            rates.update(to_base_rates(per_eur, settings.BASE_CURRENCY))
+
+        for value in options["rate"]:
+            currency, _, rate = value.partition("=")
+            try:
+                rates[currency.strip().upper()] = Decimal(rate)
+            except InvalidOperation:
+                raise CommandError(f"Invalid --rate {value!r}, expected CUR=VALUE.")
+
+        if not rates:
+            raise CommandError("No rates to store.")
+
+        with transaction.atomic():
+            for currency, rate in rates.items():
+                ExchangeRate.objects.update_or_create(
+                    currency=currency, defaults={"rate": rate}
+                )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {len(rates)} exchange rates into {settings.BASE_CURRENCY}."
+            )
+        )
@@ -0,0 +1,89 @@
+"""
+In-process latency metrics for outgoing calls.
+
+Each timer keeps counters plus a bounded window of recent durations, enough
+for p50/p95/p99 without a metrics backend. Values are per process: every
+gunicorn worker reports its own.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+WINDOW_SIZE = 1024
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = round(fraction * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+def to_ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+class Timer:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=WINDOW_SIZE)
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self.count += 1
+        self.errors += error
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def snapshot(self):
+        recent = sorted(self.recent)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": to_ms(self.total / self.count) if self.count else None,
+            "max_ms": to_ms(self.max),
+            "p50_ms": to_ms(percentile(recent, 0.50)),
+            "p95_ms": to_ms(percentile(recent, 0.95)),
+            "p99_ms": to_ms(percentile(recent, 0.99)),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timers = {}
+
+    def observe(self, name: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            self._timers.setdefault(name, Timer()).observe(seconds, error)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Time the block; an exception counts as an error and propagates."""
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, error)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: timer.snapshot() for name, timer in sorted(self._timers.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timers.clear()
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_searchresult_search_keyword'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='searchresult',
+            index=models.Index(fields=['search_result_id', 'created_at'], name='searchresult_group_latest_idx'),
+        ),
+    ]
@@ -0,0 +1,172 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:33
+
+from django.db import migrations, models
+
+# The summary table is maintained in the database rather than in Python so
+# that rows inserted by the n8n workflow (which writes to the table directly)
+# are counted exactly like rows coming from save() or bulk_create().
+# Inserts are applied incrementally; updates and deletes recompute the touched
+# groups from the (search_result_id, created_at) index.
+TRIGGERS = {
+    "sqlite": {
+        "create": [
+            """
+            CREATE TRIGGER search_searchresult_group_insert
+            AFTER INSERT ON search_searchresult
+            BEGIN
+                INSERT INTO search_searchgroup
+                    (search_result_id, search_keyword, "count", latest_created_at)
+                VALUES (NEW.search_result_id, NEW.search_keyword, 1, NEW.created_at)
+                ON CONFLICT (search_result_id) DO UPDATE SET
+                    search_keyword = excluded.search_keyword,
+                    "count" = "count" + 1,
+                    latest_created_at = MAX(latest_created_at, excluded.latest_created_at);
+            END
+            """,
+            """
+            CREATE TRIGGER search_searchresult_group_update
+            AFTER UPDATE OF search_result_id, search_keyword, created_at
+            ON search_searchresult
+            BEGIN
+                DELETE FROM search_searchgroup
+                WHERE search_result_id IN (OLD.search_result_id, NEW.search_result_id);
+                INSERT INTO search_searchgroup
+                    (search_result_id, search_keyword, "count", latest_created_at)
+                SELECT search_result_id, MAX(search_keyword), COUNT(*), MAX(created_at)
+                FROM search_searchresult
+                WHERE search_result_id IN (OLD.search_result_id, NEW.search_result_id)
+                GROUP BY search_result_id;
+            END
+            """,
+            """
+            CREATE TRIGGER search_searchresult_group_delete
+            AFTER DELETE ON search_searchresult
+            BEGIN
+                DELETE FROM search_searchgroup
+                WHERE search_result_id = OLD.search_result_id;
+                INSERT INTO search_searchgroup
+                    (search_result_id, search_keyword, "count", latest_created_at)
+                SELECT search_result_id, MAX(search_keyword), COUNT(*), MAX(created_at)
+                FROM search_searchresult
+                WHERE search_result_id = OLD.search_result_id
+                GROUP BY search_result_id;
+            END
+            """,
+        ],
+        "drop": [
+            "DROP TRIGGER IF EXISTS search_searchresult_group_insert",
+            "DROP TRIGGER IF EXISTS search_searchresult_group_update",
+            "DROP TRIGGER IF EXISTS search_searchresult_group_delete",
+        ],
+    },
+    "microsoft": {
+        "create": [
+            """
+            CREATE TRIGGER search_searchresult_group_insert
+            ON search_searchresult AFTER INSERT AS
+            BEGIN
+                SET NOCOUNT ON;
+                MERGE search_searchgroup WITH (HOLDLOCK) AS g
+                USING (
+                    SELECT search_result_id,
+                           MAX(search_keyword) AS search_keyword,
+                           COUNT(*) AS row_count,
+                           MAX(created_at) AS latest_created_at
+                    FROM inserted
+                    GROUP BY search_result_id
+                ) AS i
+                ON g.search_result_id = i.search_result_id
+                WHEN MATCHED THEN UPDATE SET
+                    g.search_keyword = i.search_keyword,
+                    g.[count] = g.[count] + i.row_count,
+                    g.latest_created_at = CASE
+                        WHEN i.latest_created_at > g.latest_created_at
+                        THEN i.latest_created_at
+                        ELSE g.latest_created_at
+                    END
+                WHEN NOT MATCHED THEN
+                    INSERT (search_result_id, search_keyword, [count], latest_created_at)
+                    VALUES (i.search_result_id, i.search_keyword, i.row_count,
+                            i.latest_created_at);
+            END
+            """,
+            """
+            CREATE TRIGGER search_searchresult_group_change
+            ON search_searchresult AFTER UPDATE, DELETE AS
+            BEGIN
+                SET NOCOUNT ON;
+                DELETE FROM search_searchgroup
+                WHERE search_result_id IN (
+                    SELECT search_result_id FROM deleted
+                    UNION SELECT search_result_id FROM inserted
+                );
+                INSERT INTO search_searchgroup
+                    (search_result_id, search_keyword, [count], latest_created_at)
+                SELECT search_result_id, MAX(search_keyword), COUNT(*), MAX(created_at)
+                FROM search_searchresult
+                WHERE search_result_id IN (
+                    SELECT search_result_id FROM deleted
+                    UNION SELECT search_result_id FROM inserted
+                )
+                GROUP BY search_result_id;
+            END
+            """,
+        ],
+        "drop": [
+            "DROP TRIGGER IF EXISTS search_searchresult_group_insert",
+            "DROP TRIGGER IF EXISTS search_searchresult_group_change",
+        ],
+    },
+}
+
+
+def run_trigger_sql(schema_editor, action):
+    statements = TRIGGERS.get(schema_editor.connection.vendor)
+    if statements is None:
+        # Unknown backend: the table is only refreshed by rebuild_search_groups
+        return
+    for statement in statements[action]:
+        schema_editor.execute(statement)
+
+
+def create_triggers(apps, schema_editor):
+    run_trigger_sql(schema_editor, "create")
+
+
+def drop_triggers(apps, schema_editor):
+    run_trigger_sql(schema_editor, "drop")
+
+
+def backfill_groups(apps, schema_editor):
+    qn = schema_editor.connection.ops.quote_name
+    schema_editor.execute(
+        f"INSERT INTO search_searchgroup "
+        f"(search_result_id, search_keyword, {qn('count')}, latest_created_at) "
+        f"SELECT search_result_id, MAX(search_keyword), COUNT(*), MAX(created_at) "
+        f"FROM search_searchresult GROUP BY search_result_id"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0003_searchresult_group_latest_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchGroup',
+            fields=[
+                ('search_result_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('search_keyword', models.CharField(max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('latest_created_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-latest_created_at', '-search_result_id'],
+                'indexes': [models.Index(fields=['-latest_created_at', '-search_result_id'], name='searchgroup_latest_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_groups, migrations.RunPython.noop),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
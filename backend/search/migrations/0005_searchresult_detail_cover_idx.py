@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0004_searchgroup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='searchresult',
+            index=models.Index(fields=['search_result_id', 'website_search_id'], include=('title', 'price', 'url', 'search_keyword'), name='searchresult_detail_cover_idx'),
+        ),
+    ]
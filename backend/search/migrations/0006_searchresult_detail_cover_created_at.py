@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0005_searchresult_detail_cover_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='searchresult',
+            name='searchresult_detail_cover_idx',
+        ),
+        migrations.AddIndex(
+            model_name='searchresult',
+            index=models.Index(fields=['search_result_id', 'website_search_id'], include=('title', 'price', 'url', 'search_keyword', 'created_at'), name='searchresult_detail_cover_idx'),
+        ),
+    ]
@@ -0,0 +1,129 @@
+from django.db import migrations
+
+# Full-text index over title and search_keyword, maintained by the database
+# as rows are written. See search/fulltext.py for the matching queries.
+
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE search_searchresult_fts USING fts5(
+        title,
+        search_keyword,
+        content='search_searchresult',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER search_searchresult_fts_insert
+    AFTER INSERT ON search_searchresult
+    BEGIN
+        INSERT INTO search_searchresult_fts (rowid, title, search_keyword)
+        VALUES (NEW.id, NEW.title, NEW.search_keyword);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchresult_fts_delete
+    AFTER DELETE ON search_searchresult
+    BEGIN
+        INSERT INTO search_searchresult_fts
+            (search_searchresult_fts, rowid, title, search_keyword)
+        VALUES ('delete', OLD.id, OLD.title, OLD.search_keyword);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchresult_fts_update
+    AFTER UPDATE OF title, search_keyword ON search_searchresult
+    BEGIN
+        INSERT INTO search_searchresult_fts
+            (search_searchresult_fts, rowid, title, search_keyword)
+        VALUES ('delete', OLD.id, OLD.title, OLD.search_keyword);
+        INSERT INTO search_searchresult_fts (rowid, title, search_keyword)
+        VALUES (NEW.id, NEW.title, NEW.search_keyword);
+    END
+    """,
+    "INSERT INTO search_searchresult_fts (search_searchresult_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS search_searchresult_fts_insert",
+    "DROP TRIGGER IF EXISTS search_searchresult_fts_delete",
+    "DROP TRIGGER IF EXISTS search_searchresult_fts_update",
+    "DROP TABLE IF EXISTS search_searchresult_fts",
+]
+
+# Full-text indexes need the Full-Text Search feature and cannot be created
+# inside a user transaction, hence the feature check and atomic = False.
+# CHANGE_TRACKING AUTO keeps the index current as rows are inserted.
+MSSQL_CREATE = [
+    """
+    IF FULLTEXTSERVICEPROPERTY('IsFullTextInstalled') = 1
+    AND NOT EXISTS (
+        SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'search_fulltext_catalog'
+    )
+        CREATE FULLTEXT CATALOG search_fulltext_catalog
+    """,
+    """
+    IF FULLTEXTSERVICEPROPERTY('IsFullTextInstalled') = 1
+    AND NOT EXISTS (
+        SELECT 1 FROM sys.fulltext_indexes
+        WHERE object_id = OBJECT_ID('search_searchresult')
+    )
+    BEGIN
+        DECLARE @key_index sysname = (
+            SELECT name FROM sys.indexes
+            WHERE object_id = OBJECT_ID('search_searchresult') AND is_primary_key = 1
+        );
+        EXEC (
+            'CREATE FULLTEXT INDEX ON search_searchresult (title, search_keyword) '
+            + 'KEY INDEX ' + @key_index + ' ON search_fulltext_catalog '
+            + 'WITH CHANGE_TRACKING AUTO'
+        );
+    END
+    """,
+]
+
+MSSQL_DROP = [
+    """
+    IF EXISTS (
+        SELECT 1 FROM sys.fulltext_indexes
+        WHERE object_id = OBJECT_ID('search_searchresult')
+    )
+        DROP FULLTEXT INDEX ON search_searchresult
+    """,
+    """
+    IF EXISTS (
+        SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'search_fulltext_catalog'
+    )
+        DROP FULLTEXT CATALOG search_fulltext_catalog
+    """,
+]
+
+STATEMENTS = {
+    "sqlite": (SQLITE_CREATE, SQLITE_DROP),
+    "microsoft": (MSSQL_CREATE, MSSQL_DROP),
+}
+
+
+def create_fulltext_index(apps, schema_editor):
+    create, _ = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for statement in create:
+        schema_editor.execute(statement)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    _, drop = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for statement in drop:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("search", "0006_searchresult_detail_cover_created_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
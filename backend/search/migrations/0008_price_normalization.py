@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0007_searchresult_fulltext'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('currency', models.CharField(max_length=3, primary_key=True, serialize=False)),
+                ('rate', models.DecimalField(decimal_places=8, max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['currency'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='searchresult',
+            name='searchresult_detail_cover_idx',
+        ),
+        migrations.AddField(
+            model_name='searchresult',
+            name='price_base',
+            field=models.DecimalField(blank=True, decimal_places=3, max_digits=15, null=True),
+        ),
+        migrations.AddField(
+            model_name='searchresult',
+            name='price_currency',
+            field=models.CharField(blank=True, max_length=3, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='searchresult',
+            index=models.Index(fields=['search_result_id', 'website_search_id'], include=('title', 'price', 'price_currency', 'price_base', 'url', 'search_keyword', 'created_at'), name='searchresult_detail_cover_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchresult',
+            index=models.Index(fields=['search_result_id', 'price_base'], name='searchresult_group_price_idx'),
+        ),
+    ]
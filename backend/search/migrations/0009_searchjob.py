@@ -0,0 +1,66 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:47
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def reseed_job_ids(apps, schema_editor):
+    """
+    Start job ids above every search_result_id n8n has assigned so far, so
+    ids handed out by the outbox never collide with existing result groups.
+    """
+    SearchResult = apps.get_model("search", "SearchResult")
+    highest = SearchResult.objects.aggregate(highest=Max("search_result_id"))["highest"]
+    if not highest:
+        return
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            "INSERT INTO sqlite_sequence (name, seq) VALUES ('search_searchjob', %s)",
+            [highest],
+        )
+    elif vendor == "microsoft":
+        # Unlike the sqlite and postgres sequences, which hand out seq + 1, an
+        # identity that never had a row inserted starts at the reseed value
+        # itself, so reseeding to ``highest`` would reuse that id
+        schema_editor.execute(
+            f"DBCC CHECKIDENT ('search_searchjob', RESEED, {int(highest) + 1})"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            "SELECT setval(pg_get_serial_sequence('search_searchjob', 'id'), %s)",
+            [highest],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0008_price_normalization'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('license_plate', models.CharField(max_length=20)),
+                ('part_name', models.CharField(max_length=100)),
+                ('car_type', models.CharField(max_length=100)),
+                ('car_model_type', models.CharField(max_length=100)),
+                ('car_model', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('dispatching', 'Dispatching'), ('dispatched', 'Dispatched'), ('failed', 'Failed')], default='pending', max_length=12)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('dispatched_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='searchjob_due_idx')],
+            },
+        ),
+        migrations.RunPython(reseed_job_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0009_searchjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchjob',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='searchjob',
+            index=models.Index(fields=['fingerprint', 'dispatched_at'], name='searchjob_fingerprint_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='searchjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('fingerprint__isnull', False), ('status__in', ['pending', 'dispatching'])), fields=('fingerprint',), name='unique_queued_search'),
+        ),
+    ]
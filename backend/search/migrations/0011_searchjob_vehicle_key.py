@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0010_searchjob_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchjob',
+            name='vehicle_key',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='searchjob',
+            index=models.Index(fields=['vehicle_key', 'dispatched_at'], name='searchjob_vehicle_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0011_searchjob_vehicle_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchjob',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='searchjob',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('dispatching', 'Dispatching'), ('dispatched', 'Dispatched'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=12),
+        ),
+        migrations.CreateModel(
+            name='SearchJobSite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('website_search_id', models.BigIntegerField()),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('persisted_at', models.DateTimeField(blank=True, null=True)),
+                ('result_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sites', to='search.searchjob')),
+            ],
+            options={
+                'ordering': ['job', 'website_search_id'],
+                'constraints': [models.UniqueConstraint(fields=('job', 'website_search_id'), name='unique_job_website')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0012_searchjob_lifecycle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('license_plate', models.CharField(max_length=20)),
+                ('car_type', models.CharField(max_length=100)),
+                ('car_model_type', models.CharField(max_length=100)),
+                ('car_model', models.CharField(max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='searchjob',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='search.searchbatch'),
+        ),
+    ]
@@ -0,0 +1,134 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:12
+
+import importlib
+
+from django.db import migrations, models
+
+# The groups also track MAX(updated_at), so the update and delete triggers
+# recompute it and the update trigger fires when updated_at is written. The
+# insert triggers are unchanged: new rows carry no updated_at.
+TRIGGERS = {
+    "sqlite": {
+        "create": [
+            """
+            CREATE TRIGGER search_searchresult_group_update
+            AFTER UPDATE OF search_result_id, search_keyword, created_at, updated_at
+            ON search_searchresult
+            BEGIN
+                DELETE FROM search_searchgroup
+                WHERE search_result_id IN (OLD.search_result_id, NEW.search_result_id);
+                INSERT INTO search_searchgroup
+                    (search_result_id, search_keyword, "count", latest_created_at,
+                     latest_updated_at)
+                SELECT search_result_id, MAX(search_keyword), COUNT(*), MAX(created_at),
+                       MAX(updated_at)
+                FROM search_searchresult
+                WHERE search_result_id IN (OLD.search_result_id, NEW.search_result_id)
+                GROUP BY search_result_id;
+            END
+            """,
+            """
+            CREATE TRIGGER search_searchresult_group_delete
+            AFTER DELETE ON search_searchresult
+            BEGIN
+                DELETE FROM search_searchgroup
+                WHERE search_result_id = OLD.search_result_id;
+                INSERT INTO search_searchgroup
+                    (search_result_id, search_keyword, "count", latest_created_at,
+                     latest_updated_at)
+                SELECT search_result_id, MAX(search_keyword), COUNT(*), MAX(created_at),
+                       MAX(updated_at)
+                FROM search_searchresult
+                WHERE search_result_id = OLD.search_result_id
+                GROUP BY search_result_id;
+            END
+            """,
+        ],
+        "drop": [
+            "DROP TRIGGER IF EXISTS search_searchresult_group_update",
+            "DROP TRIGGER IF EXISTS search_searchresult_group_delete",
+        ],
+    },
+    "microsoft": {
+        "create": [
+            """
+            CREATE TRIGGER search_searchresult_group_change
+            ON search_searchresult AFTER UPDATE, DELETE AS
+            BEGIN
+                SET NOCOUNT ON;
+                DELETE FROM search_searchgroup
+                WHERE search_result_id IN (
+                    SELECT search_result_id FROM deleted
+                    UNION SELECT search_result_id FROM inserted
+                );
+                INSERT INTO search_searchgroup
+                    (search_result_id, search_keyword, [count], latest_created_at,
+                     latest_updated_at)
+                SELECT search_result_id, MAX(search_keyword), COUNT(*), MAX(created_at),
+                       MAX(updated_at)
+                FROM search_searchresult
+                WHERE search_result_id IN (
+                    SELECT search_result_id FROM deleted
+                    UNION SELECT search_result_id FROM inserted
+                )
+                GROUP BY search_result_id;
+            END
+            """,
+        ],
+        "drop": [
+            "DROP TRIGGER IF EXISTS search_searchresult_group_change",
+        ],
+    },
+}
+
+
+def previous_triggers(vendor):
+    """The 0004 definitions of the triggers replaced here."""
+    initial = importlib.import_module("search.migrations.0004_searchgroup").TRIGGERS
+    # Everything but the insert trigger, which comes first
+    return initial[vendor]["create"][1:]
+
+
+def replace_triggers(apps, schema_editor):
+    statements = TRIGGERS.get(schema_editor.connection.vendor)
+    if statements is None:
+        return
+    for statement in statements["drop"] + statements["create"]:
+        schema_editor.execute(statement)
+
+
+def restore_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in TRIGGERS:
+        return
+    for statement in TRIGGERS[vendor]["drop"] + previous_triggers(vendor):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0013_searchbatch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchresult',
+            name='updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='searchgroup',
+            name='latest_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RemoveIndex(
+            model_name='searchresult',
+            name='searchresult_detail_cover_idx',
+        ),
+        migrations.AddIndex(
+            model_name='searchresult',
+            index=models.Index(fields=['search_result_id', 'website_search_id'], include=('title', 'price', 'price_currency', 'price_base', 'url', 'search_keyword', 'created_at', 'updated_at'), name='searchresult_detail_cover_idx'),
+        ),
+        migrations.RunPython(replace_triggers, restore_triggers),
+    ]
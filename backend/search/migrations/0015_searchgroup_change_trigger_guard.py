@@ -0,0 +1,73 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:40
+
+import importlib
+
+from django.db import migrations
+
+# MSSQL triggers fire once per statement on every UPDATE, whatever columns it
+# sets, so an update of titles or URLs recomputed every group it touched. The
+# change trigger now returns early for an UPDATE that sets none of the columns
+# the group is computed from. Deletes (no inserted rows) always recompute.
+# SQLite needs no change: its update trigger is declared AFTER UPDATE OF those
+# columns already.
+GUARDED_CHANGE_TRIGGER = """
+CREATE TRIGGER search_searchresult_group_change
+ON search_searchresult AFTER UPDATE, DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    IF EXISTS (SELECT 1 FROM inserted)
+        AND NOT (
+            UPDATE(search_result_id)
+            OR UPDATE(search_keyword)
+            OR UPDATE(created_at)
+            OR UPDATE(updated_at)
+        )
+        RETURN;
+    DELETE FROM search_searchgroup
+    WHERE search_result_id IN (
+        SELECT search_result_id FROM deleted
+        UNION SELECT search_result_id FROM inserted
+    );
+    INSERT INTO search_searchgroup
+        (search_result_id, search_keyword, [count], latest_created_at,
+         latest_updated_at)
+    SELECT search_result_id, MAX(search_keyword), COUNT(*), MAX(created_at),
+           MAX(updated_at)
+    FROM search_searchresult
+    WHERE search_result_id IN (
+        SELECT search_result_id FROM deleted
+        UNION SELECT search_result_id FROM inserted
+    )
+    GROUP BY search_result_id;
+END
+"""
+DROP_CHANGE_TRIGGER = "DROP TRIGGER IF EXISTS search_searchresult_group_change"
+
+
+def guard_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "microsoft":
+        return
+    schema_editor.execute(DROP_CHANGE_TRIGGER)
+    schema_editor.execute(GUARDED_CHANGE_TRIGGER)
+
+
+def unguard_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "microsoft":
+        return
+    previous = importlib.import_module(
+        "search.migrations.0014_searchresult_updated_at"
+    ).TRIGGERS["microsoft"]["create"]
+    schema_editor.execute(DROP_CHANGE_TRIGGER)
+    for statement in previous:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0014_searchresult_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(guard_trigger, unguard_trigger),
+    ]
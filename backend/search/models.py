@@ -1,4 +1,19 @@
-from django.db import models
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+from .fulltext import search_filter
+
+
+class SearchResultQuerySet(models.QuerySet):
+    def search(self, query: str):
+        """Full-text match of ``query`` against title and search_keyword."""
+        condition = search_filter(query, using=self.db)
+        if condition is None:
+            return self
+        return self.filter(condition)
 
 
 class SearchResult(models.Model):
@@ -8,11 +23,50 @@ class SearchResult(models.Model):
     url = models.TextField()
     title = models.CharField(max_length=200)
     price = models.DecimalField(max_digits=15, decimal_places=3)
+    # ISO 4217 code of ``price`` and its value in settings.BASE_CURRENCY, see
+    # search.pricing. Null until the price has been normalized.
+    price_currency = models.CharField(max_length=3, null=True, blank=True)
+    price_base = models.DecimalField(
+        max_digits=15, decimal_places=3, null=True, blank=True
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set by every writer that changes a stored row in place (for instance
+    # normalize_prices), so the group's ETag and cached payloads move on.
+    # Null for rows that were never changed after they were inserted.
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+    objects = SearchResultQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
 
+        indexes = [
+            # Lets the per-group MAX(created_at) be answered from the index
+            models.Index(
+                fields=["search_result_id", "created_at"],
+                name="searchresult_group_latest_idx",
+            ),
+            # Covers the detail endpoint so it never has to touch the table
+            models.Index(
+                fields=["search_result_id", "website_search_id"],
+                include=[
+                    "title",
+                    "price",
+                    "price_currency",
+                    "price_base",
+                    "url",
+                    "search_keyword",
+                    "created_at",
+                    "updated_at",
+                ],
+                name="searchresult_detail_cover_idx",
+            ),
+            # Cheapest-first listing of a group without a sort step
+            models.Index(
+                fields=["search_result_id", "price_base"],
+                name="searchresult_group_price_idx",
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["search_result_id", "website_search_id"],
@@ -22,3 +76,242 @@ class SearchResult(models.Model):
 
     def __str__(self) -> str:
         return f"{self.search_result_id} - {self.website_search_id} - {self.title}"
+
+
+class SearchGroupManager(models.Manager):
+    def rebuild(self) -> int:
+        """Recompute every group from SearchResult in a single statement."""
+        db = router.db_for_write(self.model)
+        connection = connections[db]
+        qn = connection.ops.quote_name
+        group_table = qn(self.model._meta.db_table)
+        result_table = qn(SearchResult._meta.db_table)
+        with transaction.atomic(using=db), connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {group_table}")
+            cursor.execute(
+                f"INSERT INTO {group_table} "
+                f"(search_result_id, search_keyword, {qn('count')}, "
+                f"latest_created_at, latest_updated_at) "
+                f"SELECT search_result_id, MAX(search_keyword), COUNT(*), "
+                f"MAX(created_at), MAX(updated_at) "
+                f"FROM {result_table} GROUP BY search_result_id"
+            )
+            return cursor.rowcount
+
+
+class SearchGroup(models.Model):
+    """
+    One summary row per search_result_id.
+
+    Maintained by database triggers on search_searchresult (see migration
+    0004), so inserts from the ORM, bulk_create and the n8n workflow writing
+    straight to the table all keep it current. In-place changes show up as a
+    newer ``latest_updated_at`` (see SearchResult.updated_at).
+    """
+
+    search_result_id = models.BigIntegerField(primary_key=True)
+    search_keyword = models.CharField(max_length=100)
+    count = models.PositiveIntegerField(default=0)
+    latest_created_at = models.DateTimeField()
+    latest_updated_at = models.DateTimeField(null=True, blank=True)
+
+    objects = SearchGroupManager()
+
+    class Meta:
+        ordering = ["-latest_created_at", "-search_result_id"]
+
+        indexes = [
+            models.Index(
+                fields=["-latest_created_at", "-search_result_id"],
+                name="searchgroup_latest_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.search_result_id} - {self.search_keyword} ({self.count})"
+
+
+class ExchangeRateManager(models.Manager):
+    def as_dict(self):
+        """Map of ISO currency to the value of one unit in the base currency."""
+        rates = dict(self.values_list("currency", "rate"))
+        rates.setdefault(settings.BASE_CURRENCY, Decimal(1))
+        return rates
+
+
+class ExchangeRate(models.Model):
+    """
+    Locally cached conversion rate into settings.BASE_CURRENCY.
+
+    Refreshed by the ``update_exchange_rates`` command; price normalization
+    only ever reads this table, never a remote service.
+    """
+
+    currency = models.CharField(max_length=3, primary_key=True)
+    rate = models.DecimalField(max_digits=18, decimal_places=8)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ExchangeRateManager()
+
+    class Meta:
+        ordering = ["currency"]
+
+    def __str__(self) -> str:
+        return f"{self.currency} = {self.rate}"
+
+
+class SearchBatch(models.Model):
+    """
+    Several parts searched for one vehicle in a single request.
+
+    Each part still gets its own SearchJob (and so its own search_result_id),
+    but the dispatcher sends the jobs of a batch to n8n in one webhook call,
+    so the vehicle navigation on each site is done once for all parts.
+    """
+
+    license_plate = models.CharField(max_length=20)
+    car_type = models.CharField(max_length=100)
+    car_model_type = models.CharField(max_length=100)
+    car_model = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def webhook_payload(self, jobs):
+        return {
+            "batch_id": self.pk,
+            "license_plate": self.license_plate,
+            "car_type": self.car_type,
+            "car_model_type": self.car_model_type,
+            "car_model": self.car_model,
+            "parts": [
+                {"search_result_id": job.pk, "part_name": job.part_name}
+                for job in jobs
+            ],
+        }
+
+    def __str__(self) -> str:
+        return f"{self.pk} - {self.license_plate}"
+
+
+class SearchJob(models.Model):
+    """
+    One parts search, from the 202 to the last stored result.
+
+    PartsSearchView only inserts the row; the ``run_search_dispatcher``
+    worker claims due jobs and calls the webhook. n8n then reports progress
+    per website (SearchJobSite) and completion to the job events endpoint.
+    The job id doubles as the search_result_id n8n stores the results under.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        DISPATCHING = "dispatching", "Dispatching"
+        DISPATCHED = "dispatched", "Dispatched"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    QUEUED_STATUSES = (Status.PENDING, Status.DISPATCHING)
+    # Accepted by n8n; results are arriving or have arrived
+    SENT_STATUSES = (Status.DISPATCHED, Status.COMPLETED)
+    FINAL_STATUSES = (Status.COMPLETED, Status.FAILED)
+
+    license_plate = models.CharField(max_length=20)
+    part_name = models.CharField(max_length=100)
+    car_type = models.CharField(max_length=100)
+    car_model_type = models.CharField(max_length=100)
+    car_model = models.CharField(max_length=100)
+    batch = models.ForeignKey(
+        SearchBatch,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    # Hash of the normalized search, see SearchDispatchService.enqueue()
+    fingerprint = models.CharField(max_length=64, null=True, blank=True)
+    # The same without the plate, for reusing results across plates
+    vehicle_key = models.CharField(max_length=64, null=True, blank=True)
+    status = models.CharField(
+        max_length=12, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    # When a pending job is due, or when a claimed job's lease runs out and
+    # another worker may take it over
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="searchjob_due_idx",
+            ),
+            models.Index(
+                fields=["fingerprint", "dispatched_at"],
+                name="searchjob_fingerprint_idx",
+            ),
+            models.Index(
+                fields=["vehicle_key", "dispatched_at"],
+                name="searchjob_vehicle_idx",
+            ),
+        ]
+        constraints = [
+            # At most one queued job per search, also under concurrent requests
+            models.UniqueConstraint(
+                fields=["fingerprint"],
+                condition=models.Q(
+                    fingerprint__isnull=False, status__in=["pending", "dispatching"]
+                ),
+                name="unique_queued_search",
+            ),
+        ]
+
+    @property
+    def search_result_id(self) -> int:
+        return self.pk
+
+    def webhook_payload(self):
+        return {
+            "search_result_id": self.pk,
+            "license_plate": self.license_plate,
+            "part_name": self.part_name,
+            "car_type": self.car_type,
+            "car_model_type": self.car_model_type,
+            "car_model": self.car_model,
+        }
+
+    def __str__(self) -> str:
+        return f"{self.pk} - {self.license_plate} - {self.part_name} ({self.status})"
+
+
+class SearchJobSite(models.Model):
+    """Progress of one SearchJob on one website, as reported by n8n."""
+
+    job = models.ForeignKey(SearchJob, on_delete=models.CASCADE, related_name="sites")
+    website_search_id = models.BigIntegerField()
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # First time results for this site were stored through the ingest endpoint
+    persisted_at = models.DateTimeField(null=True, blank=True)
+    result_count = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["job", "website_search_id"]
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "website_search_id"],
+                name="unique_job_website",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.job_id} - {self.website_search_id}"
@@ -0,0 +1,119 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class SearchGroupCursorPagination(BasePagination):
+    """
+    Keyset pagination over search_result_id groups.
+
+    Groups are ordered newest first by ``(latest_created_at, search_result_id)``.
+    The opaque cursor encodes the last row of the previous page, so every page
+    is a "seek" on that key instead of an OFFSET scan and costs the same no
+    matter how deep the client pages.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 20
+    max_page_size = 100
+    ordering = ("-latest_created_at", "-search_result_id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is not None:
+            latest_created_at, search_result_id = self.cursor
+            queryset = queryset.filter(
+                Q(latest_created_at__lt=latest_created_at)
+                | Q(
+                    latest_created_at=latest_created_at,
+                    search_result_id__lt=search_result_id,
+                )
+            )
+
+        # Fetch one extra row to find out whether there is a next page
+        rows = list(queryset.order_by(*self.ordering)[: self.page_size + 1])
+        self.page = rows[: self.page_size]
+        self.next_cursor = (
+            self.encode_cursor(self.page[-1]) if len(rows) > self.page_size else None
+        )
+        return self.page
+
+    def load_page(self, page, next_cursor, request):
+        """Restore the state of a page served from the response cache."""
+        self.request = request
+        self.page = page
+        self.next_cursor = next_cursor
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            latest_created_at, search_result_id = json.loads(
+                base64.urlsafe_b64decode(padded.encode("ascii"))
+            )
+            latest_created_at = parse_datetime(latest_created_at)
+            search_result_id = int(search_result_id)
+        except (TypeError, ValueError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if latest_created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return latest_created_at, search_result_id
+
+    def encode_cursor(self, row):
+        position = [row["latest_created_at"].isoformat(), row["search_result_id"]]
+        encoded = base64.urlsafe_b64encode(json.dumps(position).encode("ascii"))
+        return encoded.decode("ascii").rstrip("=")
+
+    def get_next_link(self):
+        cursor = self.get_next_cursor()
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_cursor(self):
+        return self.next_cursor
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "next_cursor": self.get_next_cursor(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "next_cursor": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
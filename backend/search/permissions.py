@@ -0,0 +1,18 @@
+import hmac
+
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+
+class HasIngestToken(BasePermission):
+    """
+    Allows access to machine clients (the n8n workflow) that present the
+    shared ``X-Ingest-Token`` header configured in SEARCH_INGEST_TOKEN.
+    """
+
+    def has_permission(self, request, view):
+        expected = settings.SEARCH_INGEST_TOKEN
+        provided = request.META.get("HTTP_X_INGEST_TOKEN", "")
+        if not expected or not provided:
+            return False
+        return hmac.compare_digest(provided.encode(), expected.encode())
@@ -0,0 +1,141 @@
+"""
+Price normalization for scraped results.
+
+Scrapers report prices in whatever shape the site uses: "1 234,56 zł" from
+2407.pl, ``{"amount": 12.5, "currency": "EUR"}`` from autoparts-24, or a bare
+number from older n8n runs. ``normalize_prices`` turns a batch of those into
+``(amount, ISO currency, amount in BASE_CURRENCY)`` using one rates lookup for
+the whole batch, so the results table can sort and compare prices across
+sites on an indexed numeric column.
+"""
+
+import re
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+PRICE_QUANT = Decimal("0.001")
+
+CURRENCY_ALIASES = {
+    "zł": "PLN",
+    "zl": "PLN",
+    "pln": "PLN",
+    "€": "EUR",
+    "eur": "EUR",
+    "euro": "EUR",
+    "$": "USD",
+    "usd": "USD",
+    "£": "GBP",
+    "gbp": "GBP",
+    "kč": "CZK",
+    "czk": "CZK",
+    "chf": "CHF",
+    "sek": "SEK",
+    "dkk": "DKK",
+    "nok": "NOK",
+    "huf": "HUF",
+}
+
+NUMBER_RE = re.compile(r"-?\d[\d\s.,'\u00a0\u202f]*")
+CURRENCY_RE = re.compile(
+    "|".join(
+        re.escape(alias)
+        for alias in sorted(CURRENCY_ALIASES, key=len, reverse=True)
+    ),
+    re.IGNORECASE,
+)
+GROUPING_RE = re.compile(r"[\s'\u00a0\u202f]")
+
+
+class NormalizedPrice(NamedTuple):
+    amount: Optional[Decimal]
+    currency: Optional[str]
+    base_amount: Optional[Decimal]
+
+
+def parse_number(text: str) -> Optional[Decimal]:
+    """
+    Parse "1 234,56", "1.234,56", "1,234.56" or "12.500".
+
+    The right-most separator is the decimal one when both kinds appear. A lone
+    kind of separator is a decimal separator when it appears once and a
+    thousands separator when it repeats ("1.234.567").
+    """
+    digits = GROUPING_RE.sub("", text).rstrip(".,")
+    commas, dots = digits.count(","), digits.count(".")
+    if commas and dots:
+        if digits.rfind(",") > digits.rfind("."):
+            digits = digits.replace(".", "").replace(",", ".")
+        else:
+            digits = digits.replace(",", "")
+    elif commas:
+        digits = digits.replace(",", "." if commas == 1 else "")
+    elif dots > 1:
+        digits = digits.replace(".", "")
+    try:
+        return Decimal(digits).quantize(PRICE_QUANT, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        return None
+
+
+def parse_currency(text: str) -> Optional[str]:
+    match = CURRENCY_RE.search(text)
+    if match is None:
+        return None
+    return CURRENCY_ALIASES[match.group(0).lower()]
+
+
+def parse_price(
+    raw: Any, default_currency: Optional[str] = None
+) -> Tuple[Optional[Decimal], Optional[str]]:
+    """Parse one scraped price into ``(amount, ISO currency)``."""
+    if raw is None:
+        return None, default_currency
+    if isinstance(raw, dict):
+        amount, _ = parse_price(raw.get("amount"))
+        currency = raw.get("currency")
+        if not isinstance(currency, str):
+            # e.g. a numeric ISO 4217 code; not worth guessing
+            currency = None
+        elif currency:
+            currency = parse_currency(currency) or currency.strip().upper()[:3]
+        return amount, currency or default_currency
+    if isinstance(raw, (int, float, Decimal)):
+        return parse_price(str(raw), default_currency)
+
+    text = str(raw)
+    number = NUMBER_RE.search(text)
+    amount = parse_number(number.group(0)) if number else None
+    return amount, parse_currency(text) or default_currency
+
+
+def to_base(
+    amount: Optional[Decimal], currency: Optional[str], rates: Dict[str, Decimal]
+) -> Optional[Decimal]:
+    if amount is None or currency not in rates:
+        return None
+    return (amount * rates[currency]).quantize(PRICE_QUANT, rounding=ROUND_HALF_UP)
+
+
+def normalize_prices(
+    raw_prices: Iterable[Any],
+    rates: Dict[str, Decimal],
+    default_currency: Optional[str] = None,
+) -> List[NormalizedPrice]:
+    """
+    Normalize a batch of scraped prices.
+
+    ``rates`` maps ISO currency to the value of one unit in the base currency
+    (see ExchangeRate.objects.as_dict()). Identical raw values, common on a
+    single results page, are parsed once.
+    """
+    parsed = {}
+    normalized = []
+    for raw in raw_prices:
+        key = repr(raw) if isinstance(raw, dict) else raw
+        if key not in parsed:
+            amount, currency = parse_price(raw, default_currency)
+            parsed[key] = NormalizedPrice(
+                amount, currency, to_base(amount, currency, rates)
+            )
+        normalized.append(parsed[key])
+    return normalized
@@ -0,0 +1,203 @@
+from decimal import Decimal
+
+from rest_framework import serializers
+
+from vehicles.models import Vehicle
+from vehicles.services import normalize_plate
+
+from .models import ExchangeRate, SearchJob, SearchJobSite
+from .pricing import normalize_prices
+from .services import SearchJobService
+
+BULK_INGEST_MAX_ITEMS = 1000
+BATCH_SEARCH_MAX_PARTS = 10
+# Bound of SearchResult.price (max_digits=15, decimal_places=3)
+MAX_PRICE = Decimal("1e12")
+
+
+class VehicleSearchSerializer(serializers.Serializer):
+    """
+    The vehicle of a parts search, sized to fit a SearchJob row.
+
+    A plate found in the local Vehicle table (the RDW import) is searched
+    under its registered brand, trade name and type, mapped the way the
+    frontend fills the fields: car_type is the brand, car_model the trade
+    name and car_model_type the RDW type. The client's values are kept for
+    other plates and where the registry has the column blank.
+    """
+
+    license_plate = serializers.CharField(max_length=20)
+    car_type = serializers.CharField(max_length=100)
+    car_model_type = serializers.CharField(max_length=100)
+    car_model = serializers.CharField(max_length=100)
+
+    def validate(self, attrs):
+        vehicle = (
+            Vehicle.objects.filter(pk=normalize_plate(attrs["license_plate"]))
+            .values("brand", "model", "car_type")
+            .first()
+        )
+        if vehicle is not None:
+            attrs["car_type"] = vehicle["brand"] or attrs["car_type"]
+            attrs["car_model"] = vehicle["model"] or attrs["car_model"]
+            attrs["car_model_type"] = vehicle["car_type"] or attrs["car_model_type"]
+        return attrs
+
+
+class PartsSearchSerializer(VehicleSearchSerializer):
+    """A parts search request."""
+
+    part_name = serializers.CharField(max_length=100)
+
+
+class PartsBatchSearchSerializer(VehicleSearchSerializer):
+    """Several parts for one vehicle, see SearchDispatchService.submit_batch()."""
+
+    part_names = serializers.ListField(
+        child=serializers.CharField(max_length=100),
+        allow_empty=False,
+        max_length=BATCH_SEARCH_MAX_PARTS,
+    )
+
+
+class ScrapedPriceField(serializers.Field):
+    """
+    A price as the scraper reported it: a string such as "1 234,56 zł", a
+    number, or ``{"amount": 12.5, "currency": "EUR"}``.
+
+    Only the shape is checked here. Parsing happens once for the whole batch
+    in SearchResultBulkIngestSerializer.validate_items().
+    """
+
+    default_error_messages = {
+        "invalid": "Expected a price string, a number or an object with an amount.",
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("invalid")
+        if isinstance(data, dict):
+            if "amount" not in data:
+                self.fail("invalid")
+            return data
+        if isinstance(data, (int, float, str)):
+            return data
+        self.fail("invalid")
+
+    def to_representation(self, value):
+        return value
+
+
+class SearchResultIngestSerializer(serializers.Serializer):
+    """
+    Plain (non-model) serializer for one scraped result.
+
+    Deliberately not a ModelSerializer: that would attach a unique-together
+    validator issuing one query per item, which is exactly the per-row cost
+    the bulk endpoint exists to avoid. Duplicates are resolved at insert time.
+    """
+
+    search_result_id = serializers.IntegerField(min_value=1)
+    website_search_id = serializers.IntegerField(min_value=1)
+    search_keyword = serializers.CharField(max_length=100)
+    url = serializers.CharField()
+    title = serializers.CharField(max_length=200)
+    price = ScrapedPriceField()
+    # Used when the price itself does not name a currency
+    currency = serializers.CharField(
+        max_length=3, min_length=3, required=False, allow_blank=False
+    )
+
+
+class SearchResultBulkIngestSerializer(serializers.Serializer):
+    """Serializer for a batch of scraped results."""
+
+    items = SearchResultIngestSerializer(
+        many=True, allow_empty=False, max_length=BULK_INGEST_MAX_ITEMS
+    )
+
+    def validate_items(self, items):
+        """
+        Normalize every price in the batch against one read of the rates
+        table, replacing ``price``/``currency`` with the model's price columns.
+        """
+        raw_prices = []
+        for item in items:
+            price = item["price"]
+            currency = item.pop("currency", None)
+            if isinstance(price, dict):
+                if currency and not price.get("currency"):
+                    price = {"amount": price["amount"], "currency": currency}
+            elif currency:
+                price = {"amount": price, "currency": currency}
+            raw_prices.append(price)
+
+        normalized = normalize_prices(raw_prices, ExchangeRate.objects.as_dict())
+        errors = []
+        for item, price in zip(items, normalized):
+            if price.amount is None:
+                errors.append({"price": ["Could not parse a price amount."]})
+                continue
+            if not 0 <= price.amount < MAX_PRICE:
+                errors.append({"price": ["Price amount is out of range."]})
+                continue
+            errors.append({})
+            item["price"] = price.amount
+            item["price_currency"] = price.currency
+            item["price_base"] = price.base_amount
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+
+class SearchJobSiteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SearchJobSite
+        fields = (
+            "website_search_id",
+            "started_at",
+            "finished_at",
+            "persisted_at",
+            "result_count",
+            "error",
+        )
+
+
+class SearchJobSerializer(serializers.ModelSerializer):
+    search_result_id = serializers.IntegerField(read_only=True)
+    sites = SearchJobSiteSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = SearchJob
+        fields = (
+            "id",
+            "search_result_id",
+            "status",
+            "attempts",
+            "created_at",
+            "dispatched_at",
+            "completed_at",
+            "sites",
+        )
+
+
+class SearchJobEventSerializer(serializers.Serializer):
+    """One progress report from n8n, see SearchJobService.record_event()."""
+
+    event = serializers.ChoiceField(choices=SearchJobService.EVENTS)
+    website_search_id = serializers.IntegerField(min_value=1, required=False)
+    # When it happened; defaults to the time the report is received
+    at = serializers.DateTimeField(required=False)
+    result_count = serializers.IntegerField(min_value=0, required=False)
+    error = serializers.CharField(required=False, allow_blank=True, default="")
+
+    def validate(self, attrs):
+        if (
+            attrs["event"] in SearchJobService.SITE_EVENTS
+            and "website_search_id" not in attrs
+        ):
+            raise serializers.ValidationError(
+                {"website_search_id": "Required for site events."}
+            )
+        return attrs
@@ -1,6 +1,51 @@
-from typing import Any, Dict
+import hashlib
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
 
 import requests
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+from vehicles.services import normalize_plate
+
+from .circuit import CircuitOpenError, webhook_breaker
+from .http import get_session, webhook_timeout
+from .metrics import registry as metrics
+from .models import (
+    SearchBatch,
+    SearchGroup,
+    SearchJob,
+    SearchJobSite,
+    SearchResult,
+)
+
+
+def normalize_text(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+def vehicle_key(
+    part_name: str, car_type: str, car_model_type: str, car_model: str, **_
+) -> str:
+    """Key of a part on a vehicle; results depend on this, not on the plate."""
+    return _digest(
+        *(
+            normalize_text(value)
+            for value in (part_name, car_type, car_model, car_model_type)
+        )
+    )
+
+
+def search_fingerprint(license_plate: str, **search) -> str:
+    """Key of one exact search, plate included."""
+    return _digest(normalize_plate(license_plate), vehicle_key(**search))
 
 
 class PartService:
@@ -9,6 +54,8 @@ class PartService:
 
     The webhook itself is responsible for fetching data and saving it into
     the SearchResult model. We only care that the request was accepted.
+    Calls go through the pooled session in search.http and are timed under
+    ``n8n.webhook`` in search.metrics.
     """
 
     @staticmethod
@@ -19,15 +66,473 @@ class PartService:
         car_model_type: str,
         car_model: str,
     ) -> Dict[str, Any]:
-        response = requests.post(
-            "https://n8n.bullnice.tech/webhook/afa656ab-e7f1-45fc-9a27-9d7376e50b30",
-            json={
+        return PartService.dispatch(
+            {
                 "license_plate": license_plate,
                 "part_name": part_name,
                 "car_type": car_type,
                 "car_model_type": car_model_type,
                 "car_model": car_model,
-            },
-            timeout=30,
+            }
+        ).json()
+
+    @staticmethod
+    def dispatch(payload: Dict[str, Any]):
+        """
+        POST ``payload`` to the webhook, raising on any failure.
+
+        Raises CircuitOpenError without calling n8n while the webhook's
+        circuit is open (see search.circuit).
+        """
+        if not webhook_breaker.allow():
+            raise CircuitOpenError("n8n webhook circuit is open")
+        try:
+            with metrics.timer("n8n.webhook"):
+                response = get_session().post(
+                    settings.N8N_WEBHOOK_URL, json=payload, timeout=webhook_timeout()
+                )
+                response.raise_for_status()
+        except requests.RequestException as exc:
+            # A 4xx means our request is wrong, not that n8n is down
+            if exc.response is None or exc.response.status_code >= 500:
+                webhook_breaker.record_failure()
+            raise
+        webhook_breaker.record_success()
+        return response
+
+
+class SearchSubmission(NamedTuple):
+    """Outcome of SearchDispatchService.submit()."""
+
+    QUEUED = "queued"
+    COALESCED = "coalesced"
+    FRESH = "fresh"
+    STALE = "stale"
+
+    job: SearchJob
+    outcome: str
+
+
+class SearchDispatchService:
+    """
+    Outbox for parts searches.
+
+    ``submit``/``enqueue`` are all the request path does. Workers call
+    ``claim`` to take a batch of due jobs under row locks (skipping rows
+    another worker holds), send them concurrently with ``dispatch_batch`` and
+    record the outcome, rescheduling failures with jittered exponential
+    backoff until SEARCH_DISPATCH_MAX_ATTEMPTS is reached.
+    """
+
+    @classmethod
+    def submit(cls, batch: SearchBatch = None, **search) -> SearchSubmission:
+        """
+        Answer a parts search, reusing stored results where possible.
+
+        Results scraped for the same part on the same vehicle (any plate) in
+        the last SEARCH_RESULT_FRESH_TTL seconds are returned as they are.
+        Older ones, up to SEARCH_RESULT_MAX_STALE, are returned too while a
+        refresh scrape is queued in the background (stale-while-revalidate).
+        Otherwise the search is queued with ``enqueue``.
+        """
+        now = timezone.now()
+        previous = cls._find_reusable(
+            vehicle_key(**search),
+            now - timedelta(seconds=settings.SEARCH_RESULT_MAX_STALE),
+        )
+        if previous is not None:
+            fresh_since = now - timedelta(seconds=settings.SEARCH_RESULT_FRESH_TTL)
+            if previous.dispatched_at >= fresh_since:
+                return SearchSubmission(previous, SearchSubmission.FRESH)
+            if not cls._is_refreshing(previous):
+                cls.enqueue(batch=batch, **search)
+            return SearchSubmission(previous, SearchSubmission.STALE)
+
+        job, created = cls.enqueue(batch=batch, **search)
+        return SearchSubmission(
+            job, SearchSubmission.QUEUED if created else SearchSubmission.COALESCED
+        )
+
+    @classmethod
+    def submit_batch(
+        cls, part_names: List[str], **vehicle
+    ) -> Tuple[SearchBatch, List[Tuple[str, SearchSubmission]]]:
+        """
+        ``submit`` every part for one vehicle. Parts that need scraping are
+        queued under one SearchBatch and reach n8n as a single webhook call.
+        """
+        batch = SearchBatch.objects.create(**vehicle)
+        submissions = []
+        seen = set()
+        for part_name in part_names:
+            if normalize_text(part_name) in seen:
+                continue
+            seen.add(normalize_text(part_name))
+            submissions.append(
+                (part_name, cls.submit(batch=batch, part_name=part_name, **vehicle))
+            )
+        return batch, submissions
+
+    @staticmethod
+    def _find_reusable(key: str, oldest: datetime):
+        """Newest dispatched job for ``key`` that has stored results."""
+        return (
+            SearchJob.objects.filter(
+                vehicle_key=key,
+                status__in=SearchJob.SENT_STATUSES,
+                dispatched_at__gte=oldest,
+            )
+            .filter(
+                models.Exists(
+                    SearchGroup.objects.filter(search_result_id=models.OuterRef("pk"))
+                )
+            )
+            .order_by("-dispatched_at")
+            .first()
+        )
+
+    @staticmethod
+    def _is_refreshing(previous: SearchJob) -> bool:
+        """Whether a newer scrape of the same vehicle and part is under way."""
+        window_start = timezone.now() - timedelta(
+            seconds=settings.SEARCH_COALESCE_WINDOW
+        )
+        return (
+            SearchJob.objects.filter(vehicle_key=previous.vehicle_key)
+            .filter(
+                models.Q(status__in=SearchJob.QUEUED_STATUSES)
+                | models.Q(
+                    status__in=SearchJob.SENT_STATUSES,
+                    dispatched_at__gt=previous.dispatched_at,
+                    dispatched_at__gte=window_start,
+                )
+            )
+            .exists()
+        )
+
+    @classmethod
+    def enqueue(cls, batch: SearchBatch = None, **search) -> Tuple[SearchJob, bool]:
+        """
+        Queue a search and return ``(job, created)``.
+
+        A search identical to one still queued, or dispatched within the last
+        SEARCH_COALESCE_WINDOW seconds, returns that job instead, so repeated
+        clicks and simultaneous users share one scrape and one search_result_id.
+        """
+        fingerprint = search_fingerprint(**search)
+        job = cls._find_recent(fingerprint)
+        if job is not None:
+            return job, False
+        try:
+            with transaction.atomic():
+                job = SearchJob.objects.create(
+                    batch=batch,
+                    fingerprint=fingerprint,
+                    vehicle_key=vehicle_key(**search),
+                    **search,
+                )
+            return job, True
+        except IntegrityError:
+            # A concurrent request queued the same search first
+            job = cls._find_recent(fingerprint)
+            if job is None:
+                raise
+            return job, False
+
+    @staticmethod
+    def _find_recent(fingerprint: str):
+        window_start = timezone.now() - timedelta(
+            seconds=settings.SEARCH_COALESCE_WINDOW
+        )
+        return (
+            SearchJob.objects.filter(fingerprint=fingerprint)
+            .filter(
+                models.Q(status__in=SearchJob.QUEUED_STATUSES)
+                | models.Q(
+                    status__in=SearchJob.SENT_STATUSES,
+                    dispatched_at__gte=window_start,
+                )
+            )
+            .order_by("-created_at")
+            .first()
+        )
+
+    @staticmethod
+    def claim(batch_size: int) -> List[SearchJob]:
+        """
+        Lease up to ``batch_size`` due jobs, plus the rest of any SearchBatch
+        one of them belongs to, so a batch always goes out as one call.
+
+        A batch is claimed by locking its SearchBatch row; one another worker
+        holds is left for it. Only the holder of a batch lock waits on its
+        jobs' rows, and lone jobs are skipped when locked, so workers never
+        wait on each other.
+        """
+        now = timezone.now()
+        due = models.Q(
+            status__in=[SearchJob.Status.PENDING, SearchJob.Status.DISPATCHING],
+            next_attempt_at__lte=now,
+        )
+        with transaction.atomic():
+            candidates = list(
+                SearchJob.objects.filter(due)
+                .order_by("next_attempt_at")
+                .values_list("pk", "batch_id")[:batch_size]
+            )
+            batch_ids = list(
+                SearchBatch.objects.select_for_update(skip_locked=True)
+                .filter(pk__in={batch_id for _, batch_id in candidates if batch_id})
+                .values_list("pk", flat=True)
+            )
+            jobs = list(
+                SearchJob.objects.select_for_update(skip_locked=True)
+                .filter(due)
+                .filter(
+                    pk__in=[pk for pk, batch_id in candidates if batch_id is None]
+                )
+            )
+            if batch_ids:
+                # Pending members come along even if not due yet; a leased
+                # one stays with the worker that holds it
+                jobs += SearchJob.objects.select_for_update().filter(
+                    models.Q(status=SearchJob.Status.PENDING) | due,
+                    batch_id__in=batch_ids,
+                ).order_by("pk")
+            if jobs:
+                # The lease: if this worker dies, the jobs come due again
+                SearchJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                    status=SearchJob.Status.DISPATCHING,
+                    next_attempt_at=now
+                    + timedelta(seconds=settings.SEARCH_DISPATCH_LEASE),
+                    attempts=models.F("attempts") + 1,
+                )
+        for job in jobs:
+            job.attempts += 1
+        return jobs
+
+    @classmethod
+    def dispatch_batch(cls, jobs: List[SearchJob], concurrency: int) -> Tuple[int, int]:
+        """
+        Send claimed jobs and return ``(dispatched, not dispatched)``.
+
+        Jobs turned away by an open circuit go back to the queue without
+        using up an attempt.
+        """
+        if not jobs:
+            return 0, 0
+        calls = cls._group_calls(jobs)
+        # Only the HTTP calls run in threads; the outcome is written from here
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            errors = list(executor.map(cls._send, calls))
+
+        dispatched = 0
+        for (_, call_jobs), error in zip(calls, errors):
+            if error is None:
+                for job in call_jobs:
+                    cls._mark_dispatched(job)
+                dispatched += len(call_jobs)
+            elif isinstance(error, CircuitOpenError):
+                for job in call_jobs:
+                    cls._defer(job)
+            else:
+                # One retry time per call, so a batch is retried as one call
+                retry_at = cls._retry_at(max(job.attempts for job in call_jobs))
+                for job in call_jobs:
+                    cls._mark_failed(job, f"{type(error).__name__}: {error}", retry_at)
+        return dispatched, len(jobs) - dispatched
+
+    @staticmethod
+    def _group_calls(jobs: List[SearchJob]):
+        """One ``(payload, jobs)`` webhook call per SearchBatch or lone job."""
+        batches = SearchBatch.objects.in_bulk(
+            {job.batch_id for job in jobs if job.batch_id}
+        )
+        by_batch: Dict[int, List[SearchJob]] = {}
+        calls = []
+        for job in jobs:
+            if job.batch_id in batches:
+                by_batch.setdefault(job.batch_id, []).append(job)
+            else:
+                calls.append((job.webhook_payload(), [job]))
+        for batch_id, batch_jobs in by_batch.items():
+            calls.append(
+                (batches[batch_id].webhook_payload(batch_jobs), batch_jobs)
+            )
+        return calls
+
+    @staticmethod
+    def _send(call):
+        payload, _ = call
+        try:
+            PartService.dispatch(payload)
+        except Exception as exc:
+            return exc
+        return None
+
+    @staticmethod
+    def _mark_dispatched(job: SearchJob) -> None:
+        # n8n may already have reported the job completed; keep that status
+        SearchJob.objects.filter(pk=job.pk).update(
+            status=models.Case(
+                models.When(
+                    status=SearchJob.Status.DISPATCHING,
+                    then=models.Value(SearchJob.Status.DISPATCHED),
+                ),
+                default=models.F("status"),
+            ),
+            dispatched_at=timezone.now(),
+            last_error="",
+        )
+
+    @staticmethod
+    def _defer(job: SearchJob) -> None:
+        """Put back a job that was never sent because the circuit is open."""
+        SearchJob.objects.filter(pk=job.pk).update(
+            status=SearchJob.Status.PENDING,
+            attempts=models.F("attempts") - 1,
+            next_attempt_at=timezone.now()
+            + timedelta(seconds=settings.N8N_CIRCUIT_RECOVERY_TIMEOUT),
+        )
+
+    @staticmethod
+    def _retry_at(attempts: int) -> datetime:
+        delay = min(
+            settings.SEARCH_DISPATCH_BACKOFF * 2 ** (attempts - 1),
+            settings.SEARCH_DISPATCH_BACKOFF_MAX,
+        )
+        return timezone.now() + timedelta(seconds=random.uniform(delay / 2, delay))
+
+    @staticmethod
+    def _mark_failed(job: SearchJob, error: str, retry_at: datetime) -> None:
+        job.last_error = error[:2000]
+        if job.attempts >= settings.SEARCH_DISPATCH_MAX_ATTEMPTS:
+            job.status = SearchJob.Status.FAILED
+        else:
+            job.status = SearchJob.Status.PENDING
+            job.next_attempt_at = retry_at
+        job.save(update_fields=["status", "next_attempt_at", "last_error"])
+
+
+class SearchJobService:
+    """Progress reports from n8n for a dispatched SearchJob."""
+
+    SITE_STARTED = "site_started"
+    SITE_FINISHED = "site_finished"
+    SITE_FAILED = "site_failed"
+    JOB_COMPLETED = "job_completed"
+    JOB_FAILED = "job_failed"
+
+    SITE_EVENTS = (SITE_STARTED, SITE_FINISHED, SITE_FAILED)
+    EVENTS = SITE_EVENTS + (JOB_COMPLETED, JOB_FAILED)
+
+    @classmethod
+    def record_event(
+        cls,
+        job: SearchJob,
+        event: str,
+        at: datetime,
+        website_search_id: int = None,
+        result_count: int = None,
+        error: str = "",
+    ) -> None:
+        if event in cls.SITE_EVENTS:
+            site, _ = SearchJobSite.objects.get_or_create(
+                job=job, website_search_id=website_search_id
+            )
+            if event == cls.SITE_STARTED:
+                site.started_at = at
+            else:
+                site.finished_at = at
+                site.result_count = result_count
+                site.error = error if event == cls.SITE_FAILED else ""
+            site.save()
+            return
+
+        job.status = (
+            SearchJob.Status.COMPLETED
+            if event == cls.JOB_COMPLETED
+            else SearchJob.Status.FAILED
         )
-        return response.json()
+        job.completed_at = at
+        fields = ["status", "completed_at"]
+        if error:
+            job.last_error = error
+            fields.append("last_error")
+        job.save(update_fields=fields)
+
+    @staticmethod
+    def mark_persisted(pairs: Iterable[Tuple[int, int]]) -> None:
+        """Stamp persisted_at on the sites whose first results were just stored."""
+        by_job: Dict[int, set] = {}
+        for search_result_id, website_search_id in pairs:
+            by_job.setdefault(search_result_id, set()).add(website_search_id)
+        now = timezone.now()
+        for job_id, websites in by_job.items():
+            SearchJobSite.objects.filter(
+                job_id=job_id,
+                website_search_id__in=websites,
+                persisted_at__isnull=True,
+            ).update(persisted_at=now)
+
+
+class SearchResultIngestService:
+    """
+    Batched writer for scraped results.
+
+    Retries of the same scrape are expected, so rows that already exist for a
+    (search_result_id, website_search_id) pair are skipped rather than treated
+    as errors.
+    """
+
+    batch_size = 200
+
+    @classmethod
+    def ingest(cls, items: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+        """Insert validated items and return ``(inserted, skipped)``."""
+        unique: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        received = 0
+        for item in items:
+            received += 1
+            unique.setdefault(
+                (item["search_result_id"], item["website_search_id"]), item
+            )
+
+        rows = list(unique.values())
+        inserted = 0
+        for start in range(0, len(rows), cls.batch_size):
+            inserted += cls._insert_batch(rows[start : start + cls.batch_size])
+        SearchJobService.mark_persisted(unique)
+        return inserted, received - inserted
+
+    @classmethod
+    def _insert_batch(cls, rows: List[Dict[str, Any]]) -> int:
+        existing = set(
+            SearchResult.objects.filter(
+                search_result_id__in={row["search_result_id"] for row in rows}
+            ).values_list("search_result_id", "website_search_id")
+        )
+        new_objects = [
+            SearchResult(**row)
+            for row in rows
+            if (row["search_result_id"], row["website_search_id"]) not in existing
+        ]
+        if not new_objects:
+            return 0
+
+        try:
+            with transaction.atomic():
+                # No ignore_conflicts: rows a concurrent writer got in first
+                # would be dropped silently and miscounted as inserted. The
+                # row-by-row fallback below counts them as skipped instead
+                SearchResult.objects.bulk_create(new_objects, batch_size=cls.batch_size)
+            return len(new_objects)
+        except IntegrityError:
+            inserted = 0
+            for obj in new_objects:
+                try:
+                    with transaction.atomic():
+                        obj.save(force_insert=True)
+                    inserted += 1
+                except IntegrityError:
+                    continue
+            return inserted
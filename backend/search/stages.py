@@ -0,0 +1,79 @@
+"""
+Stage latencies of parts searches, aggregated per website.
+
+Every stage is the time between two SearchJob/SearchJobSite timestamps:
+
+    queue         accepted (created_at)  -> webhook accepted (dispatched_at)
+    startup       dispatched_at          -> site scrape started
+    scrape        site scrape started    -> site scrape finished
+    first_result  site scrape started    -> site results stored
+    total         accepted               -> site scrape finished
+
+Each site stage is summarized over all websites and per website. Percentiles
+are computed in Python over the selected rows, which keeps the query portable
+between SQLite and MSSQL.
+"""
+
+from collections import defaultdict
+
+from .metrics import percentile, to_ms
+from .models import SearchJob, SearchJobSite
+
+SITE_STAGES = {
+    "startup": ("job__dispatched_at", "started_at"),
+    "scrape": ("started_at", "finished_at"),
+    "first_result": ("started_at", "persisted_at"),
+    "total": ("job__created_at", "finished_at"),
+}
+MAX_ROWS = 20000
+
+
+def summarize(durations):
+    values = sorted(durations)
+    return {
+        "count": len(values),
+        "p50_ms": to_ms(percentile(values, 0.50)),
+        "p95_ms": to_ms(percentile(values, 0.95)),
+    }
+
+
+def elapsed(start, end):
+    if start is None or end is None or end < start:
+        return None
+    return (end - start).total_seconds()
+
+
+def stage_latencies(since):
+    """p50/p95 of each stage for jobs accepted since ``since``."""
+    queue = [
+        elapsed(created_at, dispatched_at)
+        for created_at, dispatched_at in SearchJob.objects.filter(
+            created_at__gte=since, dispatched_at__isnull=False
+        )
+        .order_by("-created_at")
+        .values_list("created_at", "dispatched_at")[:MAX_ROWS]
+    ]
+
+    fields = sorted({field for stage in SITE_STAGES.values() for field in stage})
+    rows = (
+        SearchJobSite.objects.filter(job__created_at__gte=since)
+        .order_by("-job__created_at")
+        .values("website_search_id", *fields)[:MAX_ROWS]
+    )
+    overall = defaultdict(list)
+    per_site = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        for stage, (start, end) in SITE_STAGES.items():
+            duration = elapsed(row[start], row[end])
+            if duration is not None:
+                overall[stage].append(duration)
+                per_site[row["website_search_id"]][stage].append(duration)
+
+    return {
+        "queue": summarize(d for d in queue if d is not None),
+        **{stage: summarize(overall[stage]) for stage in SITE_STAGES},
+        "websites": {
+            website: {stage: summarize(durations[stage]) for stage in SITE_STAGES}
+            for website, durations in sorted(per_site.items())
+        },
+    }
@@ -1,3 +1,1013 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+import requests
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from vehicles.models import Vehicle
+
+from .circuit import CircuitOpenError, webhook_breaker
+from .metrics import registry as metrics
+from .models import ExchangeRate, SearchGroup, SearchJob, SearchResult
+from .pricing import normalize_prices, parse_price
+from .services import PartService, SearchDispatchService, SearchResultIngestService
+
+
+class SearchResultsAPITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["search"].clear()
+        self.user = get_user_model().objects.create_user(
+            email="tester@example.com", password="secret-pass-123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_group(self, search_result_id, keyword="Brake Pads", size=2, age=0):
+        rows = SearchResult.objects.bulk_create(
+            SearchResult(
+                search_result_id=search_result_id,
+                website_search_id=website_search_id,
+                search_keyword=keyword,
+                url=f"https://example.com/{search_result_id}/{website_search_id}",
+                title=f"{keyword} {website_search_id}",
+                price="10.000",
+            )
+            for website_search_id in range(1, size + 1)
+        )
+        # auto_now_add ignores explicit values, so age the rows afterwards
+        SearchResult.objects.filter(search_result_id=search_result_id).update(
+            created_at=timezone.now() - timedelta(minutes=age)
+        )
+        return rows
+
+
+class SearchResultListViewTests(SearchResultsAPITestCase):
+    url = reverse("search-result-list")
+
+    def test_pages_follow_cursor_newest_first(self):
+        for search_result_id in range(1, 6):
+            self.create_group(search_result_id, age=10 - search_result_id)
+
+        first = self.client.get(self.url, {"page_size": 2}).json()
+        self.assertEqual([g["search_result_id"] for g in first["results"]], [5, 4])
+        self.assertEqual(first["results"][0]["count"], 2)
+
+        second = self.client.get(
+            self.url, {"page_size": 2, "cursor": first["next_cursor"]}
+        ).json()
+        self.assertEqual([g["search_result_id"] for g in second["results"]], [3, 2])
+
+        third = self.client.get(
+            self.url, {"page_size": 2, "cursor": second["next_cursor"]}
+        ).json()
+        self.assertEqual([g["search_result_id"] for g in third["results"]], [1])
+        self.assertIsNone(third["next"])
+        self.assertIsNone(third["next_cursor"])
+
+    def test_ties_on_latest_created_at_are_broken_by_id(self):
+        for search_result_id in range(1, 4):
+            self.create_group(search_result_id, age=1)
+        SearchResult.objects.update(created_at=timezone.now())
+
+        first = self.client.get(self.url, {"page_size": 2}).json()
+        second = self.client.get(
+            self.url, {"page_size": 2, "cursor": first["next_cursor"]}
+        ).json()
+        seen = [g["search_result_id"] for g in first["results"] + second["results"]]
+        self.assertEqual(seen, [3, 2, 1])
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+
+class SearchGroupTests(SearchResultsAPITestCase):
+    def test_inserts_from_save_and_bulk_create_update_the_group(self):
+        SearchResult.objects.create(
+            search_result_id=7,
+            website_search_id=1,
+            search_keyword="Mirror",
+            url="https://example.com/7/1",
+            title="Mirror 1",
+            price="5.000",
+        )
+        SearchResult.objects.bulk_create(
+            SearchResult(
+                search_result_id=7,
+                website_search_id=website_search_id,
+                search_keyword="Mirror",
+                url=f"https://example.com/7/{website_search_id}",
+                title=f"Mirror {website_search_id}",
+                price="5.000",
+            )
+            for website_search_id in (2, 3)
+        )
+
+        group = SearchGroup.objects.get(search_result_id=7)
+        self.assertEqual(group.count, 3)
+        self.assertEqual(group.search_keyword, "Mirror")
+        latest = SearchResult.objects.filter(search_result_id=7).latest("created_at")
+        self.assertEqual(group.latest_created_at, latest.created_at)
+
+    def test_deleting_results_shrinks_and_removes_the_group(self):
+        self.create_group(3, size=2)
+        SearchResult.objects.filter(website_search_id=1).delete()
+        self.assertEqual(SearchGroup.objects.get(search_result_id=3).count, 1)
+        SearchResult.objects.all().delete()
+        self.assertFalse(SearchGroup.objects.exists())
+
+    def test_rebuild_recreates_groups(self):
+        self.create_group(1, size=3)
+        self.create_group(2, size=1)
+        SearchGroup.objects.all().delete()
+
+        self.assertEqual(SearchGroup.objects.rebuild(), 2)
+        self.assertEqual(
+            dict(SearchGroup.objects.values_list("search_result_id", "count")),
+            {1: 3, 2: 1},
+        )
+
+
+class SearchResultDetailViewTests(SearchResultsAPITestCase):
+    def test_detail_reads_results_in_a_single_query(self):
+        self.create_group(9, keyword="Alternator", size=3)
+        url = reverse("search-result-detail", args=[9])
+
+        # Authentication is forced, so the only query left is the results fetch
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["search_keyword"], "Alternator")
+        self.assertEqual([i["website_search_id"] for i in body["items"]], [1, 2, 3])
+        self.assertEqual(
+            set(body["items"][0]),
+            {
+                "website_search_id",
+                "title",
+                "price",
+                "price_currency",
+                "price_base",
+                "url",
+            },
+        )
+
+    def test_missing_group_is_404_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("search-result-detail", args=[404]))
+        self.assertEqual(response.status_code, 404)
+
+
+class ConditionalGetTests(SearchResultsAPITestCase):
+    def test_detail_revalidates_against_the_group_summary(self):
+        self.create_group(4, size=2, age=1)
+        url = reverse("search-result-detail", args=[4])
+        first = self.client.get(url)
+        self.assertIn("Last-Modified", first)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+        SearchResult.objects.create(
+            search_result_id=4,
+            website_search_id=3,
+            search_keyword="Brake Pads",
+            url="https://example.com/4/3",
+            title="Brake Pads 3",
+            price="10.000",
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["items"]), 3)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    def test_two_writes_within_one_second_are_not_hidden_by_last_modified(self):
+        second = timezone.now().replace(microsecond=0) - timedelta(minutes=1)
+        self.create_group(4, size=1)
+        SearchResult.objects.update(created_at=second + timedelta(milliseconds=200))
+        url = reverse("search-result-detail", args=[4])
+        now = "search.conditional.timezone.now"
+
+        # The second is still running, so only the ETag can validate
+        with mock.patch(now, return_value=second + timedelta(milliseconds=400)):
+            first = self.client.get(url)
+        self.assertNotIn("Last-Modified", first)
+
+        SearchResult.objects.create(
+            search_result_id=4,
+            website_search_id=2,
+            search_keyword="Brake Pads",
+            url="https://example.com/4/2",
+            title="Brake Pads 2",
+            price="10.000",
+        )
+        SearchResult.objects.filter(website_search_id=2).update(
+            created_at=second + timedelta(milliseconds=700)
+        )
+        with mock.patch(now, return_value=second + timedelta(milliseconds=900)):
+            response = self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=http_date(second.timestamp())
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["items"]), 2)
+
+        response = self.client.get(url)
+        self.assertEqual(response["Last-Modified"], http_date(second.timestamp()))
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_page_etag(self):
+        self.create_group(1, size=1)
+        url = reverse("search-result-list")
+        first = self.client.get(url)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        self.create_group(2, size=1)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+
+
+class SearchResultCacheTests(SearchResultsAPITestCase):
+    def test_detail_is_served_from_cache_until_new_rows_arrive(self):
+        self.create_group(5, size=2)
+        url = reverse("search-result-detail", args=[5])
+        self.client.get(url)
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(url)
+        self.assertEqual(len(cached.json()["items"]), 2)
+
+        # Written behind the ORM's back, as the n8n workflow does
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO search_searchresult (search_result_id, website_search_id, "
+                "search_keyword, url, title, price, created_at) "
+                "VALUES (5, 3, 'Brake Pads', 'https://example.com/5/3', "
+                "'Brake Pads 3', 10, %s)",
+                [timezone.now()],
+            )
+        self.assertEqual(len(self.client.get(url).json()["items"]), 3)
+
+    def test_normalizing_prices_in_place_retires_the_cached_detail(self):
+        ExchangeRate.objects.create(currency="PLN", rate=Decimal("0.5"))
+        self.create_group(6, size=2)
+        url = reverse("search-result-detail", args=[6])
+        first = self.client.get(url)
+        self.assertIsNone(first.json()["items"][0]["price_base"])
+
+        call_command("normalize_prices", currency="PLN", stdout=io.StringIO())
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(response.json()["items"][0]["price_base"], 5.0)
+        self.assertEqual(self.client.get(url)["ETag"], response["ETag"])
+
+    def test_list_pages_are_cached_per_cursor(self):
+        for search_result_id in range(1, 4):
+            self.create_group(search_result_id, age=10 - search_result_id)
+        url = reverse("search-result-list")
+        first = self.client.get(url, {"page_size": 2}).json()
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, {"page_size": 2}).json()
+        self.assertEqual(cached, first)
+
+        self.create_group(4, size=1)
+        fresh = self.client.get(url, {"page_size": 2}).json()
+        self.assertEqual(fresh["results"][0]["search_result_id"], 4)
+
+    def test_list_pages_see_deletes_and_in_place_updates(self):
+        self.create_group(1, size=1, age=5)
+        self.create_group(2, size=2)
+        url = reverse("search-result-list")
+        self.client.get(url)
+
+        # Neither write moves the newest created_at
+        SearchResult.objects.filter(search_result_id=2, website_search_id=2).delete()
+        self.assertEqual(self.client.get(url).json()["results"][0]["count"], 1)
+
+        SearchResult.objects.filter(search_result_id=1).update(
+            search_keyword="Mirror", updated_at=timezone.now()
+        )
+        results = self.client.get(url).json()["results"]
+        self.assertEqual(results[1]["search_keyword"], "Mirror")
+
+
+@override_settings(SEARCH_INGEST_TOKEN="ingest-secret")
+class SearchResultBulkIngestTests(SearchResultsAPITestCase):
+    url = reverse("search-result-bulk-ingest")
+
+    def item(self, website_search_id, **overrides):
+        item = {
+            "search_result_id": 11,
+            "website_search_id": website_search_id,
+            "search_keyword": "Radiator",
+            "url": f"https://example.com/11/{website_search_id}",
+            "title": f"Radiator {website_search_id}",
+            "price": "99.900",
+        }
+        item.update(overrides)
+        return item
+
+    def post(self, items, **headers):
+        client = APIClient()
+        return client.post(self.url, {"items": items}, format="json", **headers)
+
+    def test_retried_items_are_skipped(self):
+        items = [self.item(1), self.item(2), self.item(2)]
+        response = self.post(items, HTTP_X_INGEST_TOKEN="ingest-secret")
+        self.assertEqual(
+            response.json(), {"received": 3, "inserted": 2, "skipped": 1}
+        )
+
+        response = self.post(
+            [self.item(2), self.item(3)], HTTP_X_INGEST_TOKEN="ingest-secret"
+        )
+        self.assertEqual(
+            response.json(), {"received": 2, "inserted": 1, "skipped": 1}
+        )
+        self.assertEqual(SearchGroup.objects.get(search_result_id=11).count, 3)
+
+    def test_rows_from_a_concurrent_writer_are_counted_as_skipped(self):
+        self.post([self.item(2)], HTTP_X_INGEST_TOKEN="ingest-secret")
+        # The other writer commits between the existence check and the insert
+        unseen = SearchResult.objects.none().values_list(
+            "search_result_id", "website_search_id"
+        )
+        with mock.patch.object(SearchResult.objects, "filter", return_value=unseen):
+            inserted = SearchResultIngestService.ingest([self.item(1), self.item(2)])
+
+        self.assertEqual(inserted, (1, 1))
+        self.assertEqual(SearchGroup.objects.get(search_result_id=11).count, 2)
+
+    def test_requires_token_or_staff(self):
+        self.assertEqual(self.post([self.item(1)]).status_code, 401)
+        self.assertEqual(
+            self.post([self.item(1)], HTTP_X_INGEST_TOKEN="wrong").status_code, 401
+        )
+        response = self.client.post(
+            self.url, {"items": [self.item(1)]}, format="json"
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_invalid_items_are_rejected(self):
+        response = self.post(
+            [self.item(1, price="not-a-price")], HTTP_X_INGEST_TOKEN="ingest-secret"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(SearchResult.objects.exists())
+
+
+@override_settings(SEARCH_STREAM_POLL_INTERVAL=0, SEARCH_STREAM_IDLE_TIMEOUT=0)
+class SearchResultStreamTests(SearchResultsAPITestCase):
+    async def read_stream(self, search_result_id, **headers):
+        response = await self.async_client.get(
+            reverse("search-result-stream", args=[search_result_id]), **headers
+        )
+        if not response.streaming:
+            return response, ""
+        body = "".join([chunk.decode() async for chunk in response.streaming_content])
+        return response, body
+
+    async def test_streams_items_then_ends_when_idle(self):
+        await sync_to_async(self.create_group)(6, size=2)
+        token = await sync_to_async(AccessToken.for_user)(self.user)
+
+        response, body = await self.read_stream(6, AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(body.count("event: result"), 2)
+        self.assertIn('"website_search_id": 2', body)
+        self.assertTrue(body.endswith('event: end\ndata: {"reason": "idle"}\n\n'))
+
+        first_id = await SearchResult.objects.filter(website_search_id=1).aget()
+        _, body = await self.read_stream(
+            6, AUTHORIZATION=f"Bearer {token}", LAST_EVENT_ID=str(first_id.id)
+        )
+        self.assertEqual(body.count("event: result"), 1)
+
+    @override_settings(SEARCH_STREAM_IDLE_TIMEOUT=60)
+    async def test_ends_when_the_job_completes(self):
+        job = await SearchJob.objects.acreate(
+            license_plate="AB-123-C",
+            part_name="Brake Pads",
+            car_type="VW",
+            car_model_type="Golf",
+            car_model="VII",
+            status=SearchJob.Status.COMPLETED,
+        )
+        await sync_to_async(self.create_group)(job.pk, size=2)
+        token = await sync_to_async(AccessToken.for_user)(self.user)
+
+        _, body = await self.read_stream(job.pk, AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(body.count("event: result"), 2)
+        self.assertTrue(body.endswith('data: {"reason": "completed"}\n\n'))
+
+    async def test_requires_authentication(self):
+        response, _ = await self.read_stream(6)
+        self.assertEqual(response.status_code, 401)
+
+
+class SearchResultExportTests(SearchResultsAPITestCase):
+    url = reverse("search-result-export")
+
+    def setUp(self):
+        super().setUp()
+        self.user.is_staff = True
+        self.user.save()
+
+    def test_streams_filtered_ndjson_and_csv(self):
+        self.create_group(1, keyword="Brake Pads", size=2)
+        self.create_group(2, keyword="Mirror", size=1)
+
+        response = self.client.get(self.url, {"keyword": "brake pads"})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["search_keyword"], "Brake Pads")
+
+        response = self.client.get(
+            self.url, {"export_format": "csv", "website": 1, "since": "2000-01-01"}
+        )
+        rows = list(csv.reader(b"".join(response).decode().splitlines()))
+        self.assertEqual(rows[0][:3], ["id", "search_result_id", "website_search_id"])
+        self.assertEqual(sorted(r[1] for r in rows[1:]), ["1", "2"])
+
+    def test_rejects_bad_filters(self):
+        self.assertEqual(self.client.get(self.url, {"since": "yesterday"}).status_code, 400)
+        self.assertEqual(
+            self.client.get(self.url, {"export_format": "xml"}).status_code, 400
+        )
+
+
+class FullTextSearchTests(SearchResultsAPITestCase):
+    def test_search_matches_title_and_keyword_prefixes(self):
+        self.create_group(1, keyword="Brake Pads", size=1)
+        self.create_group(2, keyword="Mirror", size=1)
+        SearchResult.objects.filter(search_result_id=2).update(
+            title="Lusterko boczne lewe"
+        )
+
+        self.assertEqual(
+            list(SearchResult.objects.search("brak pad").values_list("search_result_id", flat=True)),
+            [1],
+        )
+        self.assertEqual(
+            list(SearchResult.objects.search("lusterk").values_list("search_result_id", flat=True)),
+            [2],
+        )
+        self.assertFalse(SearchResult.objects.search("alternator").exists())
+
+    def test_list_filters_groups_by_query(self):
+        self.create_group(1, keyword="Brake Pads", size=2)
+        self.create_group(2, keyword="Mirror", size=1)
+
+        response = self.client.get(reverse("search-result-list"), {"q": "mirror"})
+        self.assertEqual(
+            [g["search_result_id"] for g in response.json()["results"]], [2]
+        )
+        response = self.client.get(reverse("search-result-list"), {"q": "  "})
+        self.assertEqual(len(response.json()["results"]), 2)
+
+
+class PriceParsingTests(SimpleTestCase):
+    def test_parses_scraped_price_shapes(self):
+        cases = {
+            "1 234,56 zł": (Decimal("1234.560"), "PLN"),
+            "1\u00a0234,56\u00a0zł": (Decimal("1234.560"), "PLN"),
+            "€ 1.234,56": (Decimal("1234.560"), "EUR"),
+            "1,234.56 USD": (Decimal("1234.560"), "USD"),
+            "1.234.567 zł": (Decimal("1234567.000"), "PLN"),
+            "12,5": (Decimal("12.500"), None),
+            "N/A": (None, None),
+        }
+        for raw, expected in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(parse_price(raw), expected)
+        self.assertEqual(
+            parse_price({"amount": 45.9, "currency": "EUR"}), (Decimal("45.900"), "EUR")
+        )
+        self.assertEqual(parse_price(12, "PLN"), (Decimal("12.000"), "PLN"))
+        self.assertEqual(
+            parse_price({"amount": 1, "currency": 978}, "PLN"), (Decimal("1.000"), "PLN")
+        )
+
+    def test_converts_to_base_currency(self):
+        rates = {"EUR": Decimal(1), "PLN": Decimal("0.25")}
+        normalized = normalize_prices(["10 zł", "10 zł", "3 EUR", "5 CHF"], rates)
+        self.assertEqual(
+            [price.base_amount for price in normalized],
+            [Decimal("2.500"), Decimal("2.500"), Decimal("3.000"), None],
+        )
+
+
+@override_settings(SEARCH_INGEST_TOKEN="ingest-secret", BASE_CURRENCY="EUR")
+class PriceNormalizationTests(SearchResultsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        ExchangeRate.objects.create(currency="PLN", rate=Decimal("0.25"))
+
+    def test_ingest_stores_normalized_prices_sortable_in_detail(self):
+        item = {
+            "search_result_id": 21,
+            "search_keyword": "Mirror",
+            "url": "https://example.com/21",
+            "title": "Mirror",
+        }
+        items = [
+            dict(item, website_search_id=1, price="100,00 zł"),
+            dict(item, website_search_id=2, price={"amount": 20.5, "currency": "EUR"}),
+            dict(item, website_search_id=3, price=30, currency="PLN"),
+        ]
+        response = APIClient().post(
+            reverse("search-result-bulk-ingest"),
+            {"items": items},
+            format="json",
+            HTTP_X_INGEST_TOKEN="ingest-secret",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(
+            reverse("search-result-detail", args=[21]), {"sort": "price"}
+        )
+        self.assertEqual(
+            [
+                (i["website_search_id"], i["price_currency"], i["price_base"])
+                for i in response.json()["items"]
+            ],
+            [(3, "PLN", 7.5), (2, "EUR", 20.5), (1, "PLN", 25.0)],
+        )
+        self.assertEqual(
+            self.client.get(
+                reverse("search-result-detail", args=[21]), {"sort": "title"}
+            ).status_code,
+            400,
+        )
+
+    def test_normalize_prices_command_only_writes_changed_rows(self):
+        self.create_group(23, size=3)
+        SearchResult.objects.filter(search_result_id=23).update(price_currency="PLN")
+        call_command("normalize_prices", batch_size=2, stdout=io.StringIO())
+        url = reverse("search-result-detail", args=[23])
+        etag = self.client.get(url)["ETag"]
+        stamped = set(SearchResult.objects.values_list("updated_at", flat=True))
+
+        # A refresh that leaves the rate alone writes nothing
+        out = io.StringIO()
+        call_command("normalize_prices", batch_size=2, stdout=out)
+        self.assertIn("Updated 0 base prices, cleared 0", out.getvalue())
+        self.assertEqual(
+            set(SearchResult.objects.values_list("updated_at", flat=True)), stamped
+        )
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+        ExchangeRate.objects.filter(currency="PLN").update(rate=Decimal("0.3"))
+        call_command("normalize_prices", batch_size=2, stdout=io.StringIO())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["items"][0]["price_base"], 3.0)
+
+    def test_normalize_prices_command_backfills_legacy_rows(self):
+        self.create_group(22, size=2)
+        ExchangeRate.objects.filter(currency="PLN").update(rate=Decimal("0.5"))
+
+        call_command("normalize_prices", currency="PLN", stdout=io.StringIO())
+
+        self.assertEqual(
+            list(
+                SearchResult.objects.filter(search_result_id=22).values_list(
+                    "price_currency", "price_base"
+                )
+            ),
+            [("PLN", Decimal("5.000"))] * 2,
+        )
+
+
+class StubWebhookServer:
+    """Local n8n stand-in answering with the queued statuses, then 200."""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                stub.requests.append(
+                    (self.client_address, json.loads(self.rfile.read(length)))
+                )
+                code = stub.statuses.pop(0) if stub.statuses else 200
+                body = json.dumps({"status": code}).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/webhook"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@override_settings(N8N_WEBHOOK_BACKOFF=0, N8N_WEBHOOK_RETRIES=2)
+class PartServiceWebhookTests(SearchResultsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        metrics.reset()
+
+    def call(self):
+        return PartService.get_part_info("AB-123-C", "Brake Pads", "VW", "Golf", "VII")
+
+    def test_gateway_errors_are_retried_on_a_reused_connection(self):
+        with StubWebhookServer(statuses=[503]) as stub:
+            with self.settings(N8N_WEBHOOK_URL=stub.url):
+                self.assertEqual(self.call(), {"status": 200})
+                self.call()
+
+        self.assertEqual(len(stub.requests), 3)
+        self.assertEqual(stub.requests[0][1]["license_plate"], "AB-123-C")
+        # Keep-alive: every request arrived from the same client socket
+        self.assertEqual(len({address for address, _ in stub.requests}), 1)
+
+    def test_calls_are_timed_and_exposed_to_staff(self):
+        with StubWebhookServer() as stub:
+            with self.settings(N8N_WEBHOOK_URL=stub.url):
+                self.call()
+                stub.statuses = [503] * 3
+                with self.assertRaises(requests.HTTPError):
+                    self.call()
+
+        url = reverse("search-metrics")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        timer = self.client.get(url).json()["timers"]["n8n.webhook"]
+        self.assertEqual((timer["count"], timer["errors"]), (2, 1))
+        self.assertIsNotNone(timer["p95_ms"])
+
+
+@override_settings(SEARCH_DISPATCH_MAX_ATTEMPTS=2)
+class SearchDispatchTests(SearchResultsAPITestCase):
+    search = {
+        "license_plate": "AB-123-C",
+        "part_name": "Brake Pads",
+        "car_type": "VW",
+        "car_model_type": "Golf",
+        "car_model": "VII",
+    }
+
+    def test_search_is_queued_without_calling_the_webhook(self):
+        with self.settings(N8N_WEBHOOK_URL="http://127.0.0.1:9/unreachable"):
+            response = self.client.post(
+                reverse("parts-search"), self.search, format="json"
+            )
+
+        self.assertEqual(response.status_code, 202)
+        job = SearchJob.objects.get()
+        self.assertEqual(response.json()["search_result_id"], job.pk)
+        self.assertEqual(job.status, SearchJob.Status.PENDING)
+
+        response = self.client.post(
+            reverse("parts-search"), dict(self.search, car_model=""), format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_worker_dispatches_and_retries_with_backoff(self):
+        ok, _ = SearchDispatchService.enqueue(**self.search)
+        flaky, _ = SearchDispatchService.enqueue(**dict(self.search, part_name="Mirror"))
+
+        with StubWebhookServer() as stub, self.settings(
+            N8N_WEBHOOK_URL=stub.url, N8N_WEBHOOK_RETRIES=0
+        ):
+            # The second request of the batch fails, whichever job it carries
+            stub.statuses = [200, 503]
+            jobs = SearchDispatchService.claim(batch_size=10)
+            self.assertEqual(SearchDispatchService.claim(batch_size=10), [])
+            self.assertEqual(
+                SearchDispatchService.dispatch_batch(jobs, concurrency=1), (1, 1)
+            )
+
+        self.assertEqual(
+            {payload["search_result_id"] for _, payload in stub.requests},
+            {ok.pk, flaky.pk},
+        )
+        failed = SearchJob.objects.get(status=SearchJob.Status.PENDING)
+        self.assertEqual(failed.attempts, 1)
+        self.assertGreater(failed.next_attempt_at, timezone.now())
+        self.assertIn("503", failed.last_error)
+
+        # Due again: the final attempt exhausts SEARCH_DISPATCH_MAX_ATTEMPTS
+        SearchJob.objects.filter(pk=failed.pk).update(next_attempt_at=timezone.now())
+        with self.settings(N8N_WEBHOOK_URL="http://127.0.0.1:9/unreachable"):
+            call_command("run_search_dispatcher", once=True, stdout=io.StringIO())
+        failed.refresh_from_db()
+        self.assertEqual((failed.status, failed.attempts), (SearchJob.Status.FAILED, 2))
+        self.assertEqual(
+            SearchJob.objects.filter(status=SearchJob.Status.DISPATCHED).count(), 1
+        )
+
+    def test_identical_searches_share_one_job(self):
+        url = reverse("parts-search")
+        first = self.client.post(url, self.search, format="json").json()
+        same = dict(self.search, license_plate="ab 123 c", part_name=" brake  PADS")
+        second = self.client.post(url, same, format="json").json()
+
+        self.assertFalse(first["coalesced"])
+        self.assertTrue(second["coalesced"])
+        self.assertEqual(first["search_result_id"], second["search_result_id"])
+        self.assertEqual(SearchJob.objects.count(), 1)
+
+        # A finished search is reused only within SEARCH_COALESCE_WINDOW
+        SearchJob.objects.update(
+            status=SearchJob.Status.DISPATCHED,
+            dispatched_at=timezone.now() - timedelta(minutes=5),
+        )
+        with self.settings(SEARCH_COALESCE_WINDOW=600):
+            response = self.client.post(url, same, format="json")
+            self.assertTrue(response.json()["coalesced"])
+        with self.settings(SEARCH_COALESCE_WINDOW=60):
+            response = self.client.post(url, same, format="json")
+            self.assertFalse(response.json()["coalesced"])
+        self.assertEqual(SearchJob.objects.count(), 2)
+
+    def test_registered_plates_are_searched_under_their_rdw_vehicle(self):
+        now = timezone.now()
+        Vehicle.objects.create(
+            plate="AB123C",
+            brand="VOLKSWAGEN",
+            model="GOLF",
+            car_type="AU",
+            imported_at=now,
+        )
+        Vehicle.objects.create(plate="CD456E", brand="OPEL", imported_at=now)
+
+        # Filled as the frontend does: car_model is the trade name and
+        # car_model_type the RDW type
+        search = dict(self.search, car_model="Golf VII", car_model_type="Hatchback")
+        for plate in ("AB-123-C", "CD-456-E", "XY-999-Z"):
+            self.client.post(
+                reverse("parts-search"),
+                dict(search, license_plate=plate),
+                format="json",
+            )
+
+        self.assertEqual(
+            list(
+                SearchJob.objects.order_by("pk").values_list(
+                    "car_type", "car_model", "car_model_type"
+                )
+            ),
+            [
+                ("VOLKSWAGEN", "GOLF", "AU"),
+                # Columns the registry leaves blank keep the client's values
+                ("OPEL", "Golf VII", "Hatchback"),
+                # Unknown plates keep them all
+                ("VW", "Golf VII", "Hatchback"),
+            ],
+        )
+
+    def test_recent_results_for_the_same_vehicle_are_reused(self):
+        url = reverse("parts-search")
+        previous, _ = SearchDispatchService.enqueue(**self.search)
+        self.create_group(previous.pk)
+        other_plate = dict(self.search, license_plate="XY-999-Z")
+
+        SearchJob.objects.update(
+            status=SearchJob.Status.DISPATCHED,
+            dispatched_at=timezone.now() - timedelta(hours=1),
+        )
+        body = self.client.post(url, other_plate, format="json").json()
+        self.assertEqual(
+            (body["search_result_id"], body["outcome"]), (previous.pk, "fresh")
+        )
+        self.assertEqual(SearchJob.objects.count(), 1)
+
+        # Past the freshness TTL: the stored results still answer at once,
+        # and exactly one refresh scrape is queued behind them
+        SearchJob.objects.update(dispatched_at=timezone.now() - timedelta(days=1))
+        for _ in range(2):
+            body = self.client.post(url, other_plate, format="json").json()
+            self.assertEqual(
+                (body["search_result_id"], body["outcome"]), (previous.pk, "stale")
+            )
+        refresh = SearchJob.objects.get(status=SearchJob.Status.PENDING)
+        self.assertEqual(refresh.license_plate, "XY-999-Z")
+
+
+@override_settings(SEARCH_INGEST_TOKEN="ingest-secret")
+class SearchJobLifecycleTests(SearchResultsAPITestCase):
+    def report(self, job, **event):
+        return APIClient().post(
+            reverse("search-job-events", args=[job.pk]),
+            event,
+            format="json",
+            HTTP_X_INGEST_TOKEN="ingest-secret",
+        )
+
+    def test_progress_is_recorded_per_site_and_aggregated(self):
+        job, _ = SearchDispatchService.enqueue(**SearchDispatchTests.search)
+        start = timezone.now()
+        SearchJob.objects.filter(pk=job.pk).update(
+            status=SearchJob.Status.DISPATCHED, dispatched_at=start
+        )
+
+        for website, seconds in ((1, 4), (2, 10)):
+            at = start + timedelta(seconds=1)
+            self.report(job, event="site_started", website_search_id=website, at=at)
+            self.report(
+                job,
+                event="site_finished",
+                website_search_id=website,
+                result_count=1,
+                at=at + timedelta(seconds=seconds),
+            )
+        self.assertEqual(self.report(job, event="site_started").status_code, 400)
+        self.assertEqual(self.report(job, event="job_completed").status_code, 204)
+
+        body = self.client.get(reverse("search-job-detail", args=[job.pk])).json()
+        self.assertEqual(body["status"], "completed")
+        self.assertEqual(
+            [site["website_search_id"] for site in body["sites"]], [1, 2]
+        )
+
+        self.user.is_staff = True
+        self.user.save()
+        stats = self.client.get(reverse("search-job-stats")).json()
+        self.assertEqual(stats["websites"]["1"]["scrape"]["p50_ms"], 4000.0)
+        self.assertEqual(stats["websites"]["2"]["startup"]["p95_ms"], 1000.0)
+        self.assertEqual(stats["queue"]["count"], 1)
+        self.assertEqual(stats["scrape"]["count"], 2)
+        self.assertEqual(stats["scrape"]["p95_ms"], 10000.0)
+
+
+@override_settings(
+    N8N_WEBHOOK_RETRIES=0,
+    N8N_CIRCUIT_FAILURE_THRESHOLD=2,
+    N8N_CIRCUIT_RECOVERY_TIMEOUT=30,
+)
+class WebhookCircuitBreakerTests(SearchResultsAPITestCase):
+    def test_opens_after_failures_and_recovers_through_one_probe(self):
+        payload = {"search_result_id": 1}
+        with StubWebhookServer(statuses=[503, 503]) as stub, self.settings(
+            N8N_WEBHOOK_URL=stub.url
+        ):
+            for _ in range(2):
+                with self.assertRaises(requests.HTTPError):
+                    PartService.dispatch(payload)
+            self.assertEqual(webhook_breaker.state(), "open")
+            with self.assertRaises(CircuitOpenError):
+                PartService.dispatch(payload)
+            self.assertEqual(len(stub.requests), 2)
+
+            with self.settings(N8N_CIRCUIT_RECOVERY_TIMEOUT=0):
+                self.assertEqual(webhook_breaker.state(), "half_open")
+                self.assertTrue(webhook_breaker.allow())
+                # The probe is taken; everyone else still fails fast
+                self.assertFalse(webhook_breaker.allow())
+                webhook_breaker.record_success()
+            self.assertEqual(webhook_breaker.state(), "closed")
+            PartService.dispatch(payload)
+
+    def test_open_circuit_holds_jobs_without_using_attempts(self):
+        job, _ = SearchDispatchService.enqueue(**SearchDispatchTests.search)
+        for _ in range(2):
+            webhook_breaker.record_failure()
+
+        jobs = SearchDispatchService.claim(batch_size=10)
+        self.assertEqual(SearchDispatchService.dispatch_batch(jobs, 1), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (SearchJob.Status.PENDING, 0))
+        self.assertGreater(job.next_attempt_at, timezone.now())
+
+        response = self.client.post(
+            reverse("parts-search"),
+            dict(SearchDispatchTests.search, part_name="Mirror"),
+            format="json",
+        )
+        self.assertTrue(response.json()["dispatch_delayed"])
+
+        self.user.is_staff = True
+        self.user.save()
+        circuit = self.client.get(reverse("search-metrics")).json()["circuits"]
+        self.assertEqual(circuit["n8n.webhook"]["state"], "open")
+
+
+class PartsBatchSearchTests(SearchResultsAPITestCase):
+    vehicle = {
+        "license_plate": "AB-123-C",
+        "car_type": "VW",
+        "car_model_type": "Golf",
+        "car_model": "VII",
+    }
+
+    def test_parts_share_one_webhook_call_with_their_own_ids(self):
+        reused, _ = SearchDispatchService.enqueue(part_name="Mirror", **self.vehicle)
+        self.create_group(reused.pk)
+        SearchJob.objects.update(
+            status=SearchJob.Status.DISPATCHED, dispatched_at=timezone.now()
+        )
+
+        response = self.client.post(
+            reverse("parts-search-batch"),
+            dict(
+                self.vehicle,
+                part_names=["Brake Pads", "Oil Filter", "brake pads", "Mirror"],
+            ),
+            format="json",
+        )
+        self.assertEqual(response.status_code, 202)
+        parts = response.json()["parts"]
+        self.assertEqual(
+            [(p["part_name"], p["outcome"]) for p in parts],
+            [("Brake Pads", "queued"), ("Oil Filter", "queued"), ("Mirror", "fresh")],
+        )
+        self.assertEqual(parts[2]["search_result_id"], reused.pk)
+
+        with StubWebhookServer() as stub, self.settings(N8N_WEBHOOK_URL=stub.url):
+            jobs = SearchDispatchService.claim(batch_size=10)
+            self.assertEqual(SearchDispatchService.dispatch_batch(jobs, 4), (2, 0))
+
+        self.assertEqual(len(stub.requests), 1)
+        payload = stub.requests[0][1]
+        self.assertEqual(payload["batch_id"], response.json()["batch_id"])
+        self.assertEqual(
+            payload["parts"],
+            [
+                {"search_result_id": p["search_result_id"], "part_name": p["part_name"]}
+                for p in parts[:2]
+            ],
+        )
+
+    def test_a_batch_is_claimed_and_retried_as_one_call(self):
+        response = self.client.post(
+            reverse("parts-search-batch"),
+            dict(self.vehicle, part_names=["Brake Pads", "Oil Filter", "Mirror"]),
+            format="json",
+        )
+        ids = [p["search_result_id"] for p in response.json()["parts"]]
+        # A deferred member does not split the batch off from the others
+        SearchJob.objects.filter(pk=ids[2]).update(
+            next_attempt_at=timezone.now() + timedelta(minutes=5)
+        )
+
+        jobs = SearchDispatchService.claim(batch_size=1)
+        self.assertEqual(sorted(job.pk for job in jobs), sorted(ids))
+        self.assertEqual(SearchDispatchService.claim(batch_size=10), [])
+
+        with StubWebhookServer() as stub, self.settings(
+            N8N_WEBHOOK_URL=stub.url, N8N_WEBHOOK_RETRIES=0
+        ):
+            stub.statuses = [503]
+            self.assertEqual(SearchDispatchService.dispatch_batch(jobs, 4), (0, 3))
+
+        self.assertEqual(len(stub.requests), 1)
+        retries = SearchJob.objects.filter(pk__in=ids)
+        self.assertEqual(
+            {(job.status, job.next_attempt_at) for job in retries},
+            {(SearchJob.Status.PENDING, retries[0].next_attempt_at)},
+        )
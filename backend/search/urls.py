@@ -1,21 +1,61 @@
 from django.urls import path
 
 from .views import (
+    PartsBatchSearchView,
     PartsSearchView,
+    SearchJobDetailView,
+    SearchJobEventView,
+    SearchJobStatsView,
+    SearchMetricsView,
+    SearchResultBulkIngestView,
     SearchResultDetailView,
+    SearchResultExportView,
     SearchResultListView,
+    SearchResultStreamView,
 )
 
 urlpatterns = [
     path("parts-search/", PartsSearchView.as_view(), name="parts-search"),
+    path(
+        "parts-search/batch/",
+        PartsBatchSearchView.as_view(),
+        name="parts-search-batch",
+    ),
+    path("metrics/", SearchMetricsView.as_view(), name="search-metrics"),
+    path("jobs/stats/", SearchJobStatsView.as_view(), name="search-job-stats"),
+    path(
+        "jobs/<int:job_id>/",
+        SearchJobDetailView.as_view(),
+        name="search-job-detail",
+    ),
+    path(
+        "jobs/<int:job_id>/events/",
+        SearchJobEventView.as_view(),
+        name="search-job-events",
+    ),
     path(
         "search-results/",
         SearchResultListView.as_view(),
         name="search-result-list",
     ),
+    path(
+        "search-results/bulk/",
+        SearchResultBulkIngestView.as_view(),
+        name="search-result-bulk-ingest",
+    ),
+    path(
+        "search-results/export/",
+        SearchResultExportView.as_view(),
+        name="search-result-export",
+    ),
     path(
         "search-results/<int:search_result_id>/",
         SearchResultDetailView.as_view(),
         name="search-result-detail",
     ),
+    path(
+        "search-results/<int:search_result_id>/stream/",
+        SearchResultStreamView.as_view(),
+        name="search-result-stream",
+    ),
 ]
@@ -1,12 +1,60 @@
-from django.db.models import Count, Max
-from rest_framework import status
+import asyncio
+import json
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, F, Max, Sum
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.throttling import SimpleRateThrottle
 from rest_framework.views import APIView
 
-from search.services import PartService
+from search.services import (
+    SearchDispatchService,
+    SearchJobService,
+    SearchResultIngestService,
+    SearchSubmission,
+)
 
-from .models import SearchResult
+from .cache import detail_key, get_search_cache, list_key
+from .circuit import CLOSED, webhook_breaker
+from .conditional import (
+    group_etag,
+    group_last_modified,
+    is_conditional,
+    not_modified,
+    page_etag,
+    set_validators,
+)
+from .exports import (
+    CONTENT_TYPES,
+    EXPORT_FORMATS,
+    aiter_export,
+    export_queryset,
+    iter_export,
+)
+from .metrics import registry as metrics
+from .models import SearchGroup, SearchJob, SearchResult
+from .pagination import SearchGroupCursorPagination
+from .permissions import HasIngestToken
+from .serializers import (
+    PartsBatchSearchSerializer,
+    PartsSearchSerializer,
+    SearchJobEventSerializer,
+    SearchJobSerializer,
+    SearchResultBulkIngestSerializer,
+)
+from .stages import stage_latencies
 
 
 class IPRateThrottle(SimpleRateThrottle):
@@ -43,78 +91,172 @@ class PartsSearchView(APIView):
     throttle_classes = [PartsSearchThrottle]
 
     def post(self, request):
-        license_plate = request.data.get("license_plate")
-        part_name = request.data.get("part_name")
-        car_type = request.data.get("car_type")
-        car_model_type = request.data.get("car_model_type")
-        car_model = request.data.get("car_model")
-        if (
-            not license_plate
-            or not part_name
-            or not car_type
-            or not car_model_type
-            or not car_model
-        ):
+        serializer = PartsSearchSerializer(data=request.data)
+        if not serializer.is_valid():
             return Response(
                 {
-                    "error": "Plate, part name, car type, car model type and car model are required"
+                    "error": "Plate, part name, car type, car model type and car model are required",
+                    "fields": serializer.errors,
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        try:
-            # Trigger async webhook; ignore payload structure and treat it as confirmation only
-            PartService.get_part_info(
-                license_plate, part_name, car_type, car_model_type, car_model
-            )
+        # Queued for run_search_dispatcher; the webhook is never called from
+        # the request, so n8n latency and outages do not reach the client.
+        # Identical in-flight searches share one job, and recent results for
+        # the same vehicle and part are reused.
+        submission = SearchDispatchService.submit(**serializer.validated_data)
+        return Response(
+            {
+                "message": "Request received. We're processing your request and results will be available soon on the Results page.",
+                "search_result_id": submission.job.search_result_id,
+                # queued, coalesced (identical search in flight), fresh (stored
+                # results reused) or stale (stored results reused, refreshing)
+                "outcome": submission.outcome,
+                "coalesced": submission.outcome == SearchSubmission.COALESCED,
+                # n8n is failing: queued searches are held until it recovers
+                "dispatch_delayed": webhook_breaker.state() != CLOSED,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
-            return Response(
-                {
-                    "message": "Request received. We're processing your request and results will be available soon on the Results page."
-                },
-                status=status.HTTP_202_ACCEPTED,
-            )
 
-        except Exception as e:
-            return Response(
-                {"error": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+class PartsBatchSearchView(APIView):
+    """
+    Searches up to 10 parts for one vehicle in a single request, counting as
+    one request against the parts search throttle.
+
+    Every part gets its own search_result_id and is coalesced or reused like
+    a single search; the parts that need scraping reach n8n together in one
+    webhook call carrying a ``parts`` list.
+
+    Request example:
+    {
+        "license_plate": "AB-123-C",
+        "car_type": "VOLKSWAGEN",
+        "car_model_type": "GOLF",
+        "car_model": "VII",
+        "part_names": ["Brake Pads", "Oil Filter"]
+    }
+
+    Response example:
+    {
+        "batch_id": 7,
+        "parts": [
+            {"part_name": "Brake Pads", "search_result_id": 501, "outcome": "queued"},
+            {"part_name": "Oil Filter", "search_result_id": 480, "outcome": "fresh"}
+        ],
+        "dispatch_delayed": false
+    }
+    """
+
+    throttle_classes = [PartsSearchThrottle]
+
+    def post(self, request):
+        serializer = PartsBatchSearchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        batch, submissions = SearchDispatchService.submit_batch(
+            **serializer.validated_data
+        )
+        return Response(
+            {
+                "batch_id": batch.pk,
+                "parts": [
+                    {
+                        "part_name": part_name,
+                        "search_result_id": submission.job.search_result_id,
+                        "outcome": submission.outcome,
+                    }
+                    for part_name, submission in submissions
+                ],
+                "dispatch_delayed": webhook_breaker.state() != CLOSED,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
 
 class SearchResultListView(APIView):
     """
-    Returns a list of unique search_result_id groups with basic aggregation data.
+    Returns a page of unique search_result_id groups with basic aggregation data,
+    newest first. Pass the returned ``next_cursor`` as ``?cursor=`` to get the
+    following page; ``?page_size=`` is capped at 100. ``?q=`` keeps only groups
+    with a result whose title or keyword matches the full-text query. Each page
+    carries an ETag, and ``If-None-Match`` with the current one is answered
+    with 304.
 
     Response example:
-    [
-        {
-            "search_result_id": 1,
-            "search_keyword": "Brake Pads",
-            "count": 5,
-            "latest_created_at": "2025-01-01T12:00:00Z"
-        },
-        ...
-    ]
+    {
+        "next": "https://.../api/search/search-results/?cursor=WyIyMDI1...",
+        "next_cursor": "WyIyMDI1...",
+        "results": [
+            {
+                "search_result_id": 1,
+                "search_keyword": "Brake Pads",
+                "count": 5,
+                "latest_created_at": "2025-01-01T12:00:00Z"
+            },
+            ...
+        ]
+    }
     """
 
+    pagination_class = SearchGroupCursorPagination
+
     def get(self, request):
-        groups = (
-            SearchResult.objects.values("search_result_id")
-            .annotate(
-                search_keyword=Max(
-                    "search_keyword"
-                ),  # All results in a group have same keyword
-                count=Count("id"),
-                latest_created_at=Max("created_at"),
-            )
-            .order_by("-latest_created_at")
+        query = request.query_params.get("q", "").strip()
+        paginator = self.pagination_class()
+        # Inserts move the newest created_at, in-place updates the newest
+        # updated_at, and deletes the counts, so together they version every
+        # cached page. One pass over the summary table, not the results
+        version = SearchGroup.objects.aggregate(
+            groups=Count("pk"),
+            results=Sum("count"),
+            created=Max("latest_created_at"),
+            updated=Max("latest_updated_at"),
+        )
+        cache = get_search_cache()
+        key = list_key(
+            version,
+            request.query_params.get(paginator.cursor_query_param),
+            paginator.get_page_size(request),
+            query,
         )
-        return Response(list(groups), status=status.HTTP_200_OK)
+
+        cached = cache.get(key)
+        if cached is None:
+            groups = SearchGroup.objects.values(
+                "search_result_id", "search_keyword", "count", "latest_created_at"
+            )
+            if query:
+                groups = groups.filter(
+                    search_result_id__in=SearchResult.objects.search(query).values(
+                        "search_result_id"
+                    )
+                )
+            page = paginator.paginate_queryset(groups, request, view=self)
+            cache.set(key, (page, paginator.get_next_cursor()))
+        else:
+            page = paginator.load_page(*cached, request)
+
+        # Only an ETag: a page's newest row can go down when a group moves to
+        # an earlier page, so Last-Modified would not be a safe validator here
+        etag = page_etag(page, paginator.get_next_cursor())
+        response = not_modified(request, etag, None)
+        if response is not None:
+            return response
+        return set_validators(paginator.get_paginated_response(page), etag, None)
 
 
 class SearchResultDetailView(APIView):
     """
-    Returns all website-level results for a given search_result_id.
+    Returns all website-level results for a given search_result_id, ordered
+    by website or, with ``?sort=price``, cheapest first in BASE_CURRENCY
+    (unconverted prices last).
+
+    Responses carry ETag and Last-Modified validators. Conditional requests and
+    cached payloads are checked against the SearchGroup summary row, so an
+    unchanged group is answered with 304 or from the cache without reading its
+    results; a cold request reads the results alone and derives the validators
+    from them.
 
     Response example:
     {
@@ -123,7 +265,9 @@ class SearchResultDetailView(APIView):
             {
                 "website_search_id": 1,
                 "title": "...",
-                "price": "0.000",
+                "price": "1234.560",
+                "price_currency": "PLN",
+                "price_base": "288.890",
                 "url": "https://..."
             },
             ...
@@ -131,26 +275,402 @@ class SearchResultDetailView(APIView):
     }
     """
 
+    sort_orderings = {
+        "website": ("website_search_id",),
+        "price": (F("price_base").asc(nulls_last=True), "website_search_id"),
+    }
+
     def get(self, request, search_result_id: int):
-        results = SearchResult.objects.filter(
-            search_result_id=search_result_id
-        ).order_by("website_search_id")
+        sort = request.query_params.get("sort", "website")
+        if sort not in self.sort_orderings:
+            return Response(
+                {"error": f"sort must be one of: {', '.join(self.sort_orderings)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cache = get_search_cache()
+        key = detail_key(search_result_id, sort)
+        cached = cache.get(key)
 
-        if not results.exists():
+        # Revalidating or checking a cached copy only needs the summary row;
+        # a cold, unconditional request goes straight to the results
+        if cached is not None or is_conditional(request):
+            version = (
+                SearchGroup.objects.filter(search_result_id=search_result_id)
+                .values_list("count", "latest_created_at", "latest_updated_at")
+                .first()
+            )
+            if version is None:
+                return Response(
+                    {"error": "No results found for this search_result_id"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            etag = group_etag(search_result_id, *version)
+            last_modified = group_last_modified(*version[1:])
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+            if cached is not None and cached["etag"] == etag:
+                return set_validators(
+                    Response(cached["payload"], status=status.HTTP_200_OK),
+                    etag,
+                    last_modified,
+                )
+
+        result = self.get_payload(search_result_id, sort)
+        if result is None:
             return Response(
                 {"error": "No results found for this search_result_id"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Get search_keyword from first result (all should have same keyword)
-        search_keyword = results.first().search_keyword
+        payload, version = result
+        etag = group_etag(search_result_id, *version)
+        cache.set(key, {"etag": etag, "payload": payload})
+        return set_validators(
+            Response(payload, status=status.HTTP_200_OK),
+            etag,
+            group_last_modified(*version[1:]),
+        )
+
+    def get_payload(self, search_result_id: int, sort: str = "website"):
+        """
+        ``(payload, version)`` of the group, or None, where version is what
+        SearchGroup holds: ``(count, latest_created_at, latest_updated_at)``.
+        One round trip: the keyword and the version come from the same rows
+        as the items.
+        """
+        rows = list(
+            SearchResult.objects.filter(search_result_id=search_result_id)
+            .order_by(*self.sort_orderings[sort])
+            .values(
+                "website_search_id",
+                "title",
+                "price",
+                "price_currency",
+                "price_base",
+                "url",
+                "search_keyword",
+                "created_at",
+                "updated_at",
+            )
+        )
+        if not rows:
+            return None
+
+        # All results in a group share the same keyword
+        search_keyword = rows[0]["search_keyword"]
+        created = [row.pop("created_at") for row in rows]
+        updated = [row.pop("updated_at") for row in rows]
+        for row in rows:
+            del row["search_keyword"]
 
-        items = results.values("website_search_id", "title", "price", "url")
+        payload = {
+            "search_keyword": search_keyword,
+            "items": rows,
+        }
+        updated = [value for value in updated if value is not None]
+        version = (len(rows), max(created), max(updated) if updated else None)
+        return payload, version
 
+
+class SearchResultBulkIngestView(APIView):
+    """
+    Accepts a batch of scraped results from the n8n workflow.
+
+    Items already stored for the same (search_result_id, website_search_id)
+    are skipped, so a retried scrape is harmless. ``price`` may be the raw
+    scraped text, a number or ``{"amount", "currency"}``; it is parsed and
+    converted to BASE_CURRENCY on the way in (see search.pricing).
+
+    Request example:
+    {
+        "items": [
+            {
+                "search_result_id": 1,
+                "website_search_id": 1,
+                "search_keyword": "Brake Pads",
+                "url": "https://...",
+                "title": "...",
+                "price": "1 234,56 zł"
+            },
+            ...
+        ]
+    }
+
+    Response example:
+    {"received": 2, "inserted": 1, "skipped": 1}
+    """
+
+    permission_classes = [IsAdminUser | HasIngestToken]
+    # Machine client sending hundreds of rows per call; the batch size cap in
+    # the serializer bounds the work per request instead
+    throttle_classes = []
+
+    def post(self, request):
+        serializer = SearchResultBulkIngestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["items"]
+
+        inserted, skipped = SearchResultIngestService.ingest(items)
+        return Response(
+            {"received": len(items), "inserted": inserted, "skipped": skipped},
+            status=status.HTTP_200_OK,
+        )
+
+
+class SearchResultStreamView(View):
+    """
+    Server-Sent Events stream of the results of one search_result_id.
+
+    Sends every stored item as a ``result`` event, then keeps pushing new ones
+    as they land. The stream ends with an ``end`` event once the search's job
+    is reported complete, once no new item has arrived for
+    SEARCH_STREAM_IDLE_TIMEOUT seconds or after SEARCH_STREAM_MAX_DURATION
+    seconds. Reconnecting clients resume after the
+    ``Last-Event-ID`` they last saw.
+
+    This is an async view: served through backend.asgi an idle stream only
+    costs a coroutine, not a worker.
+    """
+
+    item_fields = (
+        "id",
+        "website_search_id",
+        "title",
+        "price",
+        "price_currency",
+        "price_base",
+        "url",
+    )
+
+    async def get(self, request, search_result_id: int):
+        try:
+            user = await sync_to_async(self.authenticate)(request)
+        except exceptions.AuthenticationFailed as exc:
+            return JsonResponse({"detail": str(exc.detail)}, status=401)
+        if user is None or not user.is_active:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=401,
+            )
+
+        try:
+            last_id = int(request.headers.get("Last-Event-ID", 0))
+        except ValueError:
+            last_id = 0
+
+        response = StreamingHttpResponse(
+            self.events(search_result_id, last_id),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Ask nginx not to buffer the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def authenticate(self, request):
+        for authenticator_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+            result = authenticator_class().authenticate(request)
+            if result is not None:
+                return result[0]
+        return None
+
+    async def events(self, search_result_id: int, last_id: int):
+        started = time.monotonic()
+        last_activity = last_keepalive = started
+
+        yield "retry: 5000\n\n"
+        while True:
+            # Checked before reading, so results stored just before the job
+            # was reported complete are still sent
+            finished = await SearchJob.objects.filter(
+                pk=search_result_id, status__in=SearchJob.FINAL_STATUSES
+            ).aexists()
+            items = SearchResult.objects.filter(
+                search_result_id=search_result_id, id__gt=last_id
+            ).order_by("id")
+            async for item in items.values(*self.item_fields):
+                last_id = item["id"]
+                last_activity = time.monotonic()
+                data = json.dumps(item, cls=DjangoJSONEncoder)
+                yield f"id: {last_id}\nevent: result\ndata: {data}\n\n"
+
+            if finished:
+                yield 'event: end\ndata: {"reason": "completed"}\n\n'
+                return
+            now = time.monotonic()
+            if now - started >= settings.SEARCH_STREAM_MAX_DURATION:
+                yield 'event: end\ndata: {"reason": "timeout"}\n\n'
+                return
+            if now - last_activity >= settings.SEARCH_STREAM_IDLE_TIMEOUT:
+                yield 'event: end\ndata: {"reason": "idle"}\n\n'
+                return
+            if now - last_keepalive >= settings.SEARCH_STREAM_KEEPALIVE:
+                last_keepalive = now
+                yield ": keep-alive\n\n"
+
+            await asyncio.sleep(settings.SEARCH_STREAM_POLL_INTERVAL)
+
+
+class SearchResultExportView(APIView):
+    """
+    Streams SearchResult rows as NDJSON (default) or CSV for staff users.
+
+    Query parameters: ``export_format`` (ndjson|csv), ``since`` and ``until``
+    (ISO date or datetime on created_at), ``keyword`` (search_keyword, case
+    insensitive) and ``website`` (website_search_id).
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"error": f"export_format must be one of {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            rows = export_queryset(
+                since=request.query_params.get("since"),
+                until=request.query_params.get("until"),
+                keyword=request.query_params.get("keyword"),
+                website=request.query_params.get("website"),
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Match the handler, which buffers an iterator of the other kind whole
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_export(export_format, rows)
+        else:
+            content = iter_export(export_format, rows)
+        response = StreamingHttpResponse(
+            content,
+            content_type=CONTENT_TYPES[export_format],
+        )
+        filename = f"search-results.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class SearchMetricsView(APIView):
+    """
+    Latency of outgoing calls as seen by the process serving the request,
+    and the state of the n8n webhook's circuit breaker (shared by all
+    processes).
+
+    Response example:
+    {
+        "timers": {
+            "n8n.webhook": {
+                "count": 42, "errors": 1, "mean_ms": 180.2, "max_ms": 2950.0,
+                "p50_ms": 120.4, "p95_ms": 610.0, "p99_ms": 2950.0
+            }
+        },
+        "circuits": {
+            "n8n.webhook": {"state": "closed", "failures": 1, "opened_at": null}
+        }
+    }
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
         return Response(
             {
-                "search_keyword": search_keyword,
-                "items": list(items),
+                "timers": metrics.snapshot(),
+                "circuits": {webhook_breaker.name: webhook_breaker.snapshot()},
             },
             status=status.HTTP_200_OK,
         )
+
+
+class SearchJobDetailView(APIView):
+    """
+    Status of one parts search, by the search_result_id returned from
+    parts-search, with per-website progress.
+
+    Response example:
+    {
+        "id": 501,
+        "search_result_id": 501,
+        "status": "dispatched",
+        "attempts": 1,
+        "created_at": "2025-01-01T12:00:00Z",
+        "dispatched_at": "2025-01-01T12:00:01Z",
+        "completed_at": null,
+        "sites": [
+            {
+                "website_search_id": 1,
+                "started_at": "2025-01-01T12:00:03Z",
+                "finished_at": null,
+                "persisted_at": null,
+                "result_count": null,
+                "error": ""
+            }
+        ]
+    }
+    """
+
+    def get(self, request, job_id: int):
+        job = get_object_or_404(SearchJob.objects.prefetch_related("sites"), pk=job_id)
+        return Response(SearchJobSerializer(job).data, status=status.HTTP_200_OK)
+
+
+class SearchJobEventView(APIView):
+    """
+    Progress reports from the n8n workflow for one job.
+
+    Request example:
+    {"event": "site_finished", "website_search_id": 1, "result_count": 12}
+
+    ``event`` is one of site_started, site_finished, site_failed (these need
+    ``website_search_id``), job_completed or job_failed. ``at`` defaults to
+    now.
+    """
+
+    permission_classes = [IsAdminUser | HasIngestToken]
+    throttle_classes = []
+
+    def post(self, request, job_id: int):
+        job = get_object_or_404(SearchJob, pk=job_id)
+        serializer = SearchJobEventSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        SearchJobService.record_event(
+            job,
+            data["event"],
+            at=data.get("at") or timezone.now(),
+            website_search_id=data.get("website_search_id"),
+            result_count=data.get("result_count"),
+            error=data["error"],
+        )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class SearchJobStatsView(APIView):
+    """
+    p50/p95 latency of each search stage, overall and per website, for jobs
+    accepted in the last ``?days=`` days (default 7). See search.stages.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get("days", 7))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= 90:
+            return Response(
+                {"error": "days must be between 1 and 90"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        since = timezone.now() - timedelta(days=days)
+        return Response(
+            {"since": since, **stage_latencies(since)}, status=status.HTTP_200_OK
+        )
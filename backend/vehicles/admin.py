@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import Vehicle, VehicleLookup
+
+
+@admin.register(VehicleLookup)
+class VehicleLookupAdmin(admin.ModelAdmin):
+    list_display = ("plate", "found", "fetched_at")
+    search_fields = ("plate",)
+    readonly_fields = ("plate", "data", "fetched_at")
+    ordering = ("-fetched_at",)
+
+    @admin.display(boolean=True)
+    def found(self, obj):
+        return obj.found
+
+
+@admin.register(Vehicle)
+class VehicleAdmin(admin.ModelAdmin):
+    list_display = ("plate", "brand", "model", "build_year", "imported_at")
+    list_filter = ("brand",)
+    search_fields = ("plate", "model")
+    readonly_fields = ("imported_at",)
+    show_full_result_count = False
@@ -0,0 +1,174 @@
+import csv
+import io
+import re
+import sys
+from itertools import islice
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from vehicles.models import Vehicle
+from vehicles.services import PLATE_RE, normalize_plate, vehicle_info
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def column_name(header: str) -> str:
+    """'Datum eerste toelating' in the CSV dump is datum_eerste_toelating in the API."""
+    return re.sub(r"\W+", "_", header.strip().lower()).strip("_")
+
+
+def clean(field: str, value):
+    """Text columns are stored blank rather than null, cut to the column size."""
+    if field == "build_year":
+        return value
+    return (value or "").strip()[: Vehicle._meta.get_field(field).max_length]
+
+
+class Command(BaseCommand):
+    help = (
+        "Import the RDW 'Gekentekende voertuigen' CSV dump into the Vehicle "
+        "table. The file is streamed and written in chunks, so memory stays "
+        "flat for the multi-GB full export. Existing plates are only written "
+        "when a column changed, so re-running with a newer dump or a partial "
+        "delta file applies just the differences. Plates that left the "
+        "register are only removed by a full dump imported with --prune."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "source",
+            help="Path to the CSV file, an http(s) URL to stream, or - for stdin.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Rows per transaction (default {DEFAULT_CHUNK_SIZE}).",
+        )
+        parser.add_argument(
+            "--delimiter",
+            default=",",
+            help="CSV field delimiter (default ',').",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help=(
+                "Delete vehicles whose plate is not in the file. Only for the "
+                "full dump: a delta file would delete every plate it leaves out."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        # With --prune every imported plate is stamped with the start of the
+        # run, so what is left unstamped afterwards was not in the file
+        seen_at = timezone.now() if options["prune"] else None
+        rows = 0
+        totals = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        with self.open_source(options["source"]) as stream:
+            reader = csv.reader(stream, delimiter=options["delimiter"])
+            try:
+                columns = [column_name(header) for header in next(reader)]
+            except StopIteration:
+                raise CommandError("The CSV file is empty.")
+            if "kenteken" not in columns:
+                raise CommandError("The CSV file has no Kenteken column.")
+
+            records = (dict(zip(columns, row)) for row in reader)
+            while True:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    break
+                rows += len(chunk)
+                for key, count in self.import_chunk(chunk, seen_at).items():
+                    totals[key] += count
+                if options["verbosity"] > 1:
+                    self.stdout.write(
+                        f"{rows} rows read, "
+                        f"{totals['created']} created, {totals['updated']} updated"
+                    )
+
+        if seen_at is not None:
+            if rows == totals["skipped"]:
+                raise CommandError("No vehicles were imported; not pruning.")
+            deleted, _ = Vehicle.objects.filter(
+                Q(seen_at__lt=seen_at) | Q(seen_at__isnull=True)
+            ).delete()
+            self.stdout.write(f"Pruned {deleted} vehicles not in the file.")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Read {rows} rows: {created} created, {updated} updated, "
+                "{unchanged} unchanged, {skipped} skipped.".format(
+                    rows=rows, **totals
+                )
+            )
+        )
+
+    def open_source(self, source):
+        if source == "-":
+            return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+        if source.startswith(("http://", "https://")):
+            try:
+                response = requests.get(source, stream=True, timeout=(10, 60))
+                response.raise_for_status()
+            except requests.RequestException as e:
+                raise CommandError(f"Could not download {source}: {e}")
+            response.raw.decode_content = True
+            return io.TextIOWrapper(response.raw, encoding="utf-8-sig", newline="")
+        try:
+            return open(source, encoding="utf-8-sig", newline="")
+        except OSError as e:
+            raise CommandError(f"Could not open {source}: {e}")
+
+    @staticmethod
+    def import_chunk(records, seen_at=None):
+        now = timezone.now()
+        counts = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+
+        # Later rows for the same plate win, as they would in a delta file
+        incoming = {}
+        for record in records:
+            info = vehicle_info(record)
+            plate = normalize_plate(info.pop("plate") or "")
+            if not PLATE_RE.match(plate):
+                counts["skipped"] += 1
+                continue
+            incoming[plate] = {
+                field: clean(field, value) for field, value in info.items()
+            }
+
+        with transaction.atomic():
+            existing = Vehicle.objects.in_bulk(list(incoming))
+            created, changed = [], []
+            for plate, fields in incoming.items():
+                vehicle = existing.get(plate)
+                if vehicle is None:
+                    created.append(Vehicle(plate=plate, imported_at=now, **fields))
+                    continue
+                if all(getattr(vehicle, f) == v for f, v in fields.items()):
+                    counts["unchanged"] += 1
+                    continue
+                for field, value in fields.items():
+                    setattr(vehicle, field, value)
+                vehicle.imported_at = now
+                changed.append(vehicle)
+
+            Vehicle.objects.bulk_create(created, batch_size=1000)
+            Vehicle.objects.bulk_update(
+                changed, [*Vehicle.DATA_FIELDS, "imported_at"], batch_size=500
+            )
+            if seen_at is not None:
+                Vehicle.objects.filter(pk__in=list(incoming)).update(seen_at=seen_at)
+
+        counts["created"] += len(created)
+        counts["updated"] += len(changed)
+        return counts
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VehicleLookup',
+            fields=[
+                ('plate', models.CharField(max_length=8, primary_key=True, serialize=False)),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('fetched_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['plate'],
+            },
+        ),
+    ]
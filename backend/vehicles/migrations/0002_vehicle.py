@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Vehicle',
+            fields=[
+                ('plate', models.CharField(max_length=8, primary_key=True, serialize=False)),
+                ('brand', models.CharField(blank=True, max_length=100)),
+                ('model', models.CharField(blank=True, max_length=100)),
+                ('car_type', models.CharField(blank=True, max_length=50)),
+                ('build_year', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('color', models.CharField(blank=True, max_length=50)),
+                ('fuel_type', models.CharField(blank=True, max_length=50)),
+                ('imported_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['plate'],
+                'indexes': [models.Index(fields=['brand', 'model'], name='vehicle_brand_model_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 04:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicles', '0002_vehicle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='seen_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
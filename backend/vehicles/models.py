@@ -0,0 +1,65 @@
+from django.db import models
+
+
+class VehicleLookup(models.Model):
+    """
+    Cached RDW open-data record for one license plate.
+
+    ``data`` holds the upstream record as returned, or null when RDW has no
+    vehicle for the plate, so unknown plates are cached too.
+    """
+
+    plate = models.CharField(max_length=8, primary_key=True)
+    data = models.JSONField(null=True, blank=True)
+    fetched_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["plate"]
+
+    @property
+    def found(self) -> bool:
+        return self.data is not None
+
+    def __str__(self) -> str:
+        return self.plate
+
+
+class Vehicle(models.Model):
+    """
+    One registration from the RDW open-data dump, keyed by normalized plate.
+
+    Loaded by the import_rdw_vehicles command. Plates found here are served
+    without calling RDW; the brand and model columns are the local vocabulary
+    for matching scraper catalogs.
+    """
+
+    plate = models.CharField(max_length=8, primary_key=True)
+    brand = models.CharField(max_length=100, blank=True)
+    model = models.CharField(max_length=100, blank=True)
+    car_type = models.CharField(max_length=50, blank=True)
+    build_year = models.PositiveSmallIntegerField(null=True, blank=True)
+    color = models.CharField(max_length=50, blank=True)
+    fuel_type = models.CharField(max_length=50, blank=True)
+    imported_at = models.DateTimeField()
+    # Start of the last ``import_rdw_vehicles --prune`` run whose file listed
+    # the plate; that run deletes the plates it did not see
+    seen_at = models.DateTimeField(null=True, blank=True)
+
+    # Columns compared by delta imports; imported_at only moves on change
+    DATA_FIELDS = ("brand", "model", "car_type", "build_year", "color", "fuel_type")
+
+    class Meta:
+        ordering = ["plate"]
+        indexes = [
+            models.Index(fields=["brand", "model"], name="vehicle_brand_model_idx"),
+        ]
+
+    def info(self):
+        """Same shape as services.vehicle_info() returns for an RDW record."""
+        info = {"plate": self.plate}
+        for field in self.DATA_FIELDS:
+            info[field] = getattr(self, field) or None
+        return info
+
+    def __str__(self) -> str:
+        return self.plate
@@ -0,0 +1,137 @@
+import re
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Vehicle, VehicleLookup
+
+PLATE_RE = re.compile(r"^[0-9A-Z]{1,8}$")
+
+_session = None
+
+
+class VehicleNotFound(Exception):
+    """RDW has no vehicle registered under the plate."""
+
+
+class VehicleLookupUnavailable(Exception):
+    """The plate is not cached and the upstream lookup failed."""
+
+
+def normalize_plate(license_plate: str) -> str:
+    """'ab-123-c' and 'AB 123 C' are the same plate."""
+    return re.sub(r"[^0-9A-Z]", "", license_plate.upper())
+
+
+def vehicle_info(record: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields the frontend shows, from an RDW registration record."""
+    registered = record.get("datum_eerste_toelating") or ""
+    return {
+        "plate": record.get("kenteken"),
+        "brand": record.get("merk"),
+        "model": record.get("handelsbenaming"),
+        "build_year": int(registered[:4]) if registered[:4].isdigit() else None,
+        "color": record.get("eerste_kleur"),
+        "fuel_type": record.get("brandstof"),
+        "car_type": record.get("type"),
+    }
+
+
+def fetch_rdw(plate: str) -> Optional[Dict[str, Any]]:
+    """Registration record for ``plate`` from RDW_API_URL, or None if unknown."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    headers = {}
+    if settings.RDW_APP_TOKEN:
+        headers["X-App-Token"] = settings.RDW_APP_TOKEN
+    response = _session.get(
+        settings.RDW_API_URL,
+        params={"kenteken": plate},
+        headers=headers,
+        timeout=(3.05, settings.RDW_API_TIMEOUT),
+    )
+    response.raise_for_status()
+    records = response.json()
+    return records[0] if records else None
+
+
+class VehicleLookupService:
+    """
+    Plate lookups served from the imported Vehicle table, falling back to the
+    VehicleLookup cache of RDW API responses for plates not imported yet.
+
+    A missing or expired row is fetched from RDW by one request at a time,
+    under a lock in the default cache (shared by all workers in production,
+    see CACHES). A concurrent request for an expired row serves that row
+    right away; one for a plate never seen waits for the fetching request's
+    row, at most as long as its own RDW call could take, since a sync view
+    blocks its worker's thread either way. When RDW fails, an expired row is
+    served rather than an error.
+    """
+
+    poll_interval = 0.05
+
+    @classmethod
+    def lookup(cls, license_plate: str) -> Dict[str, Any]:
+        plate = normalize_plate(license_plate)
+        if not PLATE_RE.match(plate):
+            raise ValueError("A license plate has 1 to 8 letters and digits.")
+
+        vehicle = Vehicle.objects.filter(pk=plate).first()
+        if vehicle is not None:
+            return vehicle.info()
+
+        row = VehicleLookup.objects.filter(pk=plate).first()
+        if row is None or not cls._is_fresh(row):
+            row = cls._refresh(plate, stale=row)
+        if not row.found:
+            raise VehicleNotFound(plate)
+        return vehicle_info(row.data)
+
+    @staticmethod
+    def _is_fresh(row: VehicleLookup) -> bool:
+        ttl = (
+            settings.VEHICLE_LOOKUP_TTL
+            if row.found
+            else settings.VEHICLE_LOOKUP_NEGATIVE_TTL
+        )
+        return (timezone.now() - row.fetched_at).total_seconds() < ttl
+
+    @classmethod
+    def _refresh(cls, plate: str, stale: Optional[VehicleLookup]) -> VehicleLookup:
+        lock_key = f"vehicles:lookup:{plate}"
+        lock_timeout = settings.RDW_API_TIMEOUT + 5
+        if cache.add(lock_key, True, timeout=lock_timeout):
+            try:
+                return cls._fetch(plate, stale)
+            finally:
+                cache.delete(lock_key)
+
+        # Another request is fetching this plate
+        if stale is not None:
+            return stale
+        deadline = time.monotonic() + settings.RDW_API_TIMEOUT
+        while time.monotonic() < deadline and cache.get(lock_key) is not None:
+            time.sleep(cls.poll_interval)
+        row = VehicleLookup.objects.filter(pk=plate).first()
+        if row is not None:
+            return row
+        raise VehicleLookupUnavailable(plate)
+
+    @staticmethod
+    def _fetch(plate: str, stale: Optional[VehicleLookup]) -> VehicleLookup:
+        try:
+            record = fetch_rdw(plate)
+        except (requests.RequestException, ValueError):
+            if stale is not None:
+                return stale
+            raise VehicleLookupUnavailable(plate)
+        row, _ = VehicleLookup.objects.update_or_create(
+            plate=plate, defaults={"data": record, "fetched_at": timezone.now()}
+        )
+        return row
@@ -0,0 +1,200 @@
+import json
+import tempfile
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import Vehicle, VehicleLookup
+from .services import VehicleLookupService
+
+RECORD = {
+    "kenteken": "AB123C",
+    "merk": "VOLKSWAGEN",
+    "handelsbenaming": "GOLF",
+    "datum_eerste_toelating": "20150312",
+    "eerste_kleur": "GRIJS",
+    "type": "AU",
+}
+
+
+class StubRDWServer:
+    """Local stand-in for the RDW open-data API."""
+
+    def __init__(self, records, status=200):
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                plate = parse_qs(urlparse(self.path).query)["kenteken"][0]
+                stub.requests.append(plate)
+                body = json.dumps([r for r in records if r["kenteken"] == plate])
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body.encode())
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/resource.json"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class VehicleLookupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="tester@example.com", password="secret-pass-123"
+            )
+        )
+
+    def get(self, plate):
+        return self.client.get(reverse("vehicle-lookup", args=[plate]))
+
+    def test_lookups_are_cached_by_normalized_plate(self):
+        with StubRDWServer([RECORD]) as rdw, self.settings(RDW_API_URL=rdw.url):
+            response = self.get("ab-123-c")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["brand"], "VOLKSWAGEN")
+            self.assertEqual(response.json()["build_year"], 2015)
+            self.assertEqual(self.get("AB 123 C").status_code, 200)
+            self.assertEqual(self.get("ZZ999Z").status_code, 404)
+            self.assertEqual(self.get("ZZ-999-Z").status_code, 404)
+
+        self.assertEqual(rdw.requests, ["AB123C", "ZZ999Z"])
+        self.assertEqual(self.get("not a plate!").status_code, 400)
+
+    def test_expired_rows_are_served_when_upstream_fails(self):
+        VehicleLookup.objects.create(
+            plate="AB123C",
+            data=RECORD,
+            fetched_at=timezone.now() - timedelta(days=60),
+        )
+        with StubRDWServer([], status=500) as rdw, self.settings(RDW_API_URL=rdw.url):
+            self.assertEqual(self.get("AB123C").json()["model"], "GOLF")
+            self.assertEqual(self.get("XX000X").status_code, 503)
+
+    def test_concurrent_miss_waits_for_the_request_already_fetching(self):
+        cache.add("vehicles:lookup:AB123C", True)
+
+        def other_request_finishes(seconds):
+            VehicleLookup.objects.create(
+                plate="AB123C", data=RECORD, fetched_at=timezone.now()
+            )
+            cache.delete("vehicles:lookup:AB123C")
+
+        sleep = mock.patch(
+            "vehicles.services.time.sleep", side_effect=other_request_finishes
+        )
+        with mock.patch("vehicles.services.fetch_rdw") as fetch_rdw, sleep:
+            vehicle = VehicleLookupService.lookup("AB-123-C")
+
+        self.assertEqual(vehicle["plate"], "AB123C")
+        fetch_rdw.assert_not_called()
+
+    def test_concurrent_refresh_serves_the_expired_row_without_waiting(self):
+        VehicleLookup.objects.create(
+            plate="AB123C",
+            data=RECORD,
+            fetched_at=timezone.now() - timedelta(days=60),
+        )
+        cache.add("vehicles:lookup:AB123C", True)
+
+        with mock.patch("vehicles.services.fetch_rdw") as fetch_rdw, mock.patch(
+            "vehicles.services.time.sleep"
+        ) as sleep:
+            vehicle = VehicleLookupService.lookup("AB123C")
+
+        self.assertEqual(vehicle["model"], "GOLF")
+        fetch_rdw.assert_not_called()
+        sleep.assert_not_called()
+
+
+class ImportRDWVehiclesTests(TestCase):
+    HEADER = (
+        "Kenteken,Voertuigsoort,Merk,Handelsbenaming,"
+        "Datum eerste toelating,Eerste kleur,Type\n"
+    )
+
+    def run_import(self, *rows, **options):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8") as f:
+            f.write(self.HEADER + "".join(rows))
+            f.flush()
+            call_command("import_rdw_vehicles", f.name, stdout=StringIO(), **options)
+
+    def test_import_applies_deltas(self):
+        self.run_import(
+            "AB123C,Personenauto,VOLKSWAGEN,GOLF,20150312,GRIJS,AU\n",
+            "12XYZ3,Personenauto,OPEL,ASTRA,20090101,ZWART,AH\n",
+            "not a plate!,,,,,,\n",
+            chunk_size=2,
+        )
+        self.assertEqual(Vehicle.objects.count(), 2)
+        golf = Vehicle.objects.get(pk="AB123C")
+        astra_imported_at = Vehicle.objects.get(pk="12XYZ3").imported_at
+
+        self.run_import(
+            "AB-123-C,Personenauto,VOLKSWAGEN,GOLF,20150312,BLAUW,AU\n",
+            "12XYZ3,Personenauto,OPEL,ASTRA,20090101,ZWART,AH\n",
+        )
+        golf.refresh_from_db()
+        self.assertEqual(golf.color, "BLAUW")
+        self.assertEqual(golf.build_year, 2015)
+        self.assertEqual(
+            Vehicle.objects.get(pk="12XYZ3").imported_at, astra_imported_at
+        )
+
+    def test_prune_deletes_plates_missing_from_a_full_dump(self):
+        self.run_import(
+            "AB123C,Personenauto,VOLKSWAGEN,GOLF,20150312,GRIJS,AU\n",
+            "12XYZ3,Personenauto,OPEL,ASTRA,20090101,ZWART,AH\n",
+        )
+        # A delta file leaves plates it does not mention alone
+        self.run_import("AB123C,Personenauto,VOLKSWAGEN,GOLF,20150312,GRIJS,AU\n")
+        self.assertEqual(Vehicle.objects.count(), 2)
+
+        self.run_import(
+            "AB123C,Personenauto,VOLKSWAGEN,GOLF,20150312,GRIJS,AU\n",
+            "34ABC5,Personenauto,FIAT,PANDA,20200101,ROOD,AH\n",
+            prune=True,
+            chunk_size=1,
+        )
+        self.assertEqual(
+            list(Vehicle.objects.values_list("plate", flat=True)),
+            ["34ABC5", "AB123C"],
+        )
+
+        with self.assertRaisesMessage(CommandError, "not pruning"):
+            self.run_import("not a plate!,,,,,,\n", prune=True)
+        self.assertEqual(Vehicle.objects.count(), 2)
+
+    def test_imported_vehicles_are_served_without_rdw(self):
+        self.run_import("AB123C,Personenauto,VOLKSWAGEN,GOLF,20150312,GRIJS,AU\n")
+        with mock.patch("vehicles.services.fetch_rdw") as fetch_rdw:
+            vehicle = VehicleLookupService.lookup("ab-123-c")
+
+        fetch_rdw.assert_not_called()
+        self.assertEqual(vehicle["model"], "GOLF")
+        self.assertIsNone(vehicle["fuel_type"])
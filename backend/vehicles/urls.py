@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import VehicleLookupView
+
+urlpatterns = [
+    path("<str:plate>/", VehicleLookupView.as_view(), name="vehicle-lookup"),
+]
@@ -0,0 +1,49 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import UserRateThrottle
+from rest_framework.views import APIView
+
+from .services import VehicleLookupService, VehicleLookupUnavailable, VehicleNotFound
+
+
+class VehicleLookupThrottle(UserRateThrottle):
+    """Lookups are mostly served from the local table, so allow more of them."""
+
+    scope = "vehicle_lookup"
+    rate = "60/minute"
+
+
+class VehicleLookupView(APIView):
+    """
+    Vehicle details for a Dutch license plate, from the local RDW cache.
+
+    Response example:
+    {
+        "plate": "AB123C",
+        "brand": "VOLKSWAGEN",
+        "model": "GOLF",
+        "build_year": 2015,
+        "color": "GRIJS",
+        "fuel_type": null,
+        "car_type": "AU"
+    }
+    """
+
+    throttle_classes = [VehicleLookupThrottle]
+
+    def get(self, request, plate: str):
+        try:
+            vehicle = VehicleLookupService.lookup(plate)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except VehicleNotFound:
+            return Response(
+                {"error": "No vehicle found for this license plate"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except VehicleLookupUnavailable:
+            return Response(
+                {"error": "Vehicle lookup is temporarily unavailable"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return Response(vehicle, status=status.HTTP_200_OK)
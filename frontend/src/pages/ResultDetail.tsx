@@ -42,6 +42,18 @@ export const ResultDetail: React.FC = () => {
     };
 
     fetchItems();
+
+    // Append items that arrive while the page is open
+    const source = resultsService.streamSearchResults(idNum, (item) => {
+      setResultDetail((current) => {
+        if (!current || current.items.some((i) => i.website_search_id === item.website_search_id)) {
+          return current;
+        }
+        return { ...current, items: [...current.items, item] };
+      });
+    });
+
+    return () => source.close();
   }, [searchResultId]);
 
   return (
@@ -100,7 +112,7 @@ export const ResultDetail: React.FC = () => {
                       {item.title || 'N/A'}
                     </td>
                     <td className="px-4 py-2 text-gray-700">
-                      {item.price}
+                      {item.price} {item.price_currency ?? ''}
                     </td>
                     <td className="px-4 py-2 text-gray-700 max-w-xs truncate">
                       {item.url}
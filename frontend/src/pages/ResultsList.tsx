@@ -9,13 +9,16 @@ export const ResultsList: React.FC = () => {
   const [groups, setGroups] = useState<SearchResultGroup[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState<boolean>(false);
 
   const fetchGroups = async () => {
     try {
       setLoading(true);
       setError(null);
       const data = await resultsService.getSearchResultGroups();
-      setGroups(data);
+      setGroups(data.results);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       setError('Failed to load results. Please try again later.');
     } finally {
@@ -23,6 +26,22 @@ export const ResultsList: React.FC = () => {
     }
   };
 
+  const fetchMoreGroups = async () => {
+    if (!nextCursor) {
+      return;
+    }
+    try {
+      setLoadingMore(true);
+      const data = await resultsService.getSearchResultGroups(nextCursor);
+      setGroups((current) => [...current, ...data.results]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      setError('Failed to load results. Please try again later.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchGroups();
   }, []);
@@ -100,6 +119,18 @@ export const ResultsList: React.FC = () => {
                 ))}
               </tbody>
             </table>
+            {nextCursor && (
+              <div className="flex justify-center mt-4">
+                <button
+                  type="button"
+                  onClick={fetchMoreGroups}
+                  disabled={loadingMore}
+                  className="px-3 py-1 text-sm font-medium text-primary-600 border border-primary-200 rounded hover:bg-primary-50 disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </div>
@@ -7,10 +7,18 @@ export interface SearchResultGroup {
   latest_created_at: string;
 }
 
+export interface SearchResultGroupPage {
+  next: string | null;
+  next_cursor: string | null;
+  results: SearchResultGroup[];
+}
+
 export interface SearchResultItem {
   website_search_id: number;
   title: string;
   price: string;
+  price_currency: string | null;
+  price_base: string | null;
   url: string;
 }
 
@@ -19,16 +27,57 @@ export interface SearchResultDetail {
   items: SearchResultItem[];
 }
 
+export interface SearchJobSite {
+  website_search_id: number;
+  started_at: string | null;
+  finished_at: string | null;
+  persisted_at: string | null;
+  result_count: number | null;
+  error: string;
+}
+
+export interface SearchJob {
+  id: number;
+  search_result_id: number;
+  status: 'pending' | 'dispatching' | 'dispatched' | 'completed' | 'failed';
+  attempts: number;
+  created_at: string;
+  dispatched_at: string | null;
+  completed_at: string | null;
+  sites: SearchJobSite[];
+}
+
 export const resultsService = {
-  async getSearchResultGroups(): Promise<SearchResultGroup[]> {
-    const response = await api.get('/search/search-results/');
-    return response.data as SearchResultGroup[];
+  async getSearchResultGroups(cursor?: string | null): Promise<SearchResultGroupPage> {
+    const response = await api.get('/search/search-results/', {
+      params: cursor ? { cursor } : undefined,
+    });
+    return response.data as SearchResultGroupPage;
   },
 
   async getSearchResultDetail(searchResultId: number): Promise<SearchResultDetail> {
     const response = await api.get(`/search/search-results/${searchResultId}/`);
     return response.data as SearchResultDetail;
   },
+
+  async getSearchJob(searchResultId: number): Promise<SearchJob> {
+    const response = await api.get(`/search/jobs/${searchResultId}/`);
+    return response.data as SearchJob;
+  },
+
+  // Server-Sent Events: replays stored items, then pushes new ones as they land.
+  // Authenticates with the access cookie, as EventSource cannot set headers.
+  streamSearchResults(searchResultId: number, onItem: (item: SearchResultItem) => void): EventSource {
+    const source = new EventSource(
+      `${api.defaults.baseURL}/search/search-results/${searchResultId}/stream/`,
+      { withCredentials: true }
+    );
+    source.addEventListener('result', (event) => {
+      onItem(JSON.parse((event as MessageEvent).data) as SearchResultItem);
+    });
+    source.addEventListener('end', () => source.close());
+    return source;
+  },
 };
 
 
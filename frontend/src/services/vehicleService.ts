@@ -1,4 +1,3 @@
-import axios from 'axios';
 import { api } from '../utils/api';
 
 export interface VehicleInfo {
@@ -13,21 +12,31 @@ export interface VehicleInfo {
 
 export interface PartInfo {
   message: string;
+  search_result_id: number;
+  outcome: 'queued' | 'coalesced' | 'fresh' | 'stale';
+  coalesced: boolean;
+}
+
+export interface PartsBatchInfo {
+  batch_id: number;
+  parts: { part_name: string; search_result_id: number; outcome: PartInfo['outcome'] }[];
+  dispatch_delayed: boolean;
 }
 
 export const vehicleService = {
+  // Served by the backend from its RDW cache, see /api/vehicles/<plate>/
   async getVehicleInfo(plate: string): Promise<VehicleInfo | null> {
     try {
-      const response = await axios.get(`https://opendata.rdw.nl/resource/m9d7-ebf2.json?kenteken=${plate}`);
-      const data = response.data[0];
+      const response = await api.get(`/vehicles/${encodeURIComponent(plate)}/`);
+      const data = response.data;
       return {
-        plate: data.kenteken,
-        brand: data.merk,
-        model: data.handelsbenaming,
-        buildYear: new Date(data.datum_eerste_toelating_dt).getFullYear(),
-        color: data.eerste_kleur,
-        fuelType: data.brandstof,
-        car_type: data.type,
+        plate: data.plate,
+        brand: data.brand,
+        model: data.model,
+        buildYear: data.build_year,
+        color: data.color,
+        fuelType: data.fuel_type,
+        car_type: data.car_type,
       };
     } catch (error) {
       return null;
@@ -56,4 +65,22 @@ export const vehicleService = {
       throw error;
     }
   },
+  // Up to 10 parts for one vehicle in one request (and one scrape per site)
+  async getPartsInfoBatch(licensePlate: string, partNames: string[], carBrand: string, carModel: string, carModelType: string): Promise<PartsBatchInfo> {
+    try {
+      const response = await api.post("/search/parts-search/batch/", {
+        license_plate: licensePlate,
+        part_names: partNames,
+        car_type: carBrand,
+        car_model: carModel,
+        car_model_type: carModelType,
+      });
+      return response.data as PartsBatchInfo;
+    } catch (error: any) {
+      if (error.response?.status === 429) {
+        throw new Error('Too many requests. Please wait a moment before searching again.');
+      }
+      throw error;
+    }
+  },
 };